@@ -0,0 +1,64 @@
+"""
+CA validation benchmark: regex + length check vs base58 decode validator
+
+    python -m benchmarks.bench_address --n 20000
+"""
+import argparse
+import random
+import re
+
+from core.address import BASE58_ALPHABET, b58decode_int, extract_ca
+from benchmarks.common import report, time_calls
+
+
+OLD_PATTERN = re.compile(r'[1-9A-HJ-NP-Za-km-z]{32,44}')
+
+CA = "Bbd9DcnZrGZPwUUszZ5XW7eGiu7Bhn6XnPfY6R3Xpump"
+
+
+def old_extract(text: str):
+    match = OLD_PATTERN.search(text)
+    if match and 32 <= len(match.group()) <= 44:
+        return match.group()
+    return None
+
+
+def noise(rng: random.Random, n: int) -> str:
+    words = ["the", "coin", "just", "launched", "view", "chart", "holders", "mcap", "LFG", "🚀",
+             "https://pump.fun/board", "dev", "sold", "0.5", "SOL", "ape", "now", "\n"]
+    return " ".join(rng.choice(words) for _ in range(n))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20000)
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    texts = {
+        "clipboard (CA only)": CA,
+        "short text (~100 B)": f"CA: {CA} go",
+        "chat paste (~4 KB)": noise(rng, 350) + f" {CA} " + noise(rng, 350),
+        "OCR, CA glued (~300 B)": noise(rng, 20) + f"Contract{CA}View" + noise(rng, 20),
+    }
+
+    for label, text in texts.items():
+        print(f"{label}: {len(text.encode('utf-8'))} bytes, "
+              f"old -> {old_extract(text)!r:.20}, new -> {extract_ca(text, check_curve=True)!r:.20}")
+        report(f"  old regex", time_calls(lambda: old_extract(text), args.n))
+        report(f"  base58", time_calls(lambda: extract_ca(text), args.n))
+        report(f"  base58 + curve", time_calls(lambda: extract_ca(text, check_curve=True), args.n))
+
+    report("b58decode_int (44 chars)", time_calls(lambda: b58decode_int(CA), args.n))
+
+    # How much junk gets through
+    junk = ["".join(rng.choices(BASE58_ALPHABET, k=rng.randint(32, 44))) for _ in range(args.n)]
+    old_pass = sum(old_extract(s) is not None for s in junk)
+    new_pass = sum(extract_ca(s) is not None for s in junk)
+    curve_pass = sum(extract_ca(s, check_curve=True) is not None for s in junk)
+    print(f"random base58 strings accepted: old {old_pass / len(junk):.1%}, "
+          f"32-byte check {new_pass / len(junk):.1%}, + on-curve {curve_pass / len(junk):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+CA acquisition benchmark: time to a valid CA from the clipboard alone, OCR
+alone, and both raced (first valid wins, the other is cancelled)
+
+Source latencies are simulated (lognormal around --clipboard-ms / --ocr-ms,
+with a miss rate each); a miss costs the source its full timeout. The OCR
+time is to a confirmed CA, i.e. two agreeing reads.
+
+    python -m benchmarks.bench_ca_race --n 100 --clipboard-ms 120 --ocr-ms 300
+"""
+import argparse
+import asyncio
+import random
+
+from core.acquire import CLIPBOARD, OCR, CARace
+from benchmarks.common import percentile
+
+
+def source(rng: random.Random, median_ms: float, miss: float, timeout: float):
+    delay = min(timeout, median_ms / 1000 * rng.lognormvariate(0, 0.5))
+    hit = rng.random() >= miss
+
+    async def run():
+        if not hit:
+            await asyncio.sleep(timeout)
+            return None
+        await asyncio.sleep(delay)
+        return "CA"
+
+    return run
+
+
+async def measure(args, names):
+    rng = random.Random(1)
+    race = CARace()
+    times, found = [], 0
+    for _ in range(args.n):
+        # Same draws for every configuration
+        sources = {
+            CLIPBOARD: source(rng, args.clipboard_ms, args.clipboard_miss, args.timeout),
+            OCR: source(rng, args.ocr_ms, args.ocr_miss, args.timeout),
+        }
+        winner, ca, elapsed = await race.run({name: sources[name] for name in names})
+        times.append(elapsed * 1000)
+        found += ca is not None
+    return times, found, race
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100)
+    parser.add_argument("--clipboard-ms", type=float, default=120)
+    parser.add_argument("--clipboard-miss", type=float, default=0.1)
+    parser.add_argument("--ocr-ms", type=float, default=300, help="two agreeing reads")
+    parser.add_argument("--ocr-miss", type=float, default=0.2)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    args = parser.parse_args()
+
+    for label, names in (("clipboard", [CLIPBOARD]), ("ocr", [OCR]), ("race", [CLIPBOARD, OCR])):
+        times, found, race = asyncio.run(measure(args, names))
+        wins = ", ".join(f"{name} {stats.wins}" for name, stats in race.stats.items())
+        print(f"  {label:<10} p50 {percentile(times, 50):6.0f}ms  p90 {percentile(times, 90):6.0f}ms  "
+              f"p99 {percentile(times, 99):6.0f}ms  CA found {found / args.n:6.1%}  wins: {wins}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Callout matcher benchmark: old per-keyword `in` loop vs regex alternation vs
+the matchers in core.callout (substring loop, pure Python Aho-Corasick,
+pyahocorasick) at 10 / 1k / 10k keywords,
+plus scan-loop lag while the keyword list is reloaded
+
+    python -m benchmarks.bench_callout --n 200
+"""
+import argparse
+import asyncio
+import random
+import re
+import time
+
+from core.callout import CalloutMatcher, create_matcher
+from benchmarks.common import report, time_calls
+
+
+# Keywords and filler use disjoint letters, so "no hit" really has no hit
+KEYWORD_LETTERS = "abcdefghijklm"
+FILLER_LETTERS = "nopqrstuvwxyz0123456789"
+
+
+def old_find_callout(text, keywords):
+    text_lower = text.lower()
+    for keyword in keywords:
+        if keyword.lower() in text_lower:
+            return True
+    return False
+
+
+def keywords(rng: random.Random, n: int):
+    out = set()
+    while len(out) < n:
+        words = ["".join(rng.choices(KEYWORD_LETTERS, k=rng.randint(4, 10))) for _ in range(rng.randint(1, 2))]
+        out.add(" ".join(words))
+    return sorted(out)
+
+
+def feed(rng: random.Random, size: int, hit: str = "") -> str:
+    """OCR-like feed text; `hit` goes at the very end (worst case for early exit)"""
+    words = []
+    while sum(len(w) + 1 for w in words) < size:
+        words.append("".join(rng.choices(FILLER_LETTERS, k=rng.randint(2, 9))))
+    return " ".join(words) + (f" {hit.upper()}" if hit else "")
+
+
+async def reload_lag(kws, backend: str, tick: float = 0.005):
+    """Max delay of a 5ms scan tick while a new matcher builds on a thread"""
+    callouts = CalloutMatcher(kws[:10], backend)
+    text = feed(random.Random(2), 300)
+    lags = []
+    stop = False
+
+    async def scan():
+        next_tick = time.perf_counter()
+        while not stop:
+            next_tick += tick
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+            lags.append(time.perf_counter() - next_tick)
+            callouts.search(text)
+
+    task = asyncio.ensure_future(scan())
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    await callouts.reload(kws)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.05)
+    stop = True
+    await task
+    return elapsed * 1000, max(lags) * 1000, callouts.version
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=200)
+    parser.add_argument("--text", type=int, default=2000, help="feed text size in chars")
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    backends = ["loop", "python"]
+    try:
+        create_matcher(["x"], "pyahocorasick")
+        backends.append("pyahocorasick")
+    except ImportError:
+        print("pyahocorasick not installed, skipping it")
+
+    for count in (10, 1000, 10000):
+        kws = keywords(rng, count)
+        miss = feed(rng, args.text)
+        hit = feed(rng, args.text, kws[-1])
+        print(f"{count} keywords, {len(miss)}-char feed (no hit / hit at the end)")
+
+        report("  old `in` loop, no hit", time_calls(lambda: old_find_callout(miss, kws), args.n))
+        report("  old `in` loop, hit", time_calls(lambda: old_find_callout(hit, kws), args.n))
+
+        start = time.perf_counter()
+        alternation = re.compile("|".join(map(re.escape, kws)), re.IGNORECASE)
+        build = (time.perf_counter() - start) * 1000
+        report(f"  regex alternation (build {build:.0f}ms)", time_calls(lambda: alternation.search(miss), args.n))
+
+        for backend in backends:
+            start = time.perf_counter()
+            matcher = create_matcher(kws, backend)
+            build = (time.perf_counter() - start) * 1000
+            assert matcher.search(miss) is None and kws[-1] in matcher.hits(hit)
+            report(f"  {backend} (build {build:.0f}ms), no hit", time_calls(lambda: matcher.search(miss), args.n))
+            report(f"  {backend} find_all, hit", time_calls(lambda: matcher.find_all(hit), args.n))
+
+    kws = keywords(rng, 10000)
+    for backend in backends:
+        elapsed, lag, version = asyncio.run(reload_lag(kws, backend))
+        print(f"reload 10k keywords ({backend}) on a thread: {elapsed:.0f}ms, "
+              f"max 5ms-tick lag of the scan loop {lag:.1f}ms, version {version}")
+
+
+if __name__ == "__main__":
+    main()
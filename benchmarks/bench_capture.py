@@ -0,0 +1,38 @@
+"""
+Capture backend benchmark: captures/sec and per-capture latency
+
+    python -m benchmarks.bench_capture                      # synthetic only
+    xvfb-run python -m benchmarks.bench_capture --backend mss pil --legacy
+"""
+import argparse
+
+from core.capture import create_capture_backend
+from benchmarks.common import time_calls, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", nargs="+", default=["synthetic"])
+    parser.add_argument("--n", type=int, default=5000)
+    parser.add_argument("--x", type=int, default=100)
+    parser.add_argument("--y", type=int, default=100)
+    parser.add_argument("--roi", type=int, default=32, help="side of the square ROI grab")
+    parser.add_argument("--legacy", action="store_true", help="also time the one-shot get_pixel_color")
+    args = parser.parse_args()
+
+    for name in args.backend:
+        with create_capture_backend(name) as backend:
+            samples = time_calls(lambda: backend.get_pixel(args.x, args.y), args.n)
+            report(f"{name} pixel", samples)
+
+            samples = time_calls(lambda: backend.grab(args.x, args.y, args.roi, args.roi), args.n)
+            report(f"{name} roi {args.roi}x{args.roi}", samples)
+
+    if args.legacy:
+        from core.sniper import get_pixel_color
+        samples = time_calls(lambda: get_pixel_color(args.x, args.y), min(args.n, 500))
+        report("legacy ImageGrab pixel", samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Clipboard benchmark: read latency and change-notification reaction time
+
+    python -m benchmarks.bench_clipboard                              # memory backend
+    python -m benchmarks.bench_clipboard --backend windows powershell  # on Windows
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from core.clipboard import ClipboardService, MemoryClipboardBackend, create_clipboard_backend
+from benchmarks.common import time_calls, report
+
+
+CA = "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr"
+
+
+async def reaction(service: ClipboardService, rounds: int, delay: float):
+    """Copy from another thread after `delay`; measure how late wait_for_change notices"""
+    backend = service.backend
+    samples = []
+    for i in range(rounds):
+        seq = service.sequence()
+        copied_at = []
+
+        def copy():
+            time.sleep(delay)
+            copied_at.append(time.perf_counter())
+            backend.set_text(f"{CA} {i}")
+
+        threading.Thread(target=copy).start()
+        text = await service.wait_for_change(1.0, since=seq)
+        if text is not None:
+            samples.append((time.perf_counter() - copied_at[0]) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", nargs="+", default=["memory"])
+    parser.add_argument("--n", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    for name in args.backend:
+        backend = create_clipboard_backend(name)
+        n = args.n if name != "powershell" else 10
+        if isinstance(backend, MemoryClipboardBackend):
+            backend.set_text(CA)
+        report(f"{name} read", time_calls(backend.read, n, warmup=min(n, 10)))
+        if backend.sequence() is not None:
+            report(f"{name} sequence", time_calls(backend.sequence, n))
+
+    # Reaction time needs a backend we can write to from the benchmark
+    service = ClipboardService(MemoryClipboardBackend())
+    samples = asyncio.run(reaction(service, args.rounds, 0.02))
+    report("memory change -> wait_for_change", samples)
+    print(f"  poll interval {service.poll_interval * 1000:.0f}ms (old path: fixed 300ms wait + powershell read per click)")
+
+
+if __name__ == "__main__":
+    main()
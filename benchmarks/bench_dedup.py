@@ -0,0 +1,98 @@
+"""
+Dedup store benchmark: startup time and lookups with 1M bought mints
+
+    python -m benchmarks.bench_dedup --entries 1000000 --cache 100000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from core.dedup import DedupStore
+from benchmarks.common import report, time_calls
+
+
+ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def fake_mints(n: int, seed: int):
+    rng = random.Random(seed)
+    return ["".join(rng.choices(ALPHABET, k=44)) for _ in range(n)]
+
+
+def populate(path: str, mints, span: float):
+    """Write entries straight to the table, spread over the last `span` seconds"""
+    DedupStore(path).close()  # create the schema
+    now = time.time()
+    step = span / len(mints)
+    db = sqlite3.connect(path)
+    with db:
+        db.executemany(
+            "INSERT INTO mints (mint, added) VALUES (?, ?)",
+            ((m, now - span + i * step) for i, m in enumerate(mints))
+        )
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--cache", type=int, default=100_000)
+    parser.add_argument("--n", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bought.db")
+        print(f"generating {args.entries:,} mints...")
+        mints = fake_mints(args.entries, 1)
+        start = time.perf_counter()
+        populate(path, mints, span=6 * 24 * 3600)
+        size = os.path.getsize(path) + (os.path.getsize(path + "-wal") if os.path.exists(path + "-wal") else 0)
+        print(f"  written in {time.perf_counter() - start:.1f}s, {size / 1e6:.1f} MB on disk")
+
+        # Startup: open + prune + cache warm-up
+        tracemalloc.start()
+        start = time.perf_counter()
+        store = DedupStore(path, cache_size=args.cache)
+        startup = time.perf_counter() - start
+        cache_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"startup: {startup * 1000:.0f}ms, {store.cached:,} cached, "
+              f"{cache_bytes / 1e6:.1f} MB in memory")
+
+        # The naive alternative: every mint in a Python set
+        tracemalloc.start()
+        start = time.perf_counter()
+        db = sqlite3.connect(path)
+        everything = {row[0] for row in db.execute("SELECT mint FROM mints")}
+        db.close()
+        full_load = time.perf_counter() - start
+        full_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"full set load: {full_load * 1000:.0f}ms, {len(everything):,} entries, "
+              f"{full_bytes / 1e6:.1f} MB in memory")
+        del everything
+
+        rng = random.Random(2)
+        recent = mints[-args.cache // 2:]
+        old = mints[:args.entries // 2]
+        unseen = fake_mints(args.n, 3)
+
+        it = iter(rng.choices(recent, k=args.n * 2))
+        report("contains (recent, cached)", time_calls(lambda: next(it) in store, args.n))
+        it = iter(rng.choices(old, k=args.n * 2))
+        report("contains (old, on disk)", time_calls(lambda: next(it) in store, args.n))
+        it = iter(unseen * 2)
+        report("contains (never seen)", time_calls(lambda: next(it) in store, args.n))
+        new = iter(fake_mints(args.n * 2, 4))
+        report("add (new mint)", time_calls(lambda: store.add(next(new)), args.n))
+
+        print(f"cache stays bounded: {store.cached:,} <= {args.cache:,}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Detector benchmark: single pixel (old path) vs multi-probe ROI voting
+
+    python -m benchmarks.bench_detector --probes 9 --votes 3
+"""
+import argparse
+
+import numpy as np
+
+from core.capture import SyntheticCaptureBackend
+from core.detector import RegionDetector, probes_from_offsets
+from core.sniper import colors_different
+from benchmarks.common import time_calls, report
+from tests.helpers.session import grid_offsets
+
+
+X, Y = 764, 344
+
+
+def false_triggers(detect, backend, frames: int, seed: int = 1) -> int:
+    """Count triggers when single noisy pixels flicker around the watched area"""
+    rng = np.random.default_rng(seed)
+    base = backend.screen.copy()
+    hits = 0
+    for _ in range(frames):
+        backend.screen[:] = base
+        dx, dy = rng.integers(-8, 9, size=2)
+        backend.screen[Y + dy, X + dx] = rng.integers(0, 256, size=3)
+        hits += bool(detect())
+    backend.screen[:] = base
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--probes", type=int, default=9)
+    parser.add_argument("--votes", type=int, default=3)
+    parser.add_argument("--rect", type=int, default=0, help="probe rectangle side (0 = points)")
+    parser.add_argument("--noise-frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    backend = SyntheticCaptureBackend(1920, 1080, color=(30, 30, 40))
+    backend.open()
+
+    # Old path: one pixel + colors_different
+    base = backend.get_pixel(X, Y)
+
+    def single():
+        return colors_different(base, backend.get_pixel(X, Y), tolerance=15)
+
+    offsets = grid_offsets(args.probes)
+    if args.rect:
+        offsets = [o + [args.rect, args.rect] for o in offsets]
+    detector = RegionDetector(probes_from_offsets(X, Y, offsets), tolerance=15, min_votes=args.votes)
+    detector.rebase(backend)
+
+    def multi():
+        return detector.check(backend).changed
+
+    print(f"ROI {detector.width}x{detector.height}, {args.probes} probes, trigger on {detector.min_votes}")
+    report("single pixel", time_calls(single, args.n))
+    report(f"{args.probes} probes k={detector.min_votes}", time_calls(multi, args.n))
+
+    print(f"false triggers / {args.noise_frames} noisy frames:")
+    print(f"  single pixel: {false_triggers(single, backend, args.noise_frames)}")
+    print(f"  multi probe:  {false_triggers(multi, backend, args.noise_frames)}")
+
+    # Real change must still trigger
+    backend.paint(detector.left, detector.top, detector.width, detector.height, (200, 120, 0))
+    print(f"real change detected: single={single()} multi={multi()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Fan-out benchmark: sequential buy_multiple vs concurrent fan-out against
+the local stub
+
+    python -m benchmarks.bench_fanout --attempts 5 --server-delay 0.2
+"""
+import argparse
+import asyncio
+import time
+
+from core.api import PumpPortalAPI
+from tests.helpers.stub_server import StubServer
+
+
+MINT = "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr"
+
+
+async def run(args):
+    server = StubServer(delay=args.server_delay, jitter=args.jitter)
+    url = await server.start()
+    api = PumpPortalAPI("bench", base_url=url, keep_warm_interval=0)
+    await api.start()
+
+    modes = [
+        ("sequential", dict(delay_between=args.delay_between)),
+        (f"fan-out K={args.attempts}", dict(concurrency=args.attempts)),
+        ("fan-out K=2", dict(concurrency=2)),
+        (f"fan-out K={args.attempts} stagger 50ms", dict(concurrency=args.attempts, stagger=0.05)),
+        (f"fan-out K={args.attempts} stop after 1", dict(concurrency=args.attempts, stagger=0.05, stop_after=1)),
+    ]
+
+    print(f"{args.attempts} attempts, server delay {args.server_delay * 1000:.0f}ms + 0..{args.jitter * 1000:.0f}ms")
+    for label, kwargs in modes:
+        start = time.perf_counter()
+        order = []
+        results = await api.buy_multiple(
+            MINT, 0.01, num_attempts=args.attempts,
+            on_result=lambda r: order.append(r.attempt), **kwargs
+        )
+        wall = (time.perf_counter() - start) * 1000
+        print(f"  {label:<32} wall {wall:>7.0f}ms  results {len(results)}  completion order {order}")
+
+    await api.close()
+    await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--attempts", type=int, default=5)
+    parser.add_argument("--server-delay", type=float, default=0.2)
+    parser.add_argument("--delay-between", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
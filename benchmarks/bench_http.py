@@ -0,0 +1,73 @@
+"""
+HTTP benchmark: time-to-first-byte with a fresh session per call (old
+behaviour) vs the pooled, pre-warmed PumpPortalAPI session
+
+    python -m benchmarks.bench_http --n 200
+    python -m benchmarks.bench_http --url https://pumpportal.fun/api/trade --n 5
+
+Against the local stub this only shows TCP setup; with TLS and DNS on a
+real endpoint the cold path pays noticeably more.
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from core.api import PumpPortalAPI
+from benchmarks.common import report
+from tests.helpers.stub_server import StubServer
+
+
+PAYLOAD = {
+    "action": "buy",
+    "mint": "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr",
+    "amount": 0.01,
+    "denominatedInSol": "true",
+    "slippage": 49,
+    "priorityFee": 0.001,
+    "pool": "auto"
+}
+
+
+async def ttfb(session: aiohttp.ClientSession, url: str) -> float:
+    """Microseconds until response headers arrive"""
+    start = time.perf_counter_ns()
+    async with session.post(url, json=PAYLOAD) as resp:
+        elapsed = (time.perf_counter_ns() - start) / 1000.0
+        await resp.read()
+    return elapsed
+
+
+async def run(args):
+    server = None
+    url = args.url
+    if not url:
+        server = StubServer()
+        url = await server.start()
+
+    cold = []
+    for _ in range(args.n):
+        async with aiohttp.ClientSession() as session:
+            cold.append(await ttfb(session, url))
+    report("cold (session per call)", cold)
+
+    api = PumpPortalAPI("bench", base_url=url, keep_warm_interval=0)
+    await api.start()
+    warm = [await ttfb(api._get_session(), api.trade_url) for _ in range(args.n)]
+    report("warm (pooled session)", warm)
+    await api.close()
+
+    if server:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="")
+    parser.add_argument("--n", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
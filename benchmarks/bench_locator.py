@@ -0,0 +1,89 @@
+"""
+Template locator benchmark: full-resolution matchTemplate over the screen vs
+pyramid search vs ROI tracking, on a synthetic 1920x1080 page that shifts
+by a few pixels between frames
+
+    python -m benchmarks.bench_locator --n 50
+"""
+import argparse
+import random
+
+import cv2
+import numpy as np
+
+from core.capture import SyntheticCaptureBackend
+from core.locator import TemplateLocator, to_gray
+from benchmarks.common import report, time_calls
+
+
+def page(width: int = 1920, height: int = 1080, seed: int = 1) -> np.ndarray:
+    """Busy page: random boxes and text, plus one 'View Coin' button"""
+    rng = random.Random(seed)
+    img = np.full((height, width, 3), 24, dtype=np.uint8)
+    for _ in range(120):
+        x, y = rng.randrange(width - 200), rng.randrange(height - 60)
+        color = tuple(rng.randrange(40, 200) for _ in range(3))
+        cv2.rectangle(img, (x, y), (x + rng.randint(40, 200), y + rng.randint(15, 60)), color, -1)
+        cv2.putText(img, "".join(rng.choices("abcdef0123", k=8)), (x + 3, y + 14),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (230, 230, 230), 1)
+    return img
+
+
+def draw_button(img: np.ndarray, x: int, y: int):
+    cv2.rectangle(img, (x - 60, y - 18), (x + 60, y + 18), (40, 170, 90), -1)
+    cv2.putText(img, "View Coin", (x - 50, y + 7), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=50)
+    parser.add_argument("--shift", type=int, default=12, help="max page shift per frame in px")
+    args = parser.parse_args()
+    rng = random.Random(2)
+
+    base = page()
+    bx, by = 764, 344
+    draw_button(base, bx, by)
+    template = base[by - 22:by + 22, bx - 66:bx + 66].copy()
+
+    capture = SyntheticCaptureBackend(1920, 1080)
+    capture.screen[:] = base
+    locator = TemplateLocator("view_coin", template, expected=(bx, by))
+    gray_screen = to_gray(base)
+    gray_template = to_gray(template)
+
+    report("full-res matchTemplate", time_calls(
+        lambda: cv2.minMaxLoc(cv2.matchTemplate(gray_screen, gray_template, cv2.TM_CCOEFF_NORMED)), args.n))
+    report(f"pyramid search ({locator.levels} levels)", time_calls(lambda: locator.search_image(gray_screen), args.n))
+    report("search() incl. grab + gray", time_calls(lambda: locator.search(capture), args.n))
+    report(f"track() (+-{locator.margin}px ROI)", time_calls(lambda: locator.track(capture), args.n))
+
+    # Page drifting: the button moves with it
+    found = tracked = 0
+    errors = []
+    x, y = bx, by
+    for _ in range(200):
+        dx, dy = rng.randint(-args.shift, args.shift), rng.randint(-args.shift, args.shift)
+        x = min(max(100, x + dx), 1800)
+        y = min(max(60, y + dy), 1000)
+        capture.screen[:] = np.roll(np.roll(base, y - by, axis=0), x - bx, axis=1)
+        loc = locator.locate(capture)
+        if loc is not None:
+            found += 1
+            tracked += loc.mode == "track"
+            errors.append(abs(loc.x - x) + abs(loc.y - y))
+    print(f"drift test (200 frames, +-{args.shift}px steps): found {found}, by tracking {tracked}, "
+          f"max position error {max(errors) if errors else '-'}px")
+
+    # Big jump (window moved): tracking loses it, search recovers
+    capture.screen[:] = np.roll(np.roll(base, 300, axis=0), -400, axis=1)
+    loc = locator.locate(capture)
+    print(f"jump by (-400, +300): {loc.mode if loc else 'lost'} -> ({loc.x}, {loc.y}), expected ({bx - 400}, {by + 300}), "
+          f"score {loc.score:.2f}, {loc.ms:.1f}ms" if loc else "jump: lost")
+
+    capture.screen[:] = page(seed=9)
+    print(f"button gone: {locator.locate(capture)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+OCR benchmark: latency and throughput of the old pytesseract path vs the
+warm worker pool (tesserocr when installed, tesseract over stdin otherwise)
+
+    python -m benchmarks.bench_ocr --tesseract "C:\\Program Files\\Tesseract-OCR\\tesseract.exe"
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import cv2
+import numpy as np
+
+from core.ocr_service import DEFAULT_TESSERACT, OCRService
+from benchmarks.common import percentile
+
+
+CA = "Bbd9DcnZrGZPwUUszZ5XW7eGiu7Bhn6XnPfY6R3Xpump"
+
+
+def notification(width: int = 900, height: int = 120) -> np.ndarray:
+    """Binarized text crop like the ones OCREngine.preprocess produces"""
+    img = np.full((height, width), 255, dtype=np.uint8)
+    cv2.putText(img, "New coin launched - View Coin", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 0, 2)
+    cv2.putText(img, CA, (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2)
+    return img
+
+
+def latency(service: OCRService, img: np.ndarray, n: int):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        text = service.recognize_sync(img)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, text
+
+
+async def throughput(service: OCRService, img: np.ndarray, n: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(service.recognize(img) for _ in range(n)))
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tesseract", default=DEFAULT_TESSERACT)
+    parser.add_argument("--backends", nargs="+", default=["pytesseract", "cli", "capi", "tesserocr"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--n", type=int, default=30)
+    args = parser.parse_args()
+
+    img = notification()
+    print(f"image {img.shape[1]}x{img.shape[0]}, {args.n} calls, {args.workers} workers")
+
+    for name in args.backends:
+        try:
+            service = OCRService(name, workers=args.workers, tesseract_path=args.tesseract)
+        except (ImportError, OSError) as e:
+            print(f"  {name:<12} skipped ({e})")
+            continue
+        warm_ms = service.start()
+        try:
+            samples, text = latency(service, img, args.n)
+            rate = asyncio.run(throughput(service, img, args.n * 2))
+        except Exception as e:
+            print(f"  {name:<12} failed: {e}")
+            service.close()
+            continue
+        service.close()
+        found = CA in text.replace(" ", "")
+        print(f"  {name:<12} warm-up {warm_ms:6.0f}ms  latency p50 {percentile(samples, 50):7.1f}ms "
+              f"p99 {percentile(samples, 99):7.1f}ms  throughput {rate:7.1f} img/s  CA read: {found}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+OCR cache benchmark: OCREngine.extract_text with and without the crop-hash
+LRU on a mostly unchanged screen (a new notification every few frames)
+
+The recognizer is simulated (fixed sleep) so the numbers don't depend on a
+Tesseract install; --ocr-ms sets its cost.
+
+    python -m benchmarks.bench_ocr_cache --frames 300 --change-every 20
+"""
+import argparse
+import asyncio
+import time
+
+import cv2
+import numpy as np
+
+from core.ocr import OCREngine
+from core.ocr_cache import crop_key
+from core.ocr_service import OCRBackend
+from benchmarks.common import percentile, report, time_calls
+
+
+class SimulatedBackend(OCRBackend):
+    """Sleeps like a Tesseract call (fixed cost + cost per pixel row) and counts calls"""
+
+    name = "simulated"
+
+    def __init__(self, cost_ms: float, per_row_ms: float = 0.0):
+        super().__init__()
+        self.cost = cost_ms / 1000
+        self.per_row = per_row_ms / 1000
+        self.calls = 0
+
+    def recognize(self, img: np.ndarray) -> str:
+        self.calls += 1
+        time.sleep(self.cost + self.per_row * img.shape[0])
+        return f"text {crop_key(img).hex()[:8]}"
+
+
+def screen(i: int, width: int = 1920, height: int = 1080) -> np.ndarray:
+    """BGR screenshot with notification number i in the top area"""
+    img = np.full((height, width, 3), 30, dtype=np.uint8)
+    cv2.putText(img, f"New coin #{i} - View Coin", (40, 120), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+    # Changing pixels outside the crop (a chart, a clock) must not matter
+    cv2.putText(img, f"{time.perf_counter_ns()}", (40, 900), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+    return img
+
+
+def engine(cost_ms: float, cache_size: int):
+    backend = SimulatedBackend(cost_ms)
+    ocr = OCREngine(backend=backend, workers=2, cache_size=cache_size)
+    ocr.get_service()
+    backend.calls = 0
+    return ocr, backend
+
+
+def run(cost_ms: float, cache_size: int, frames, label: str):
+    ocr, backend = engine(cost_ms, cache_size)
+    samples = []
+    for img in frames:
+        start = time.perf_counter()
+        ocr.extract_text(img)
+        samples.append((time.perf_counter() - start) * 1000)
+    total = sum(samples)
+    print(f"  {label:<10} p50 {percentile(samples, 50):6.2f}ms  p99 {percentile(samples, 99):6.2f}ms  "
+          f"total {total:7.0f}ms  OCR runs {backend.calls}")
+    if ocr.cache is not None:
+        stats = ocr.cache.stats()
+        print(f"  {'':<10} hit rate {stats['hit_rate']:.1%}  entries {stats['entries']}  "
+              f"bytes {stats['bytes']}  evictions {stats['evictions']}")
+    ocr.close()
+
+
+async def burst(cost_ms: float, img: np.ndarray, n: int):
+    """n concurrent async calls on the same frame share one OCR run"""
+    ocr, backend = engine(cost_ms, 256)
+    texts = await asyncio.gather(*(ocr.extract_text_async(img) for _ in range(n)))
+    ocr.close()
+    return backend.calls, len(set(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--change-every", type=int, default=20)
+    parser.add_argument("--ocr-ms", type=float, default=60.0)
+    parser.add_argument("--cache-size", type=int, default=256)
+    args = parser.parse_args()
+
+    frames = [screen(i // args.change_every) for i in range(args.frames)]
+    distinct = len({crop_key(OCREngine().preprocess(f)) for f in frames})
+    print(f"{args.frames} frames, new notification every {args.change_every}, "
+          f"{distinct} distinct crops, simulated OCR {args.ocr_ms:.0f}ms")
+
+    run(args.ocr_ms, 0, frames, "no cache")
+    run(args.ocr_ms, args.cache_size, frames, "cache")
+
+    ocr = OCREngine()
+    crop = ocr.preprocess(frames[0])
+    report("preprocess (1920x1080)", time_calls(lambda: ocr.preprocess(frames[0]), 200))
+    report(f"crop_key ({crop.shape[1]}x{crop.shape[0]})", time_calls(lambda: crop_key(crop), 200))
+
+    calls, texts = asyncio.run(burst(args.ocr_ms, frames[0], 20))
+    print(f"20 concurrent async calls on one frame: {calls} OCR run(s), {texts} distinct result(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Incremental row OCR benchmark: whole-crop OCR vs OCR of new row bands only,
+on a scrolling feed where one message arrives per frame
+
+The recognizer is simulated with a fixed cost plus a cost per pixel row
+(Tesseract time grows with the amount of image it has to lay out).
+
+    python -m benchmarks.bench_ocr_rows --frames 60 --visible 8
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import cv2
+import numpy as np
+
+from core.ocr import OCREngine
+from core.ocr_rows import split_bands
+from benchmarks.bench_ocr_cache import SimulatedBackend
+from benchmarks.common import percentile, report, time_calls
+
+
+LINE_HEIGHT = 40
+
+
+def message(rng: random.Random, i: int) -> str:
+    words = ["new", "coin", "launched", "view", "chart", "dev", "sold", "ape", "LFG", "mcap", "holders"]
+    return f"#{i} " + " ".join(rng.choice(words) for _ in range(rng.randint(3, 8)))
+
+
+def feed_frame(messages, width: int = 1920, height: int = 1080) -> np.ndarray:
+    """BGR screenshot with the newest message on top of the feed"""
+    img = np.full((height, width, 3), 30, dtype=np.uint8)
+    for row, text in enumerate(messages):
+        y = 30 + row * LINE_HEIGHT
+        cv2.putText(img, text, (20, y), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+    return img
+
+
+def engine(args) -> OCREngine:
+    backend = SimulatedBackend(args.ocr_ms, args.row_ms)
+    ocr = OCREngine(backend=backend, workers=args.workers, cache_size=0)
+    ocr.get_service()
+    backend.calls = 0
+    return ocr
+
+
+def run(label: str, frames, read, ocr: OCREngine):
+    samples, lines = [], 0
+    for img in frames:
+        start = time.perf_counter()
+        out = read(img)
+        samples.append((time.perf_counter() - start) * 1000)
+        lines += len(out) if isinstance(out, list) else 1
+    print(f"  {label:<22} p50 {percentile(samples, 50):6.1f}ms  p99 {percentile(samples, 99):6.1f}ms  "
+          f"total {sum(samples):7.0f}ms  OCR runs {ocr.get_service().backend.calls:4d}  lines out {lines}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--visible", type=int, default=8, help="messages on screen")
+    parser.add_argument("--ocr-ms", type=float, default=8.0, help="fixed cost per OCR call")
+    parser.add_argument("--row-ms", type=float, default=0.15, help="cost per pixel row")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    history = [message(rng, i) for i in range(args.frames + args.visible)]
+    frames = [feed_frame(list(reversed(history[i:i + args.visible]))) for i in range(args.frames)]
+
+    probe = OCREngine(cache_size=0)
+    crop = probe.preprocess(frames[0])
+    bands = split_bands(crop)
+    print(f"{args.frames} frames, {args.visible} messages visible, one new per frame; "
+          f"crop {crop.shape[1]}x{crop.shape[0]}, {len(bands)} bands")
+
+    ocr = engine(args)
+    run("whole crop", frames, ocr.extract_text, ocr)
+    ocr.close()
+
+    ocr = engine(args)
+    ocr.prime_lines(frames[0])
+    run("new rows", frames[1:], ocr.extract_new_lines, ocr)
+    rows = ocr.get_rows().stats()
+    print(f"  {'':<22} bands seen {rows['bands']}, OCR'd {rows['new_bands']} ({args.visible} when priming)")
+    ocr.close()
+
+    ocr = engine(args)
+    ocr.prime_lines(frames[0])
+    loop = asyncio.new_event_loop()
+    run("new rows (async)", frames[1:], lambda img: loop.run_until_complete(ocr.extract_new_lines_async(img)), ocr)
+    loop.close()
+    ocr.close()
+
+    report("split_bands", time_calls(lambda: split_bands(crop), 500))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Request-build microbenchmark: per-attempt dict + URL f-string + JSON
+encode (old buy_multiple loop) vs splicing the mint into a precompiled
+TradeTemplate
+
+    python -m benchmarks.bench_payload --n 100000
+"""
+import argparse
+import json
+import tracemalloc
+
+from core.api import PumpPortalAPI
+from benchmarks.common import time_calls, report
+
+
+MINT = "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr"
+
+
+def make_old(api: PumpPortalAPI):
+    def build():
+        url = f"{api.base_url}?api-key={api.api_key}"
+        payload = {
+            "action": "buy",
+            "mint": MINT,
+            "amount": 0.01,
+            "denominatedInSol": "true",
+            "slippage": 49,
+            "priorityFee": 0.001,
+            "pool": "auto"
+        }
+        # aiohttp's json= path: dumps to str, then encodes to bytes
+        return url, json.dumps(payload).encode("utf-8")
+    return build
+
+
+def make_new(api: PumpPortalAPI):
+    def build():
+        template = api.get_template(0.01, 49, 0.001)
+        return template.url, template.body(MINT)
+    return build
+
+
+def allocations(build, n: int):
+    """Memory blocks and bytes still allocated per build when results are kept"""
+    keep = [None] * n
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(n):
+        keep[i] = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(s.count_diff for s in stats)
+    size = sum(s.size_diff for s in stats)
+    return blocks / n, size / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100000)
+    args = parser.parse_args()
+
+    api = PumpPortalAPI("0123456789abcdef0123456789abcdef")
+    old, new = make_old(api), make_new(api)
+    assert json.loads(old()[1]) == json.loads(new()[1])
+
+    report("old: dict + f-string + json", time_calls(old, args.n))
+    report("new: template splice", time_calls(new, args.n))
+
+    for label, build in (("old", old), ("new", new)):
+        blocks, size = allocations(build, 10000)
+        print(f"  {label}: {blocks:.1f} live blocks / {size:.0f} bytes per attempt")
+
+
+if __name__ == "__main__":
+    main()
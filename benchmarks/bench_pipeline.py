@@ -0,0 +1,92 @@
+"""
+Pipeline benchmark: tokens bought per minute vs notification rate, with 1
+snipe in flight (serial) or several (buys overlap, monitoring never stops)
+
+Full Sniper flow on a synthetic screen, a memory clipboard and the stub
+trade server; notifications arrive as a Poisson process.
+
+Concurrency only pays off when buy rounds are long next to the part that
+drives the mouse (open, wait for the chart, copy the CA), which runs one
+snipe at a time. The defaults are the app's own (5 attempts 0.5s apart,
+about 2.7s per round). With a short round (--attempts 3
+--delay-between 0.3) a single worker keeps up and extra ones add little.
+"unseen" counts notifications that landed while our own clicks were
+driving the UI; those are absorbed, not queued.
+
+    python -m benchmarks.bench_pipeline --rates 30 90 --concurrency 1 3 --duration 15
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import core.sniper as sniper_module
+from core.capture import SyntheticCaptureBackend
+from core.clipboard import ClipboardService, MemoryClipboardBackend
+from tests.helpers.stub_server import StubServer
+from tests.helpers.ui import CA_AREA, VIEW_COIN, FakeUI, random_mint
+
+
+async def scenario(rate: float, concurrency: int, duration: float, args, seed: int = 1):
+    rng = random.Random(seed)
+    server = StubServer(delay=args.api_ms / 1000)
+    url = await server.start()
+
+    capture = SyntheticCaptureBackend(800, 600)
+    memory = MemoryClipboardBackend()
+    ui = FakeUI(capture, memory, args.chart_ms)
+    sniper_module.windows_click = ui.click
+
+    sniper = sniper_module.Sniper(
+        "key", capture=capture, clipboard=ClipboardService(memory), api_url=url,
+        view_coin_x=VIEW_COIN[0], view_coin_y=VIEW_COIN[1], ca_area_x=CA_AREA[0], ca_area_y=CA_AREA[1],
+        num_attempts=args.attempts, delay_between=args.delay_between, rate_limit=0,
+        view_coin_delay=0.1, chart_load_time=1.0, scan_interval=0.01, ca_source="clipboard",
+        snipe_concurrency=concurrency, event_max_age=args.max_age, event_holdoff=0.05
+    )
+    if not args.verbose:
+        sniper.log = lambda msg: None
+    bought = set()
+    sniper.on_ca_found = bought.add
+
+    task = asyncio.ensure_future(sniper.run())
+    await asyncio.sleep(0.3)
+
+    start = time.perf_counter()
+    notified = 0
+    while time.perf_counter() - start < duration:
+        await asyncio.sleep(rng.expovariate(rate / 60))
+        ui.notify(random_mint(rng))
+        notified += 1
+    await asyncio.sleep(args.attempts * (args.delay_between + args.api_ms / 1000) + 1)
+
+    sniper.stop()
+    await task
+    await server.stop()
+    elapsed = time.perf_counter() - start
+    return notified, len(bought), len(bought) / elapsed * 60, sniper.events.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rates", type=float, nargs="+", default=[30, 90], help="notifications per minute")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--attempts", type=int, default=5)
+    parser.add_argument("--delay-between", type=float, default=0.5)
+    parser.add_argument("--api-ms", type=float, default=50)
+    parser.add_argument("--chart-ms", type=float, default=100)
+    parser.add_argument("--max-age", type=float, default=2.0)
+    parser.add_argument("--verbose", action="store_true", help="print the sniper log")
+    args = parser.parse_args()
+
+    for rate in args.rates:
+        for concurrency in args.concurrency:
+            notified, bought, per_min, stats = asyncio.run(scenario(rate, concurrency, args.duration, args))
+            print(f"  {rate:5.0f}/min, {concurrency} in flight: {bought}/{notified} tokens bought "
+                  f"({per_min:5.1f}/min)  unseen {notified - stats['queued']}, superseded {stats['superseded']}, "
+                  f"stale {stats['stale']}, overflow {stats['overflow']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Endpoint racing benchmark: one endpoint vs racing several local stubs with
+different delays
+
+    python -m benchmarks.bench_race --orders 40 --delays 0.05 0.15 0.4
+"""
+import argparse
+import asyncio
+import time
+
+from core.api import PumpPortalAPI
+from benchmarks.common import percentile
+from tests.helpers.stub_server import StubServer
+
+
+MINT = "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr"
+
+
+async def measure(api: PumpPortalAPI, orders: int):
+    latencies = []
+    winners = {}
+    for _ in range(orders):
+        start = time.perf_counter()
+        result = await api.buy(MINT, 0.01)
+        latencies.append((time.perf_counter() - start) * 1000)
+        winners[result.endpoint] = winners.get(result.endpoint, 0) + 1
+    return latencies, winners
+
+
+def print_stats(api: PumpPortalAPI, names):
+    for url in api.endpoints:
+        s = api.endpoint_stats[url]
+        latency = f"{s.latency_ms:7.1f}ms" if s.latency_ms is not None else "      -  "
+        print(f"    {names[url]:<6} ewma {latency}  err {s.error_rate:4.2f}  "
+              f"sent {s.requests:>3}  wins {s.wins:>3}")
+
+
+async def run(args):
+    servers = [StubServer(delay=d, jitter=args.jitter) for d in args.delays]
+    urls = [await server.start() for server in servers]
+    names = {url: f"ep{i}" for i, url in enumerate(urls)}
+
+    print(f"{args.orders} orders, stub delays {[int(d * 1000) for d in args.delays]}ms "
+          f"+ 0..{args.jitter * 1000:.0f}ms, slowest endpoint listed first")
+    # Worst case for a single endpoint: the configured one is the slowest
+    slowest_first = sorted(urls, key=lambda u: -args.delays[urls.index(u)])
+
+    modes = [
+        ("single (slowest)", dict(endpoints=slowest_first[:1])),
+        ("race all", dict(endpoints=slowest_first, race_mode="all")),
+        (f"hedged {args.hedge * 1000:.0f}ms", dict(endpoints=slowest_first, race_mode="hedged", hedge_delay=args.hedge)),
+    ]
+
+    for label, kwargs in modes:
+        api = PumpPortalAPI("bench", keep_warm_interval=0, **kwargs)
+        await api.start()
+        sent_before = sum(s.requests for s in servers)
+        latencies, winners = await measure(api, args.orders)
+        sent = sum(s.requests for s in servers) - sent_before
+        won = ", ".join(f"{names[u]}={n}" for u, n in sorted(winners.items(), key=lambda kv: names[kv[0]]))
+        print(f"  {label:<18} p50 {percentile(latencies, 50):7.1f}ms  p90 {percentile(latencies, 90):7.1f}ms  "
+              f"requests/order {sent / args.orders:4.2f}  winners {won}")
+        print_stats(api, names)
+        await api.close()
+
+    # Routing follows the fastest endpoint when it degrades
+    api = PumpPortalAPI("bench", keep_warm_interval=0, endpoints=urls, race_mode="hedged", hedge_delay=args.hedge)
+    await api.start()
+    await measure(api, args.orders // 2)
+    fastest = min(range(len(servers)), key=lambda i: args.delays[i])
+    servers[fastest].delay = max(args.delays) * 2
+    latencies, winners = await measure(api, args.orders)
+    won = ", ".join(f"{names[u]}={n}" for u, n in sorted(winners.items(), key=lambda kv: names[kv[0]]))
+    print(f"  after ep{fastest} slows to {servers[fastest].delay * 1000:.0f}ms: "
+          f"p50 {percentile(latencies, 50):7.1f}ms  winners {won}  "
+          f"ranking {[names[u] for u in api.ranked_endpoints()]}")
+    await api.close()
+
+    for server in servers:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=40)
+    parser.add_argument("--delays", type=float, nargs="+", default=[0.05, 0.15, 0.4])
+    parser.add_argument("--jitter", type=float, default=0.03)
+    parser.add_argument("--hedge", type=float, default=0.08)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Rate limiter benchmark
+
+1. Simulated load: bursts of detections, each sending 1 first attempt +
+   N-1 extra attempts at once, through a FIFO bucket vs the priority lanes
+2. Local stub enforcing a server-side rate limit: 429s and fills with and
+   without the client-side limiter
+
+    python -m benchmarks.bench_ratelimit --rate 10 --burst 5
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from core.api import PumpPortalAPI
+from core.ratelimit import PRIORITY_HIGH, PRIORITY_LOW, RateLimiter
+from benchmarks.common import percentile
+from tests.helpers.stub_server import StubServer
+
+
+MINT = "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr"
+
+
+def arrivals(args):
+    """Detection times: bursts of `args.burst_size` detections `args.gap` apart"""
+    rng = random.Random(args.seed)
+    t = 0.0
+    times = []
+    for _ in range(args.snipes // args.burst_size):
+        for _ in range(args.burst_size):
+            times.append(t)
+            t += rng.uniform(0, 0.05)
+        t += args.gap
+    return times
+
+
+async def simulated(args, use_priority: bool):
+    limiter = RateLimiter(args.rate, args.burst)
+    first_waits = []
+    other_waits = []
+
+    async def snipe(at: float, start: float):
+        await asyncio.sleep(max(0.0, start + at - time.perf_counter()))
+
+        async def request(attempt: int):
+            priority = PRIORITY_HIGH if use_priority and attempt == 1 else PRIORITY_LOW
+            wait = await limiter.acquire(priority)
+            (first_waits if attempt == 1 else other_waits).append(wait * 1000)
+
+        await asyncio.gather(*(request(i + 1) for i in range(args.attempts)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(snipe(at, start) for at in arrivals(args)))
+    return first_waits, other_waits
+
+
+async def against_stub(args, limiter):
+    server = StubServer(delay=0.02, rate_limit=args.rate, rate_burst=args.burst)
+    url = await server.start()
+    api = PumpPortalAPI("bench", base_url=url, keep_warm_interval=0, rate_limiter=limiter)
+    await api.start()
+
+    first_latency = []
+    filled = 0
+
+    async def snipe(at: float, start: float):
+        nonlocal filled
+        await asyncio.sleep(max(0.0, start + at - time.perf_counter()))
+        t0 = time.perf_counter()
+
+        def on_result(r):
+            if r.attempt == 1:
+                first_latency.append((time.perf_counter() - t0) * 1000)
+
+        results = await api.buy_multiple(MINT, 0.01, num_attempts=args.attempts,
+                                         concurrency=args.attempts, on_result=on_result)
+        filled += sum(r.success for r in results)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(snipe(at, start) for at in arrivals(args)))
+    await api.close()
+    await server.stop()
+    return server.requests, server.rejected, filled, first_latency
+
+
+async def run(args):
+    total = (args.snipes // args.burst_size) * args.burst_size
+    print(f"{total} detections in bursts of {args.burst_size}, {args.attempts} attempts each, "
+          f"limit {args.rate:.0f}/s burst {args.burst}")
+
+    print("simulated load (queueing delay):")
+    for label, use_priority in (("fifo", False), ("priority", True)):
+        first, other = await simulated(args, use_priority)
+        print(f"  {label:<9} first attempt p50 {percentile(first, 50):6.0f}ms p99 {percentile(first, 99):6.0f}ms   "
+              f"extra attempts p50 {percentile(other, 50):6.0f}ms p99 {percentile(other, 99):6.0f}ms")
+
+    print(f"stub enforcing {args.rate:.0f}/s:")
+    for label, limiter in (("no limiter", None), ("limiter", RateLimiter(args.rate * 0.9, args.burst))):
+        sent, rejected, filled, first = await against_stub(args, limiter)
+        print(f"  {label:<11} requests {sent:>4}  429s {rejected:>4}  filled {filled:>4}  "
+              f"first attempt p50 {percentile(first, 50):6.0f}ms p99 {percentile(first, 99):6.0f}ms")
+        if limiter is not None:
+            print(f"    {limiter.summary()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=float, default=10.0)
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--snipes", type=int, default=24)
+    parser.add_argument("--burst-size", type=int, default=4)
+    parser.add_argument("--gap", type=float, default=1.0)
+    parser.add_argument("--attempts", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
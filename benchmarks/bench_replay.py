@@ -0,0 +1,38 @@
+"""
+Record/replay benchmark: detector over a recorded session at max speed
+
+    python -m benchmarks.bench_replay                          # synthetic session
+    python -m benchmarks.bench_replay --file session.pfsr --probes 9 --votes 3
+"""
+import argparse
+import os
+import tempfile
+
+from tests.helpers.session import record_synthetic, replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file", help="existing recording (default: generate one)")
+    parser.add_argument("--frames", type=int, default=72000, help="synthetic frames (72000 = 1h at 20 Hz)")
+    parser.add_argument("--probes", type=int, default=9)
+    parser.add_argument("--votes", type=int, default=3)
+    parser.add_argument("--holdoff", type=float, default=0.4, help="event_holdoff in recorded seconds")
+    args = parser.parse_args()
+
+    if args.file:
+        replay(args.file, args.probes, args.votes, args.holdoff)
+        return
+
+    fd, path = tempfile.mkstemp(suffix=".pfsr")
+    os.close(fd)
+    try:
+        record_synthetic(path, args.frames, args.probes)
+        replay(path, args.probes, 1, args.holdoff)
+        replay(path, args.probes, args.votes, args.holdoff)
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Retry policy benchmark: blind retries vs classified retries against a
+fault-injecting local stub, plus the circuit breaker on a dead API key
+
+    python -m benchmarks.bench_retry --tokens 10 --attempts 5
+"""
+import argparse
+import asyncio
+import time
+
+from core.api import PumpPortalAPI
+from core.retry import CircuitBreaker, RetryPolicy
+from tests.helpers.stub_server import StubServer
+
+
+MINT = "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr"
+
+SCENARIOS = [
+    ("slippage 50%", {"slippage": 0.5}),
+    ("429 60%", {"429": 0.6}),
+    ("timeout 20% + 503 30%", {"timeout": 0.2, "503": 0.3}),
+    ("invalid mint", {"bad_mint": 1.0}),
+    ("bad api key", {"401": 1.0}),
+    ("no funds", {"funds": 1.0}),
+]
+
+
+async def snipe_tokens(api: PumpPortalAPI, args, breaker=None):
+    """Buy `args.tokens` tokens in a row; returns (sent, ok, skipped, seconds)"""
+    sent = ok = skipped = 0
+    start = time.perf_counter()
+    for _ in range(args.tokens):
+        if breaker is not None and not breaker.allow():
+            skipped += 1
+            continue
+        results = await api.buy_multiple(
+            MINT, 0.01, num_attempts=args.attempts, delay_between=args.delay_between
+        )
+        sent += len(results)
+        ok += sum(r.success for r in results)
+        if breaker is not None:
+            for r in results:
+                breaker.record(api.retry_policy.classify(r))
+    return sent, ok, skipped, time.perf_counter() - start
+
+
+async def run(args):
+    print(f"{args.tokens} tokens x {args.attempts} attempts, delay_between {args.delay_between * 1000:.0f}ms, "
+          f"request timeout {args.timeout * 1000:.0f}ms")
+    print(f"  {'scenario':<24}{'policy':<8}{'requests':>9}{'ok':>5}{'ok/req':>8}{'time':>9}")
+
+    for label, faults in SCENARIOS:
+        for name, policy in (("blind", None), ("policy", RetryPolicy(backoff_base=0.05, backoff_max=0.4))):
+            server = StubServer(delay=args.server_delay, faults=faults, seed=1)
+            url = await server.start()
+            api = PumpPortalAPI("bench", base_url=url, keep_warm_interval=0,
+                                request_timeout=args.timeout, retry_policy=policy)
+            await api.start()
+            sent, ok, _, seconds = await snipe_tokens(api, args)
+            await api.close()
+            await server.stop()
+            rate = ok / sent if sent else 0.0
+            print(f"  {label:<24}{name:<8}{sent:>9}{ok:>5}{rate:>8.2f}{seconds:>8.2f}s")
+
+    # Circuit breaker: dead key, tokens keep coming
+    print("circuit breaker, bad api key:")
+    for name, breaker in (("no breaker", None), ("breaker", CircuitBreaker(threshold=5, cooldown=3600))):
+        server = StubServer(delay=args.server_delay, faults={"401": 1.0})
+        url = await server.start()
+        api = PumpPortalAPI("bench", base_url=url, keep_warm_interval=0,
+                            request_timeout=args.timeout, retry_policy=RetryPolicy())
+        await api.start()
+        sent, _, skipped, seconds = await snipe_tokens(api, args, breaker)
+        await api.close()
+        await server.stop()
+        print(f"  {name:<12} requests {sent:>4}  tokens skipped {skipped:>3}  time {seconds:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=10)
+    parser.add_argument("--attempts", type=int, default=5)
+    parser.add_argument("--delay-between", type=float, default=0.1)
+    parser.add_argument("--server-delay", type=float, default=0.02)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Scan cadence benchmark: sleep-after-work vs deadline scheduler
+
+    python -m benchmarks.bench_scheduler --interval 0.05 --work-ms 8 --seconds 3
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from core.scheduler import IntervalHistogram, ScanScheduler
+
+
+def busy(ms: float):
+    """Simulate capture cost"""
+    end = time.perf_counter() + ms / 1000.0
+    while time.perf_counter() < end:
+        pass
+
+
+async def background_load(load_ms: float):
+    """Other coroutines hogging the event loop"""
+    while True:
+        busy(random.uniform(0, load_ms))
+        await asyncio.sleep(0.003)
+
+
+async def sleep_after_work(interval: float, work_ms: float, seconds: float) -> IntervalHistogram:
+    """Old loop: work then asyncio.sleep(interval)"""
+    hist = IntervalHistogram()
+    last = None
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        now = time.perf_counter()
+        if last is not None:
+            hist.add((now - last) * 1000.0)
+        last = now
+        busy(work_ms)
+        await asyncio.sleep(interval)
+    return hist
+
+
+async def deadline(interval: float, work_ms: float, seconds: float) -> ScanScheduler:
+    scheduler = ScanScheduler(interval)
+    scheduler.start()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        await scheduler.wait()
+        busy(work_ms)
+    scheduler.stop()
+    return scheduler
+
+
+async def run(args):
+    load = None
+    if args.load_ms:
+        load = asyncio.ensure_future(background_load(args.load_ms))
+
+    hist = await sleep_after_work(args.interval, args.work_ms, args.seconds)
+    print(f"sleep-after-work: {1000.0 / hist.mean_ms:.1f} Hz, mean {hist.mean_ms:.2f}ms, max {hist.max_ms:.2f}ms")
+    print(hist.format())
+
+    scheduler = await deadline(args.interval, args.work_ms, args.seconds)
+    print(f"deadline: {scheduler.summary()}")
+    print(scheduler.histogram.format())
+
+    if load:
+        load.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--work-ms", type=float, default=5.0)
+    parser.add_argument("--load-ms", type=float, default=0.0, help="max cost of competing event-loop work")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Single-flight stress test: many concurrent buy_token calls for a few mints
+must send exactly one buy round per mint
+
+    python -m benchmarks.bench_singleflight --mints 20 --callers 500
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from core.capture import SyntheticCaptureBackend
+from core.sniper import Sniper
+from benchmarks.bench_dedup import fake_mints
+from tests.helpers.stub_server import StubServer
+
+
+async def run(args):
+    server = StubServer(delay=args.server_delay, jitter=args.server_delay)
+    url = await server.start()
+    sniper = Sniper(
+        "bench", capture=SyntheticCaptureBackend(64, 64), api_url=url,
+        num_attempts=args.attempts, buy_concurrency=args.attempts, rate_limit=0
+    )
+    sniper.log = lambda msg: None
+
+    mints = fake_mints(args.mints, 5)
+    rng = random.Random(args.seed)
+
+    async def caller(mint: str):
+        await asyncio.sleep(rng.uniform(0, args.spread))
+        return mint, await sniper.buy_token(mint)
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(caller(rng.choice(mints)) for _ in range(args.callers)))
+    wall = time.perf_counter() - start
+
+    # Every caller of a mint that didn't arrive after the round finished
+    # (those are skipped by the dedup store) must get the very same result list
+    by_mint = {}
+    for mint, results in outcomes:
+        ids = by_mint.setdefault(mint, set())
+        if results is not None:
+            ids.add(id(results))
+    shared = all(len(ids) == 1 for ids in by_mint.values())
+    skipped = sum(results is None for _, results in outcomes)
+
+    expected = len(by_mint) * args.attempts
+    print(f"{args.callers} concurrent callers over {len(by_mint)} mints in {wall * 1000:.0f}ms")
+    print(f"  requests sent {server.requests} (expected {expected})  "
+          f"rounds {sniper.buys.started}  joined {sniper.buys.joined}  "
+          f"skipped after completion {skipped}")
+    print(f"  every caller got the shared result: {shared}")
+    print(f"  states: {sniper.buys.counts()}")
+
+    # Second wave after everything finished: all deduplicated, no requests
+    before = server.requests
+    again = await asyncio.gather(*(sniper.buy_token(m) for m in mints for _ in range(10)))
+    print(f"  second wave: {len(again)} calls, {server.requests - before} requests, "
+          f"{sum(r is None for r in again)} skipped")
+
+    ok = before == expected and server.requests == before and shared
+    print("PASS" if ok else "FAIL")
+
+    await sniper.api.close()
+    sniper.bought_tokens.close()
+    await server.stop()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mints", type=int, default=20)
+    parser.add_argument("--callers", type=int, default=500)
+    parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--spread", type=float, default=0.2)
+    parser.add_argument("--server-delay", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=1)
+    if not asyncio.run(run(parser.parse_args())):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Stop / preemption latency benchmark for the cancellable snipe stages
+
+Full Sniper on a synthetic screen, memory clipboard and the stub trade
+server. Each stage is made slow on purpose (animated button, chart that
+never loads, clipboard that never fills, slow API), stop() is called from
+another thread, like the GUI does, while a snipe sits in that stage, and
+the time until run() returns is measured. Also checks the stage budgets
+and how fast a new token preempts a buy round. The scenarios live in
+tests/helpers/harness.py; tests/test_stop.py asserts the same cases.
+
+    python -m benchmarks.bench_stop --n 5
+"""
+import argparse
+import asyncio
+import random
+
+from core.pipeline import ACQUIRE, BUY, OPEN, READY
+from benchmarks.common import percentile
+from tests.helpers.harness import preempt_wait, stop_in, timeout_overshoot
+
+
+def summarize(label: str, samples):
+    print(f"  {label:<32} p50 {percentile(samples, 50):7.1f}ms  max {max(samples):7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=5, help="runs per case")
+    parser.add_argument("--budget", type=float, default=0.3, help="stage budget for the timeout check (s)")
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    print("stop() to idle, no clicks after stop:")
+    for stage in ("monitor", OPEN, READY, ACQUIRE, BUY):
+        summarize(f"while in {stage}", [asyncio.run(stop_in(stage, rng)) for _ in range(args.n)])
+
+    print(f"stage budget {args.budget * 1000:.0f}ms, overshoot:")
+    for stage in (READY, ACQUIRE, BUY):
+        summarize(stage, [asyncio.run(timeout_overshoot(stage, args.budget, rng)) for _ in range(args.n)])
+
+    print("new token while the only worker buys (3x 500ms attempts), detection to dequeue")
+    print("(preemption waits for the round to be between attempts):")
+    summarize("event_preempt off", [asyncio.run(preempt_wait(False, rng)) for _ in range(args.n)])
+    summarize("event_preempt on", [asyncio.run(preempt_wait(True, rng)) for _ in range(args.n)])
+
+
+if __name__ == "__main__":
+    main()
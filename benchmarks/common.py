@@ -0,0 +1,40 @@
+"""
+Shared helpers for benchmark scripts
+"""
+import time
+from typing import Callable, List, Sequence
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a sample list"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[idx]
+
+
+def time_calls(fn: Callable[[], object], n: int, warmup: int = 10) -> List[float]:
+    """Call fn n times and return per-call latencies in microseconds"""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(n):
+        start = clock()
+        fn()
+        samples.append((clock() - start) / 1000.0)
+    return samples
+
+
+def report(label: str, samples_us: Sequence[float]):
+    """Print throughput and latency percentiles for a sample list (microseconds)"""
+    total_s = sum(samples_us) / 1e6
+    rate = len(samples_us) / total_s if total_s > 0 else float("inf")
+    print(
+        f"{label:<32} n={len(samples_us):<7} {rate:>12,.0f}/s  "
+        f"p50={percentile(samples_us, 50):>9.1f}us  "
+        f"p90={percentile(samples_us, 90):>9.1f}us  "
+        f"p99={percentile(samples_us, 99):>9.1f}us"
+    )
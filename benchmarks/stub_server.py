@@ -0,0 +1,34 @@
+"""
+Local PumpPortal stub for benchmarks
+
+    python -m benchmarks.stub_server --port 8999 --delay 0.05 --fault 429=0.2 --fault timeout=0.05
+"""
+import argparse
+import asyncio
+
+from tests.helpers.stub_server import FAULTS, StubServer
+
+
+async def serve(args):
+    faults = {}
+    for spec in args.fault:
+        kind, _, rate = spec.partition("=")
+        faults[kind] = float(rate or 1.0)
+    server = StubServer(delay=args.delay, jitter=args.jitter, port=args.port, faults=faults)
+    print(f"stub listening on {await server.start()}")
+    while True:
+        await asyncio.sleep(3600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--fault", action="append", default=[], metavar="KIND=RATE",
+                        help=f"inject a fault ({', '.join(FAULTS)}) with the given probability")
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,7 @@ a = Analysis(
         'PIL._tkinter_finder',
         'cv2',
         'numpy',
+        'mss',
         'pytesseract',
         'aiohttp',
         'requests',
@@ -4,26 +4,46 @@ Gerenciador de configuracoes - salva/carrega em JSON
 import json
 import os
 import sys
-from dataclasses import dataclass, asdict
-from typing import Optional
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Optional, List
 
 
-# Caminho do arquivo de config (na mesma pasta do exe)
-def get_config_path():
-    """Retorna caminho do config.json"""
+# Pasta dos arquivos de dados (na mesma pasta do exe)
+def get_data_path(name: str) -> str:
+    """Retorna caminho de um arquivo ao lado do exe/projeto (absolutos ficam como estao)"""
     if getattr(sys, 'frozen', False):
         # Rodando como exe
         base = os.path.dirname(sys.executable)
     else:
         # Rodando como script
         base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    return os.path.join(base, 'config.json')
+    return os.path.join(base, name)
+
+
+# Versao do formato do config.json (sobe quando um padrao antigo precisa ser migrado)
+CONFIG_VERSION = 1
+
+# Padroes antigos trocados ao carregar configs de versoes anteriores: {versao: {campo: (antigo, novo)}}
+LEGACY_DEFAULTS = {
+    0: {"scan_interval": (0.15, 0.05)},  # antes do scheduler: 0.15 era o padrao, nao uma escolha
+}
+
+
+# Caminho do arquivo de config
+def get_config_path():
+    """Retorna caminho do config.json"""
+    return get_data_path('config.json')
 
 
 @dataclass
 class Settings:
+    config_version: int = CONFIG_VERSION
+
     # API
     api_key: str = ""
+    api_endpoints: List[str] = field(default_factory=list)  # vazio = endpoint padrao
+    race_mode: str = "hedged"  # all, hedged (com mais de um endpoint)
+    hedge_delay: float = 0.15  # segundos ate acionar o proximo endpoint
 
     # Buy settings
     buy_amount: float = 5.0  # SOL
@@ -31,19 +51,80 @@ class Settings:
     priority_fee: float = 0.12  # SOL
     num_attempts: int = 5
     delay_between: float = 0.5  # segundos
+    buy_concurrency: int = 1  # tentativas em paralelo (1 = sequencial)
+    buy_stagger: float = 0.0  # segundos entre inicios no modo paralelo
+    buy_stop_after: int = 0  # para apos N compras OK (0 = todas)
+    retry_policy: bool = True  # classifica erros (desiste / backoff / repete)
+    backoff_base: float = 0.25  # segundos, dobra a cada backoff
+    backoff_max: float = 2.0
+    breaker_threshold: int = 5  # falhas sistemicas seguidas ate pausar
+    breaker_cooldown: float = 60.0  # segundos de pausa
+    rate_limit: float = 10.0  # pedidos/seg para a API (0 = sem limite)
+    rate_burst: int = 10
+    dedup_path: str = "bought_mints.db"  # tokens ja comprados (vazio = so em memoria)
+    dedup_ttl_hours: float = 168.0  # esquece tokens comprados ha mais tempo
 
     # Coordenadas
     view_coin_x: int = 764
     view_coin_y: int = 344
     ca_area_x: int = 440
     ca_area_y: int = 198
+    view_coin_template: str = ""  # recorte do botao para relocalizar (vazio = fixo)
+    ca_template: str = ""  # recorte do campo CA
+    view_coin_anchor: List[int] = field(default_factory=list)  # ponto do clique dentro do recorte (vazio = centro)
+    ca_anchor: List[int] = field(default_factory=list)
+    locate_threshold: float = 0.8  # correlacao minima (0-1)
+    locate_margin: int = 40  # pixels em volta da ultima posicao
+    locate_levels: int = 3  # niveis da piramide na busca na tela inteira
 
     # Tesseract
     tesseract_path: str = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+    ocr_backend: str = "auto"  # auto (tesserocr ou capi), tesserocr, capi, cli, pytesseract
+    ocr_workers: int = 2
 
     # Avancado
-    scan_interval: float = 0.15
-    chart_load_time: float = 2.5
+    scan_interval: float = 0.05  # 20 scans/sec
+    burst_interval: float = 0.01
+    burst_duration: float = 0.5
+    chart_load_time: float = 2.5  # espera maxima pelo grafico
+    view_coin_delay: float = 0.4  # espera maxima antes do clique
+    ready_roi_size: int = 40
+    ready_stable_frames: int = 3
+    ready_stable_window: float = 0.1  # segundos: compara o ROI com o quadro de ~100ms atras
+    ready_poll_interval: float = 0.01
+    snipe_concurrency: int = 2  # snipes em andamento (cliques um por vez, compras em paralelo)
+    event_queue_size: int = 8  # deteccoes esperando um snipe livre
+    event_policy: str = "latest"  # latest (so a mais nova), fifo (todas em ordem)
+    event_max_age: float = 2.0  # descarta deteccoes mais velhas (0 = nunca)
+    event_holdoff: float = 0.4  # ignora mudancas logo apos uma deteccao (animacao)
+    event_preempt: bool = False  # token novo sem snipe livre corta a compra mais antiga entre tentativas (latest)
+    # Tempo maximo de cada etapa do snipe em segundos (0 = sem limite)
+    stage_timeouts: Dict[str, float] = field(
+        default_factory=lambda: {"open": 1.5, "ready": 4.0, "acquire": 4.0, "buy": 30.0}
+    )
+    ca_signature_path: str = ""  # recorte de referencia do campo CA (opcional)
+    capture_backend: str = "auto"  # auto, mss, pil, replay
+    replay_path: str = ""  # gravacao tocada pelo backend replay (record_path de outra sessao)
+    replay_realtime: bool = True  # False = o mais rapido possivel, um quadro por scan
+    capture_thread: bool = True
+    frame_ring_size: int = 64
+    clipboard_backend: str = "auto"  # auto, windows, powershell
+    ca_copy_timeout: float = 1.0  # espera maxima pela copia do CA
+    ca_require_pump: bool = False  # so aceita CAs terminados em "pump"
+    ca_check_curve: bool = True  # rejeita enderecos fora da curva ed25519
+    ca_source: str = "race"  # race (clipboard x OCR), clipboard, ocr
+    ca_ocr_width: int = 520  # area lida pelo OCR, centrada no CA
+    ca_ocr_height: int = 40
+    ca_ocr_interval: float = 0.05  # segundos entre leituras de OCR
+    feed_region: List[int] = field(default_factory=list)  # [x, y, w, h] do feed lido por OCR (vazio = desligado)
+    callout_keywords: List[str] = field(default_factory=list)  # palavras de callout; linha nova com uma delas + CA = compra
+    feed_interval: float = 0.25  # segundos entre leituras do feed
+    record_path: str = ""  # grava frames do ROI (vazio = desligado)
+
+    # Deteccao (offsets [dx, dy] ou [dx, dy, w, h] em volta do View Coin)
+    probe_offsets: List[List[int]] = field(default_factory=lambda: [[0, 0]])
+    probe_votes: int = 1
+    pixel_tolerance: int = 15
 
     def to_dict(self) -> dict:
         """Converte para dicionario"""
@@ -52,10 +133,25 @@ class Settings:
     @classmethod
     def from_dict(cls, data: dict) -> 'Settings':
         """Cria Settings a partir de dicionario"""
+        data = cls.migrate(data)
         # Filtrar apenas campos validos
         valid_fields = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
         return cls(**valid_fields)
 
+    @staticmethod
+    def migrate(data: dict) -> dict:
+        """Atualiza um config salvo por versao anterior (so troca valores iguais ao padrao antigo)"""
+        version = data.get("config_version", 0)
+        if version >= CONFIG_VERSION:
+            return data
+        data = dict(data)
+        for old in range(version, CONFIG_VERSION):
+            for key, (legacy, current) in LEGACY_DEFAULTS.get(old, {}).items():
+                if data.get(key) == legacy:
+                    data[key] = current
+        data["config_version"] = CONFIG_VERSION
+        return data
+
     def save(self, path: Optional[str] = None):
         """Salva configuracoes em JSON"""
         if path is None:
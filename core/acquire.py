@@ -0,0 +1,100 @@
+"""
+CA acquisition race
+Runs several CA sources at once, keeps the first valid result, cancels the rest
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+
+CLIPBOARD = "clipboard"
+OCR = "ocr"
+
+CA_SOURCES = ("race", CLIPBOARD, OCR)
+
+
+class SourceStats:
+    """How often a source won and how fast it was"""
+
+    def __init__(self, window: int = 1000):
+        self.runs = 0
+        self.wins = 0
+        self.misses = 0  # finished without a valid CA
+        self.errors = 0
+        self.win_times: Deque[float] = deque(maxlen=window)
+
+    def percentile(self, pct: float) -> float:
+        if not self.win_times:
+            return 0.0
+        ordered = sorted(self.win_times)
+        return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "runs": self.runs,
+            "wins": self.wins,
+            "misses": self.misses,
+            "errors": self.errors,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+        }
+
+
+class CARace:
+    """First-valid-wins race between CA sources
+
+    Each source is an async callable returning a validated CA or None
+    (gave up). Losers still running when a source wins are cancelled.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, SourceStats] = {}
+
+    def _stats(self, name: str) -> SourceStats:
+        if name not in self.stats:
+            self.stats[name] = SourceStats()
+        return self.stats[name]
+
+    async def run(
+        self,
+        sources: Dict[str, Callable[[], Awaitable[Optional[str]]]]
+    ) -> Tuple[Optional[str], Optional[str], float]:
+        """(winner, ca, seconds) - winner and ca are None if every source gave up"""
+        start = time.perf_counter()
+        tasks = {asyncio.ensure_future(fn()): name for name, fn in sources.items()}
+        for name in sources:
+            self._stats(name).runs += 1
+
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stats = self._stats(tasks[task])
+                    if task.exception() is not None:
+                        stats.errors += 1
+                        continue
+                    ca = task.result()
+                    if not ca:
+                        stats.misses += 1
+                        continue
+                    elapsed = time.perf_counter() - start
+                    stats.wins += 1
+                    stats.win_times.append(elapsed)
+                    return tasks[task], ca, elapsed
+            return None, None, time.perf_counter() - start
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def summary(self) -> str:
+        parts = []
+        for name, stats in self.stats.items():
+            parts.append(
+                f"{name} {stats.wins}/{stats.runs} wins"
+                + (f" (p50 {stats.percentile(50) * 1000:.0f}ms)" if stats.wins else "")
+            )
+        return " | ".join(parts)
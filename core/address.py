@@ -0,0 +1,137 @@
+"""
+Solana address validation
+One regex scan for base58 runs, table-driven base58 decode, 32-byte check,
+optional ed25519 on-curve check and "pump" suffix heuristic
+"""
+import re
+from typing import Dict, Iterator, List, Optional
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+# Runs of base58 characters long enough to hold a 32-byte key
+_RUN = re.compile(r"[1-9A-HJ-NP-Za-km-z]{32,}")
+
+# Two characters at a time: one dict lookup + one multiply-add per pair
+_PAIRS: Dict[str, int] = {
+    a + b: i * 58 + j
+    for i, a in enumerate(BASE58_ALPHABET)
+    for j, b in enumerate(BASE58_ALPHABET)
+}
+_SINGLE: Dict[str, int] = {c: i for i, c in enumerate(BASE58_ALPHABET)}
+
+KEY_SIZE = 32
+MIN_LEN = 32
+MAX_LEN = 44
+
+# ed25519: -x^2 + y^2 = 1 + d x^2 y^2 over GF(p)
+_P = 2 ** 255 - 19
+_D = (-121665 * pow(121666, _P - 2, _P)) % _P
+
+
+def b58decode_int(s: str) -> Optional[int]:
+    """Base58 string to integer (None on a non-base58 character)"""
+    n = 0
+    pairs = _PAIRS
+    try:
+        end = len(s) - len(s) % 2
+        for i in range(0, end, 2):
+            n = n * 3364 + pairs[s[i:i + 2]]
+        if end != len(s):
+            n = n * 58 + _SINGLE[s[-1]]
+    except KeyError:
+        return None
+    return n
+
+
+def decoded_size(s: str, n: int) -> int:
+    """Byte length of the decoded string (leading '1's are zero bytes)"""
+    ones = len(s) - len(s.lstrip("1"))
+    return ones + (n.bit_length() + 7) // 8
+
+
+def b58decode(s: str) -> Optional[bytes]:
+    """Base58 string to bytes (None if invalid)"""
+    n = b58decode_int(s)
+    if n is None:
+        return None
+    size = decoded_size(s, n)
+    return n.to_bytes(size, "big")
+
+
+def is_on_curve(key: bytes) -> bool:
+    """True if the 32 bytes are a valid compressed ed25519 point
+
+    Wallets and token mints are keypairs (on the curve); program derived
+    addresses are deliberately off it.
+    """
+    y = int.from_bytes(key, "little")
+    sign = y >> 255
+    y &= (1 << 255) - 1
+    if y >= _P:
+        return False
+    yy = y * y % _P
+    u = (yy - 1) % _P
+    v = (_D * yy + 1) % _P
+    # x^2 = u / v must be a square; u / v and u * v have the same
+    # quadratic character, which saves the modular inverse
+    if u == 0:
+        return sign == 0
+    return pow(u * v % _P, (_P - 1) // 2, _P) == 1
+
+
+def is_valid_address(s: str, require_pump: bool = False, check_curve: bool = False) -> bool:
+    """True if s decodes to exactly 32 bytes (and passes the optional checks)"""
+    if not MIN_LEN <= len(s) <= MAX_LEN:
+        return False
+    if require_pump and not s.endswith("pump"):
+        return False
+    n = b58decode_int(s)
+    if n is None or decoded_size(s, n) != KEY_SIZE:
+        return False
+    if check_curve and not is_on_curve(n.to_bytes(KEY_SIZE, "big")):
+        return False
+    return True
+
+
+def iter_addresses(text: str, require_pump: bool = False, check_curve: bool = False) -> Iterator[str]:
+    """Valid addresses in text, in order of appearance
+
+    Runs longer than an address (the CA glued to other text) are searched
+    for an address ending at each "pump", then at their start and end.
+    """
+    for match in _RUN.finditer(text):
+        run = match.group()
+        if len(run) <= MAX_LEN:
+            if is_valid_address(run, require_pump, check_curve):
+                yield run
+            continue
+
+        candidates = []
+        start = run.find("pump")
+        while start != -1:
+            end = start + 4
+            candidates.extend(run[max(0, end - n):end] for n in (44, 43, 42, 41, 40, 39, 38, 37, 36, 35, 34, 33, 32))
+            start = run.find("pump", start + 1)
+        if not require_pump:
+            candidates.extend(run[:n] for n in range(MAX_LEN, MIN_LEN - 1, -1))
+            candidates.extend(run[-n:] for n in range(MAX_LEN, MIN_LEN - 1, -1))
+        for candidate in candidates:
+            if len(candidate) >= MIN_LEN and is_valid_address(candidate, require_pump, check_curve):
+                yield candidate
+                break
+
+
+def find_addresses(text: str, require_pump: bool = False, check_curve: bool = False) -> List[str]:
+    """All valid addresses in text"""
+    return list(iter_addresses(text, require_pump, check_curve))
+
+
+def extract_ca(text: str, require_pump: bool = False, check_curve: bool = False) -> Optional[str]:
+    """Best contract address in text: the first "pump" one, else the first valid one"""
+    first = None
+    for address in iter_addresses(text, require_pump, check_curve):
+        if address.endswith("pump"):
+            return address
+        if first is None:
+            first = address
+    return first
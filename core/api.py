@@ -2,9 +2,15 @@
 Cliente da API PumpPortal
 """
 import aiohttp
+import asyncio
+import json
 import time
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Tuple, List
 from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from .ratelimit import PRIORITY_HIGH, PRIORITY_LOW, RateLimiter
+from .retry import ABORT, BACKOFF, RetryDecision, RetryPolicy
 
 
 @dataclass
@@ -16,72 +22,437 @@ class BuyResult:
     response: Dict[str, Any]
     signature: Optional[str] = None
     error: Optional[str] = None
+    sent_ns: Optional[int] = None  # perf_counter_ns ao enviar
+    answered_ns: Optional[int] = None  # perf_counter_ns ao receber a resposta
+    endpoint: Optional[str] = None  # endpoint que respondeu
+    status: Optional[int] = None  # status HTTP
+    error_type: Optional[str] = None  # nome da excecao, se houve
+    error_class: Optional[str] = None  # classe do erro (RetryPolicy)
+    action: Optional[str] = None  # decisao da RetryPolicy
+    queued_ms: float = 0.0  # espera no rate limiter antes do envio
+
+
+class EndpointStats:
+    """Latencia e taxa de erro de um endpoint (medias moveis exponenciais)"""
+
+    # Uma falha conta como pelo menos esta latencia (erro rapido nao e endpoint rapido)
+    ERROR_PENALTY_MS = 1000.0
+
+    def __init__(self, url: str, alpha: float = 0.2):
+        self.url = url
+        self.alpha = alpha
+        self.latency_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.successes = 0
+        self.errors = 0
+        self.wins = 0
+        self.last_error: Optional[str] = None
+
+    def record(self, result: BuyResult):
+        """Registra uma resposta (ou falha) deste endpoint"""
+        self.requests += 1
+        elapsed = result.elapsed_ms if result.success else max(result.elapsed_ms, self.ERROR_PENALTY_MS)
+        if self.latency_ms is None:
+            self.latency_ms = elapsed
+        else:
+            self.latency_ms += self.alpha * (elapsed - self.latency_ms)
+        failed = 0.0 if result.success else 1.0
+        self.error_rate += self.alpha * (failed - self.error_rate)
+        if result.success:
+            self.successes += 1
+        else:
+            self.errors += 1
+            self.last_error = result.error
+
+    def record_cancelled(self, elapsed_ms: float):
+        """Pedido cancelado porque outro endpoint venceu: a latencia e no minimo elapsed_ms"""
+        self.requests += 1
+        if self.latency_ms is None or self.latency_ms < elapsed_ms:
+            self.latency_ms = elapsed_ms if self.latency_ms is None else (
+                self.latency_ms + self.alpha * (elapsed_ms - self.latency_ms))
+
+    @property
+    def score(self) -> float:
+        """Menor = preferido; endpoints sem historico vem primeiro"""
+        if self.latency_ms is None:
+            return 0.0
+        return self.latency_ms / max(0.05, 1.0 - self.error_rate)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "latency_ms": self.latency_ms,
+            "error_rate": self.error_rate,
+            "requests": self.requests,
+            "successes": self.successes,
+            "errors": self.errors,
+            "wins": self.wins,
+            "last_error": self.last_error,
+        }
+
+
+class TradeTemplate:
+    """Pedido de trade pre-serializado
+
+    URL, headers e corpo JSON sao montados uma vez por configuracao; no
+    caminho quente so os bytes do mint sao inseridos entre prefixo e sufixo.
+    urls tem a URL pronta (com a api key) de cada endpoint da disputa.
+    """
+
+    MINT_PLACEHOLDER = "\x00MINT\x00"
+
+    def __init__(self, url: str, payload: Dict[str, Any], urls: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.urls = urls or {}
+        self.headers = {"Content-Type": "application/json"}
+
+        encoded = json.dumps({**payload, "mint": self.MINT_PLACEHOLDER}).encode("utf-8")
+        placeholder = json.dumps(self.MINT_PLACEHOLDER).encode("utf-8")
+        self.prefix, self.suffix = encoded.split(placeholder)
+
+    def body(self, mint: str) -> bytes:
+        """Corpo JSON para um mint"""
+        if mint.isalnum() and mint.isascii():
+            return b"".join((self.prefix, b'"', mint.encode("ascii"), b'"', self.suffix))
+        # Mint fora do alfabeto base58: deixa o json escapar
+        return b"".join((self.prefix, json.dumps(mint).encode("utf-8"), self.suffix))
 
 
 class PumpPortalAPI:
-    """Cliente para API PumpPortal"""
+    """Cliente para API PumpPortal
+
+    Mantem uma sessao HTTP persistente (keep-alive, cache de DNS) aberta
+    entre compras. start() abre e aquece a conexao; um ping periodico
+    evita que ela expire enquanto o sniper monitora.
+
+    Com retry_policy, cada falha e classificada: tenta de novo na hora,
+    espera um backoff ou desiste do token. Sem ela, buy_multiple repete
+    as tentativas as cegas.
+
+    Com rate_limiter, todo pedido de trade (inclusive pernas de disputa)
+    pega um token antes de sair; a primeira tentativa de cada mint passa
+    na frente das demais. Os pings de keep-warm tambem pegam, na fila
+    baixa das retentativas.
+
+    Com varios endpoints cada tentativa e disputada entre eles:
+        race_mode="all"    - envia para todos ao mesmo tempo
+        race_mode="hedged" - envia para o mais rapido e, sem resposta apos
+                             hedge_delay (ou em caso de erro), para o proximo
+    A primeira resposta com sucesso vence e as outras sao canceladas. O
+    cancelamento e so do lado do cliente: um pedido ja aceito por outro
+    endpoint pode executar tambem.
+    """
 
     BASE_URL = "https://pumpportal.fun/api/trade"
+    RACE_MODES = ("all", "hedged")
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        pool_size: int = 10,
+        keepalive_timeout: float = 60.0,
+        keep_warm_interval: float = 20.0,
+        request_timeout: float = 10.0,
+        endpoints: Optional[List[str]] = None,
+        race_mode: str = "hedged",
+        hedge_delay: float = 0.15,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        if race_mode not in self.RACE_MODES:
+            raise ValueError(f"Modo de disputa desconhecido: {race_mode}")
 
-    def __init__(self, api_key: str):
         self.api_key = api_key
+        self.endpoints = list(dict.fromkeys(endpoints or [base_url or self.BASE_URL]))
+        self.base_url = self.endpoints[0]
+        self.race_mode = race_mode
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.hedge_delay = hedge_delay
+        self.endpoint_stats: Dict[str, EndpointStats] = {
+            url: EndpointStats(url) for url in self.endpoints
+        }
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.keep_warm_interval = keep_warm_interval
+        self.request_timeout = request_timeout
 
-    async def buy(
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._keep_warm_task: Optional[asyncio.Task] = None
+        self._last_request = 0.0
+        self._templates: Dict[Tuple, TradeTemplate] = {}
+        # URL com a api key de cada endpoint, montada uma vez
+        self._urls: Dict[str, str] = {url: self.endpoint_url(url) for url in self.endpoints}
+
+    @property
+    def trade_url(self) -> str:
+        return self.endpoint_url(self.base_url)
+
+    def endpoint_url(self, endpoint: str) -> str:
+        return f"{endpoint}?api-key={self.api_key}"
+
+    def ranked_endpoints(self) -> List[str]:
+        """Endpoints do mais rapido ao mais lento (pelas estatisticas)"""
+        return sorted(self.endpoints, key=lambda url: self.endpoint_stats[url].score)
+
+    def get_template(
         self,
-        mint: str,
         amount: float,
         slippage: int = 49,
         priority_fee: float = 0.1,
-        pool: str = "auto"
+        pool: str = "auto",
+        action: str = "buy"
+    ) -> TradeTemplate:
+        """Template compilado para esta configuracao (cacheado)"""
+        key = (action, amount, slippage, priority_fee, pool)
+        template = self._templates.get(key)
+        if template is None:
+            payload = {
+                "action": action,
+                "mint": "",
+                "amount": amount,
+                "denominatedInSol": "true",
+                "slippage": slippage,
+                "priorityFee": priority_fee,
+                "pool": pool
+            }
+            template = self._templates[key] = TradeTemplate(self.trade_url, payload, self._urls)
+        return template
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Sessao persistente (criada sob demanda dentro do event loop)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                ttl_dns_cache=300,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+        return self._session
+
+    async def start(self) -> Optional[float]:
+        """Abre a sessao, aquece a conexao e inicia o keep-warm"""
+        self._get_session()
+        warm_ms = await self.warm_up()
+        if self.keep_warm_interval and self._keep_warm_task is None:
+            self._keep_warm_task = asyncio.ensure_future(self._keep_warm_loop())
+        return warm_ms
+
+    async def warm_up(self) -> Optional[float]:
+        """Aquece a conexao com cada servidor; retorna ms do mais rapido ou None"""
+        origins = []
+        for endpoint in self.endpoints:
+            parts = urlsplit(endpoint)
+            origin = f"{parts.scheme}://{parts.netloc}/"
+            if origin not in origins:
+                origins.append(origin)
+
+        times = await asyncio.gather(*(self._warm_origin(origin) for origin in origins))
+        times = [t for t in times if t is not None]
+        return min(times) if times else None
+
+    async def _warm_origin(self, url: str) -> Optional[float]:
+        """Abre (ou reaproveita) uma conexao com um servidor; retorna ms ou None"""
+        if self.rate_limiter is not None:
+            # Conta no limite da API, sem passar na frente de uma primeira tentativa
+            await self.rate_limiter.acquire(PRIORITY_LOW)
+        start_ns = time.perf_counter_ns()
+        try:
+            async with self._get_session().head(url, allow_redirects=False) as resp:
+                await resp.read()
+        except Exception:
+            return None
+        self._last_request = time.monotonic()
+        return (time.perf_counter_ns() - start_ns) / 1e6
+
+    async def _keep_warm_loop(self):
+        """Ping periodico enquanto a conexao esta ociosa"""
+        try:
+            while True:
+                await asyncio.sleep(self.keep_warm_interval)
+                if time.monotonic() - self._last_request >= self.keep_warm_interval:
+                    await self.warm_up()
+        except asyncio.CancelledError:
+            pass
+
+    async def close(self):
+        """Fecha a sessao e para o keep-warm"""
+        if self._keep_warm_task is not None:
+            self._keep_warm_task.cancel()
+            try:
+                await self._keep_warm_task
+            except asyncio.CancelledError:
+                pass
+            self._keep_warm_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _dispatch(
+        self,
+        template: TradeTemplate,
+        body: bytes,
+        attempt: int,
+        on_send: Optional[Callable[[int], None]] = None
     ) -> BuyResult:
-        """Executa uma compra"""
-        url = f"{self.BASE_URL}?api-key={self.api_key}"
-
-        payload = {
-            "action": "buy",
-            "mint": mint,
-            "amount": amount,
-            "denominatedInSol": "true",
-            "slippage": slippage,
-            "priorityFee": priority_fee,
-            "pool": pool
+        """Envia uma tentativa (disputada entre endpoints se houver mais de um)"""
+        if len(self.endpoints) == 1:
+            return await self._send(template, body, attempt, self.base_url, on_send)
+        return await self._race(template, body, attempt, on_send)
+
+    async def _race(
+        self,
+        template: TradeTemplate,
+        body: bytes,
+        attempt: int,
+        on_send: Optional[Callable[[int], None]] = None
+    ) -> BuyResult:
+        """Disputa uma tentativa entre os endpoints; o primeiro sucesso vence"""
+        ranked = self.ranked_endpoints()
+        hedged = self.race_mode == "hedged"
+        launch = ranked[:1] if hedged else ranked
+        waiting = ranked[len(launch):]
+
+        tasks = {
+            asyncio.ensure_future(self._send(template, body, attempt, url, on_send)): url
+            for url in launch
         }
+        last: Optional[BuyResult] = None
 
-        start_time = time.time()
+        try:
+            while tasks:
+                timeout = self.hedge_delay if waiting else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                failed = False
+                for task in done:
+                    del tasks[task]
+                    result = task.result()
+                    if result.success:
+                        self.endpoint_stats[result.endpoint].wins += 1
+                        return result
+                    last = result
+                    failed = True
+
+                # Sem resposta no prazo ou com erro: aciona o proximo endpoint
+                if waiting and (failed or not done):
+                    url = waiting.pop(0)
+                    tasks[asyncio.ensure_future(self._send(template, body, attempt, url, on_send))] = url
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return last
+
+    async def _send(
+        self,
+        template: TradeTemplate,
+        body: bytes,
+        attempt: int,
+        endpoint: Optional[str] = None,
+        on_send: Optional[Callable[[int], None]] = None
+    ) -> BuyResult:
+        """Envia um pedido de trade pela sessao persistente
+
+        on_send(attempt) e chamado logo antes do pedido sair (depois da
+        fila do rate limiter).
+        """
+        endpoint = endpoint or self.base_url
+        url = template.urls.get(endpoint) or self.endpoint_url(endpoint)
+
+        queued = 0.0
+        if self.rate_limiter is not None:
+            queued = await self.rate_limiter.acquire(PRIORITY_HIGH if attempt == 1 else PRIORITY_LOW)
+
+        if on_send:
+            on_send(attempt)
+        start_ns = time.perf_counter_ns()
+        try:
+            result = await self._post(url, template.headers, body, attempt)
+        except asyncio.CancelledError:
+            self.endpoint_stats[endpoint].record_cancelled((time.perf_counter_ns() - start_ns) / 1e6)
+            raise
+        result.endpoint = endpoint
+        result.queued_ms = queued * 1000
+        self.endpoint_stats[endpoint].record(result)
+        return result
+
+    async def _post(self, url: str, headers: Dict[str, str], body: bytes, attempt: int) -> BuyResult:
+        """POST de um corpo ja serializado"""
+        session = self._get_session()
+        start_ns = time.perf_counter_ns()
+        self._last_request = time.monotonic()
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as resp:
-                    result = await resp.json()
-                    elapsed = (time.time() - start_time) * 1000
-
-                    if "signature" in result:
-                        return BuyResult(
-                            success=True,
-                            attempt=1,
-                            elapsed_ms=elapsed,
-                            response=result,
-                            signature=result["signature"]
-                        )
-                    else:
-                        return BuyResult(
-                            success=False,
-                            attempt=1,
-                            elapsed_ms=elapsed,
-                            response=result,
-                            error=result.get("error", "Unknown error")
-                        )
+            async with session.post(url, data=body, headers=headers) as resp:
+                try:
+                    response = await resp.json(content_type=None)
+                except ValueError:
+                    # Corpo nao-JSON (pagina de erro de proxy, 429 em texto...)
+                    response = {}
+                if not isinstance(response, dict):
+                    response = {"error": str(response)}
+                end_ns = time.perf_counter_ns()
+                elapsed = (end_ns - start_ns) / 1e6
+
+                if "signature" in response:
+                    return BuyResult(
+                        success=True,
+                        attempt=attempt,
+                        elapsed_ms=elapsed,
+                        sent_ns=start_ns,
+                        answered_ns=end_ns,
+                        response=response,
+                        signature=response["signature"],
+                        status=resp.status
+                    )
+                else:
+                    default = f"HTTP {resp.status}" if resp.status >= 400 else "Unknown error"
+                    return BuyResult(
+                        success=False,
+                        attempt=attempt,
+                        elapsed_ms=elapsed,
+                        sent_ns=start_ns,
+                        answered_ns=end_ns,
+                        response=response,
+                        error=str(response.get("error") or default),
+                        status=resp.status
+                    )
 
         except Exception as e:
-            elapsed = (time.time() - start_time) * 1000
+            end_ns = time.perf_counter_ns()
+            elapsed = (end_ns - start_ns) / 1e6
             return BuyResult(
                 success=False,
-                attempt=1,
+                attempt=attempt,
                 elapsed_ms=elapsed,
+                sent_ns=start_ns,
+                answered_ns=end_ns,
                 response={},
-                error=str(e)
+                error=str(e) or type(e).__name__,
+                error_type=type(e).__name__
             )
 
+    async def buy(
+        self,
+        mint: str,
+        amount: float,
+        slippage: int = 49,
+        priority_fee: float = 0.1,
+        pool: str = "auto"
+    ) -> BuyResult:
+        """Executa uma compra"""
+        template = self.get_template(amount, slippage, priority_fee, pool)
+        return await self._dispatch(template, template.body(mint), attempt=1)
+
     async def buy_multiple(
         self,
         mint: str,
@@ -90,67 +461,133 @@ class PumpPortalAPI:
         priority_fee: float = 0.1,
         num_attempts: int = 5,
         delay_between: float = 0.5,
-        on_result: Optional[Callable[[BuyResult], None]] = None
+        on_result: Optional[Callable[[BuyResult], None]] = None,
+        concurrency: int = 1,
+        stagger: float = 0.0,
+        stop_after: int = 0,
+        on_send: Optional[Callable[[int], None]] = None
     ) -> list:
-        """Executa multiplas tentativas de compra"""
-        import asyncio
+        """Executa multiplas tentativas de compra
+
+        concurrency=1 envia em sequencia com delay_between entre tentativas.
+        concurrency>1 mantem ate K pedidos em voo, iniciando cada tentativa
+        `stagger` segundos depois da anterior. stop_after=N cancela as
+        tentativas restantes apos N compras confirmadas. on_result e
+        chamado na ordem em que as respostas chegam. Com retry_policy, um
+        erro de backoff atrasa as proximas tentativas e um erro fatal para
+        o token cancela as restantes. on_send(attempt) marca cada pedido que
+        de fato saiu.
+        """
+        template = self.get_template(amount, slippage, priority_fee)
+        body = template.body(mint)
+
+        if concurrency <= 1:
+            return await self._buy_sequential(template, body, num_attempts, delay_between, on_result, stop_after, on_send)
+        return await self._buy_fan_out(template, body, num_attempts, on_result, concurrency, stagger, stop_after, on_send)
 
+    def _decide(self, result: BuyResult, backoffs: int) -> Optional[RetryDecision]:
+        """Classifica o resultado pela retry_policy (None = sem politica)"""
+        if self.retry_policy is None:
+            return None
+        decision = self.retry_policy.decide(result, backoffs)
+        result.error_class = decision.error_class
+        result.action = decision.action
+        return decision
+
+    async def _buy_sequential(
+        self,
+        template: TradeTemplate,
+        body: bytes,
+        num_attempts: int,
+        delay_between: float,
+        on_result: Optional[Callable[[BuyResult], None]],
+        stop_after: int,
+        on_send: Optional[Callable[[int], None]] = None
+    ) -> list:
+        """Uma tentativa por vez"""
         results = []
+        successes = 0
+        backoffs = 0
 
-        async with aiohttp.ClientSession() as session:
-            url = f"{self.BASE_URL}?api-key={self.api_key}"
+        for i in range(num_attempts):
+            result = await self._dispatch(template, body, i + 1, on_send)
+            decision = self._decide(result, backoffs)
+            results.append(result)
 
-            for i in range(num_attempts):
-                payload = {
-                    "action": "buy",
-                    "mint": mint,
-                    "amount": amount,
-                    "denominatedInSol": "true",
-                    "slippage": slippage,
-                    "priorityFee": priority_fee,
-                    "pool": "auto"
-                }
+            if on_result:
+                on_result(result)
 
-                start_time = time.time()
+            if result.success:
+                successes += 1
+                if stop_after and successes >= stop_after:
+                    break
+            elif decision is not None and decision.action == ABORT:
+                break
 
-                try:
-                    async with session.post(url, json=payload) as resp:
-                        response = await resp.json()
-                        elapsed = (time.time() - start_time) * 1000
-
-                        if "signature" in response:
-                            result = BuyResult(
-                                success=True,
-                                attempt=i + 1,
-                                elapsed_ms=elapsed,
-                                response=response,
-                                signature=response["signature"]
-                            )
-                        else:
-                            result = BuyResult(
-                                success=False,
-                                attempt=i + 1,
-                                elapsed_ms=elapsed,
-                                response=response,
-                                error=response.get("error", "Unknown error")
-                            )
-
-                except Exception as e:
-                    elapsed = (time.time() - start_time) * 1000
-                    result = BuyResult(
-                        success=False,
-                        attempt=i + 1,
-                        elapsed_ms=elapsed,
-                        response={},
-                        error=str(e)
-                    )
+            if i < num_attempts - 1:
+                if decision is None or result.success:
+                    await asyncio.sleep(delay_between)
+                elif decision.action == BACKOFF:
+                    backoffs += 1
+                    await asyncio.sleep(decision.delay)
+                # RETRY: proxima tentativa na hora
+
+        return results
+
+    async def _buy_fan_out(
+        self,
+        template: TradeTemplate,
+        body: bytes,
+        num_attempts: int,
+        on_result: Optional[Callable[[BuyResult], None]],
+        concurrency: int,
+        stagger: float,
+        stop_after: int,
+        on_send: Optional[Callable[[int], None]] = None
+    ) -> list:
+        """Ate `concurrency` tentativas em paralelo"""
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        resume_at = 0.0  # backoff: novas tentativas so partem depois disso
+
+        async def attempt(i: int) -> BuyResult:
+            if stagger:
+                await asyncio.sleep(i * stagger)
+            async with semaphore:
+                while resume_at > loop.time():
+                    await asyncio.sleep(resume_at - loop.time())
+                return await self._dispatch(template, body, i + 1, on_send)
+
+        tasks = [asyncio.ensure_future(attempt(i)) for i in range(num_attempts)]
+        results = []
+        successes = 0
+        backoffs = 0
 
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                decision = self._decide(result, backoffs)
                 results.append(result)
 
                 if on_result:
                     on_result(result)
 
-                if i < num_attempts - 1:
-                    await asyncio.sleep(delay_between)
+                if result.success:
+                    successes += 1
+                    if stop_after and successes >= stop_after:
+                        break
+                elif decision is not None:
+                    if decision.action == ABORT:
+                        break
+                    if decision.action == BACKOFF:
+                        backoffs += 1
+                        resume_at = max(resume_at, loop.time() + decision.delay)
+        finally:
+            # Cancela o que ainda nao terminou (early stop ou cancelamento externo)
+            pending = [t for t in tasks if not t.done()]
+            for t in pending:
+                t.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
         return results
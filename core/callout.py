@@ -0,0 +1,224 @@
+"""
+Callout keyword matching
+Aho-Corasick automaton built once from the keyword list, one pass per text
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+
+class Match(NamedTuple):
+    """One keyword hit; start/end index the lowercased text"""
+    keyword: str
+    start: int
+    end: int
+
+
+class KeywordMatcher:
+    """Base class: case-insensitive substring search for many keywords at once"""
+
+    name = "base"
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        # Lowercased keyword -> first original spelling (empty ones never match)
+        self._originals: Dict[str, str] = {}
+        for keyword in self.keywords:
+            key = keyword.lower()
+            if key and key not in self._originals:
+                self._originals[key] = keyword
+
+    def finditer(self, text: str) -> Iterator[Match]:
+        """All hits, in order of their end position"""
+        raise NotImplementedError
+
+    def find_all(self, text: str) -> List[Match]:
+        return list(self.finditer(text))
+
+    def search(self, text: str) -> Optional[Match]:
+        """First hit (stops scanning there)"""
+        return next(self.finditer(text), None)
+
+    def hits(self, text: str) -> Set[str]:
+        """Distinct keywords found"""
+        return {m.keyword for m in self.finditer(text)}
+
+    def __len__(self) -> int:
+        return len(self._originals)
+
+
+class SubstringMatcher(KeywordMatcher):
+    """str.find per keyword: O(keywords x text), but in C, so it wins for short lists"""
+
+    name = "loop"
+
+    def finditer(self, text: str) -> Iterator[Match]:
+        text = text.lower()
+        found = []
+        for key, original in self._originals.items():
+            start = text.find(key)
+            while start != -1:
+                found.append(Match(original, start, start + len(key)))
+                start = text.find(key, start + 1)
+        found.sort(key=lambda m: (m.end, m.start))
+        return iter(found)
+
+
+class AhoCorasickMatcher(KeywordMatcher):
+    """Pure Python Aho-Corasick (goto dicts + failure links)
+
+    Outputs are merged along failure links at build time, so the scan is
+    one dict lookup per character plus failure hops on mismatches.
+    """
+
+    name = "python"
+
+    def __init__(self, keywords: Sequence[str]):
+        super().__init__(keywords)
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[Tuple[str, int], ...]] = [()]
+
+        for key, original in self._originals.items():
+            state = 0
+            for char in key:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] = ((original, len(key)),)
+
+        # Breadth-first: failure link of each state, outputs of its suffixes
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(char, 0)
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def finditer(self, text: str) -> Iterator[Match]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, char in enumerate(text.lower()):
+            nxt = goto[state].get(char)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(char)
+            state = nxt if nxt is not None else 0
+            if out[state]:
+                for keyword, length in out[state]:
+                    yield Match(keyword, i + 1 - length, i + 1)
+
+
+class PyAhoCorasickMatcher(KeywordMatcher):
+    """pyahocorasick (C extension) automaton, used when installed"""
+
+    name = "pyahocorasick"
+
+    def __init__(self, keywords: Sequence[str]):
+        super().__init__(keywords)
+        import ahocorasick
+
+        self._automaton = ahocorasick.Automaton()
+        for key, original in self._originals.items():
+            self._automaton.add_word(key, (original, len(key)))
+        if self._originals:
+            self._automaton.make_automaton()
+
+    def finditer(self, text: str) -> Iterator[Match]:
+        if not self._originals:
+            return
+        for end, (keyword, length) in self._automaton.iter(text.lower()):
+            yield Match(keyword, end + 1 - length, end + 1)
+
+
+MATCHERS = {
+    PyAhoCorasickMatcher.name: PyAhoCorasickMatcher,
+    AhoCorasickMatcher.name: AhoCorasickMatcher,
+    SubstringMatcher.name: SubstringMatcher,
+}
+
+# Below this many keywords the C substring loop beats the pure Python automaton
+LOOP_MAX_KEYWORDS = 200
+
+
+def create_matcher(keywords: Sequence[str], backend: str = "auto") -> KeywordMatcher:
+    """Build a matcher
+
+    "auto" = pyahocorasick if installed, else the substring loop for short
+    lists and the pure Python automaton for long ones.
+    """
+    if backend == "auto":
+        try:
+            return PyAhoCorasickMatcher(keywords)
+        except ImportError:
+            small = len(keywords) <= LOOP_MAX_KEYWORDS
+            backend = SubstringMatcher.name if small else AhoCorasickMatcher.name
+
+    if backend not in MATCHERS:
+        raise ValueError(f"Unknown matcher backend: {backend}")
+    return MATCHERS[backend](keywords)
+
+
+class CalloutMatcher:
+    """Holds the current matcher; a new keyword list is swapped in atomically
+
+    Readers grab the current matcher reference once per scan, so a swap
+    never blocks or tears a scan. reload() builds off the event loop.
+    """
+
+    def __init__(self, keywords: Sequence[str] = (), backend: str = "auto"):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.version = 0
+        self.build_ms = 0.0
+        self.matcher = self._build(keywords)
+
+    def _build(self, keywords: Sequence[str]) -> KeywordMatcher:
+        start = time.perf_counter()
+        matcher = create_matcher(keywords, self.backend)
+        self.build_ms = (time.perf_counter() - start) * 1000
+        return matcher
+
+    @property
+    def keywords(self) -> Tuple[str, ...]:
+        return self.matcher.keywords
+
+    def swap(self, keywords: Sequence[str]) -> KeywordMatcher:
+        """Build and install a matcher for `keywords` (blocking)"""
+        matcher = self._build(keywords)
+        with self._lock:
+            self.matcher = matcher
+            self.version += 1
+        return matcher
+
+    async def reload(self, keywords: Sequence[str]) -> KeywordMatcher:
+        """swap() on a worker thread; scans keep using the old matcher meanwhile"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.swap, list(keywords))
+
+    def find_all(self, text: str) -> List[Match]:
+        return self.matcher.find_all(text)
+
+    def search(self, text: str) -> Optional[Match]:
+        return self.matcher.search(text)
+
+    def hits(self, text: str) -> Set[str]:
+        return self.matcher.hits(text)
@@ -0,0 +1,369 @@
+"""
+Screen capture backends
+Keep the capture handle and pixel buffer open for the whole session
+"""
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class CaptureBackend:
+    """Base class for screen capture backends
+
+    grab() returns an RGB uint8 view into a per-thread buffer owned by the
+    backend. The buffer is reused by the next grab() on the same thread, so
+    copy it if you need to keep it.
+    """
+
+    name = "base"
+    realtime = True  # False: frames only move on advance() (replay at max speed)
+
+    def __init__(self):
+        self._local = threading.local()
+        self._opened = False
+
+    def open(self):
+        """Acquire the capture handle"""
+        self._opened = True
+
+    def close(self):
+        """Release the capture handle"""
+        self._opened = False
+
+    def release(self):
+        """Release what the calling thread holds (a worker thread done grabbing)"""
+
+    def is_open(self) -> bool:
+        """Check if the handle is open"""
+        return self._opened
+
+    @property
+    def exhausted(self) -> bool:
+        """True when a finite source (replay) has no more frames"""
+        return False
+
+    def advance(self):
+        """Step a non-realtime source to its next frame (no-op for live screens)"""
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get_buffer(self, width: int, height: int) -> np.ndarray:
+        """Return a (height, width, 3) view, growing the buffer only when needed"""
+        buf = getattr(self._local, "buffer", None)
+        if buf is None or buf.shape[0] < height or buf.shape[1] < width:
+            h = max(height, buf.shape[0] if buf is not None else 0)
+            w = max(width, buf.shape[1] if buf is not None else 0)
+            buf = self._local.buffer = np.empty((h, w, 3), dtype=np.uint8)
+        return buf[:height, :width]
+
+    def _grab_into(self, left: int, top: int, out: np.ndarray):
+        """Fill `out` with the screen region starting at (left, top)"""
+        raise NotImplementedError
+
+    def grab(self, left: int, top: int, width: int = 1, height: int = 1) -> np.ndarray:
+        """Capture a region as an RGB array (view into the reusable buffer)"""
+        if not self._opened:
+            self.open()
+        out = self._get_buffer(width, height)
+        self._grab_into(left, top, out)
+        return out
+
+    def get_pixel(self, x: int, y: int) -> Tuple[int, int, int]:
+        """Capture a single pixel color"""
+        px = self.grab(x, y, 1, 1)[0, 0]
+        return (int(px[0]), int(px[1]), int(px[2]))
+
+    def screen_region(self) -> Tuple[int, int, int, int]:
+        """(left, top, width, height) of the primary screen"""
+        raise NotImplementedError
+
+
+class PILCaptureBackend(CaptureBackend):
+    """Pillow ImageGrab backend (fallback, works everywhere ImageGrab does)
+
+    ImageGrab has no persistent handle, so only the output buffer is reused.
+    """
+
+    name = "pil"
+
+    def open(self):
+        from PIL import ImageGrab
+        self._image_grab = ImageGrab
+        super().open()
+
+    def _grab_into(self, left: int, top: int, out: np.ndarray):
+        height, width = out.shape[:2]
+        img = self._image_grab.grab(bbox=(left, top, left + width, top + height))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        np.copyto(out, np.asarray(img))
+
+    def screen_region(self) -> Tuple[int, int, int, int]:
+        if not self._opened:
+            self.open()
+        width, height = self._image_grab.grab().size
+        return (0, 0, width, height)
+
+
+class MSSCaptureBackend(CaptureBackend):
+    """MSS backend (GDI on Windows, XGetImage on X11/Xvfb)
+
+    Holds one mss instance open per thread for the whole session. A thread
+    that stops grabbing gives its handle back with release(); close()
+    closes the handles of every thread.
+    Requires `pip install mss`.
+    """
+
+    name = "mss"
+
+    def __init__(self):
+        super().__init__()
+        self._mss_module = None
+        self._handles = []
+        self._handles_lock = threading.Lock()
+        self._generation = 0  # bumped by close(): handles of older generations are closed
+
+    def open(self):
+        if self._mss_module is None:
+            try:
+                import mss
+            except ImportError:
+                raise ImportError("MSS capture backend requires: pip install mss")
+            self._mss_module = mss
+            self._factory = getattr(mss, "MSS", None) or mss.mss  # mss.mss is deprecated since 10
+        super().open()
+
+    def _get_sct(self):
+        """mss handles are not shareable across threads"""
+        sct = getattr(self._local, "sct", None)
+        if sct is None or self._local.generation != self._generation:
+            sct = self._factory()
+            with self._handles_lock:
+                self._handles.append(sct)
+                self._local.generation = self._generation
+            self._local.sct = sct
+        return sct
+
+    def release(self):
+        sct = getattr(self._local, "sct", None)
+        self._local.sct = None
+        if sct is None:
+            return
+        with self._handles_lock:
+            if sct not in self._handles:
+                return  # already closed by close()
+            self._handles.remove(sct)
+        sct.close()
+
+    def close(self):
+        with self._handles_lock:
+            handles, self._handles = self._handles, []
+            self._generation += 1
+        for sct in handles:
+            sct.close()
+        self._local.sct = None
+        super().close()
+
+    def _grab_into(self, left: int, top: int, out: np.ndarray):
+        height, width = out.shape[:2]
+        shot = self._get_sct().grab({"left": left, "top": top, "width": width, "height": height})
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(height, width, 4)
+        np.copyto(out, bgra[:, :, 2::-1])
+
+    def screen_region(self) -> Tuple[int, int, int, int]:
+        if not self._opened:
+            self.open()
+        monitors = self._get_sct().monitors
+        mon = monitors[1] if len(monitors) > 1 else monitors[0]
+        return (mon["left"], mon["top"], mon["width"], mon["height"])
+
+
+class SyntheticCaptureBackend(CaptureBackend):
+    """In-memory screen for tests and benchmarks
+
+    The screen is a plain RGB array; paint() and fill() change it between grabs.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, width: int = 1920, height: int = 1080, color: Tuple[int, int, int] = (0, 0, 0)):
+        super().__init__()
+        self.screen = np.empty((height, width, 3), dtype=np.uint8)
+        self.screen[:] = color
+        self.grab_count = 0
+
+    def fill(self, color: Tuple[int, int, int]):
+        """Fill the whole screen with one color"""
+        self.screen[:] = color
+
+    def paint(self, left: int, top: int, width: int, height: int, color: Tuple[int, int, int]):
+        """Paint a rectangle on the screen"""
+        self.screen[top:top + height, left:left + width] = color
+
+    def _grab_into(self, left: int, top: int, out: np.ndarray):
+        height, width = out.shape[:2]
+        np.copyto(out, self.screen[top:top + height, left:left + width])
+        self.grab_count += 1
+
+    def screen_region(self) -> Tuple[int, int, int, int]:
+        return (0, 0, self.screen.shape[1], self.screen.shape[0])
+
+
+CAPTURE_BACKENDS = {
+    PILCaptureBackend.name: PILCaptureBackend,
+    MSSCaptureBackend.name: MSSCaptureBackend,
+    SyntheticCaptureBackend.name: SyntheticCaptureBackend,
+}
+
+
+def create_capture_backend(name: str = "auto", **kwargs) -> CaptureBackend:
+    """Create a capture backend by name ("auto" prefers mss, falls back to pil)
+
+    kwargs go to the backend (replay takes path, realtime, speed).
+    """
+    if name == "auto":
+        try:
+            import mss  # noqa: F401
+            name = MSSCaptureBackend.name
+        except ImportError:
+            name = PILCaptureBackend.name
+
+    if name not in CAPTURE_BACKENDS:
+        from . import recording  # noqa: F401  registers "replay"
+    if name not in CAPTURE_BACKENDS:
+        raise ValueError(f"Unknown capture backend: {name}")
+    return CAPTURE_BACKENDS[name](**kwargs)
+
+
+class CaptureThread:
+    """Producer thread grabbing one ROI into a FrameRing at the scheduler cadence
+
+    The async side awaits next_frame(); it is woken through the event loop
+    so detection latency depends on the capture cadence, not on whatever
+    the pipeline coroutine is doing.
+    """
+
+    def __init__(
+        self,
+        capture: CaptureBackend,
+        roi: Tuple[int, int, int, int],
+        scheduler,
+        ring_size: int = 64
+    ):
+        from .ring import FrameRing
+
+        self.capture = capture
+        self.left, self.top, self.width, self.height = roi
+        self._origin = (self.left, self.top)  # read once per grab, replaced as a whole by move()
+        self.scheduler = scheduler
+        self.ring = FrameRing(ring_size, (self.height, self.width, 3))
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.recorder = None  # FrameRecorder grabbing its own ROI from the producer thread
+
+        self._out = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._last_seq = -1
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop = None
+        self._event = None
+
+    def start(self):
+        """Start capturing (call from the consuming event loop)"""
+        import asyncio
+
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Stop the producer thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def move(self, left: int, top: int):
+        """Grab the same-size ROI at a new origin from the next frame on"""
+        self.left, self.top = left, top
+        self._origin = (left, top)
+
+    def _notify(self):
+        self._event.set()
+
+    def _run(self):
+        """Producer loop"""
+        ring = self.ring
+        self.scheduler.reset()
+        try:
+            while not self._stop.is_set():
+                self.scheduler.wait_blocking()
+                try:
+                    left, top = self._origin
+                    frame = self.capture.grab(left, top, self.width, self.height)
+                    ts = time.perf_counter_ns()
+                    np.copyto(ring.begin_write(), frame)
+                    ring.publish(ts)
+                    if self.recorder is not None:
+                        self.recorder.grab(self.capture, ts)
+                except Exception as e:
+                    self.errors += 1
+                    self.last_error = str(e)
+                    time.sleep(0.1)
+                    continue
+
+                try:
+                    self._loop.call_soon_threadsafe(self._notify)
+                except RuntimeError:
+                    # Event loop closed
+                    break
+
+                if self.capture.exhausted:
+                    break
+        finally:
+            self.capture.release()
+
+    def latest(self) -> Optional[Tuple[int, int, np.ndarray]]:
+        """Newest unseen frame as (seq, timestamp_ns, frame) or None
+
+        The frame is a consumer-owned buffer reused by the next call.
+        """
+        item = self.ring.read_latest(self._last_seq, self._out)
+        if item is None:
+            return None
+        self._last_seq = item[0]
+        return item[0], item[1], self._out
+
+    async def next_frame(self) -> Tuple[int, int, np.ndarray]:
+        """Wait for a frame newer than the last one returned"""
+        while True:
+            item = self.latest()
+            if item is not None:
+                return item
+            self._event.clear()
+            # Re-check so a publish between read and clear is not missed
+            item = self.latest()
+            if item is not None:
+                return item
+            await self._event.wait()
+
+    def stats(self) -> dict:
+        ring = self.ring
+        return {
+            "captured": ring.produced,
+            "consumed": ring.consumed,
+            "dropped": ring.dropped,
+            "errors": self.errors,
+        }
@@ -0,0 +1,234 @@
+"""
+Clipboard service
+Long-lived clipboard backends with a "wait for change" primitive
+"""
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+
+class ClipboardBackend:
+    """Base class for clipboard backends"""
+
+    name = "base"
+
+    def read(self) -> str:
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def sequence(self) -> Optional[int]:
+        """Change counter, or None if the backend can't tell cheaply"""
+        return None
+
+    def close(self):
+        pass
+
+
+class WindowsClipboardBackend(ClipboardBackend):
+    """Win32 clipboard through user32 (no process per call)
+
+    Change detection uses GetClipboardSequenceNumber, which is a cheap call
+    that increments on every clipboard write.
+    """
+
+    name = "windows"
+
+    CF_UNICODETEXT = 13
+
+    def __init__(self, open_retries: int = 10):
+        import ctypes
+        from ctypes import wintypes
+
+        self._ctypes = ctypes
+        self.open_retries = open_retries
+
+        self._user32 = ctypes.WinDLL("user32", use_last_error=True)
+        self._kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+        self._user32.OpenClipboard.argtypes = [wintypes.HWND]
+        self._user32.OpenClipboard.restype = wintypes.BOOL
+        self._user32.CloseClipboard.restype = wintypes.BOOL
+        self._user32.EmptyClipboard.restype = wintypes.BOOL
+        self._user32.GetClipboardData.argtypes = [wintypes.UINT]
+        self._user32.GetClipboardData.restype = wintypes.HANDLE
+        self._user32.GetClipboardSequenceNumber.restype = wintypes.DWORD
+        self._kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+        self._kernel32.GlobalLock.restype = wintypes.LPVOID
+        self._kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+
+    def _open(self) -> bool:
+        # The app that just copied may still hold the clipboard for a moment
+        for _ in range(self.open_retries):
+            if self._user32.OpenClipboard(None):
+                return True
+            time.sleep(0.002)
+        return False
+
+    def read(self) -> str:
+        if not self._open():
+            return ""
+        try:
+            handle = self._user32.GetClipboardData(self.CF_UNICODETEXT)
+            if not handle:
+                return ""
+            ptr = self._kernel32.GlobalLock(handle)
+            if not ptr:
+                return ""
+            try:
+                return self._ctypes.wstring_at(ptr).strip()
+            finally:
+                self._kernel32.GlobalUnlock(handle)
+        finally:
+            self._user32.CloseClipboard()
+
+    def clear(self):
+        if not self._open():
+            return
+        try:
+            self._user32.EmptyClipboard()
+        finally:
+            self._user32.CloseClipboard()
+
+    def sequence(self) -> Optional[int]:
+        return int(self._user32.GetClipboardSequenceNumber())
+
+
+class PowerShellClipboardBackend(ClipboardBackend):
+    """Old behaviour: one powershell process per call (slow, fallback only)"""
+
+    name = "powershell"
+
+    def read(self) -> str:
+        try:
+            result = subprocess.run(
+                ["powershell", "-command", "Get-Clipboard"],
+                capture_output=True,
+                text=True,
+                timeout=2
+            )
+            return result.stdout.strip()
+        except Exception:
+            return ""
+
+    def clear(self):
+        try:
+            subprocess.run(
+                ["powershell", "-command", "Set-Clipboard -Value $null"],
+                capture_output=True,
+                timeout=2
+            )
+        except Exception:
+            pass
+
+
+class MemoryClipboardBackend(ClipboardBackend):
+    """In-process clipboard for tests and benchmarks"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._text = ""
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def set_text(self, text: str):
+        """Simulate a copy"""
+        with self._lock:
+            self._text = text
+            self._seq += 1
+
+    def read(self) -> str:
+        return self._text.strip()
+
+    def clear(self):
+        self.set_text("")
+
+    def sequence(self) -> Optional[int]:
+        return self._seq
+
+
+CLIPBOARD_BACKENDS = {
+    WindowsClipboardBackend.name: WindowsClipboardBackend,
+    PowerShellClipboardBackend.name: PowerShellClipboardBackend,
+    MemoryClipboardBackend.name: MemoryClipboardBackend,
+}
+
+
+def create_clipboard_backend(name: str = "auto") -> ClipboardBackend:
+    """Create a clipboard backend by name ("auto" = windows, else memory)"""
+    if name == "auto":
+        name = WindowsClipboardBackend.name if sys.platform == "win32" else MemoryClipboardBackend.name
+
+    if name not in CLIPBOARD_BACKENDS:
+        raise ValueError(f"Unknown clipboard backend: {name}")
+    return CLIPBOARD_BACKENDS[name]()
+
+
+class ClipboardService:
+    """Clipboard access with change notification by sequence polling"""
+
+    def __init__(self, backend: Optional[ClipboardBackend] = None, poll_interval: float = 0.005):
+        self.backend = backend or create_clipboard_backend()
+        self.poll_interval = poll_interval
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    def read(self) -> str:
+        return self.backend.read()
+
+    def clear(self):
+        self.backend.clear()
+
+    def sequence(self) -> Optional[int]:
+        return self.backend.sequence()
+
+    async def wait_for_change(self, timeout: float, since: Optional[int] = None) -> Optional[str]:
+        """Wait until the clipboard is written after `since`; return its text
+
+        `since` is a sequence() taken before the action that copies. Backends
+        without a sequence counter fall back to comparing the text itself.
+        Returns None on timeout.
+        """
+        deadline = time.perf_counter() + timeout
+        seq = since if since is not None else self.sequence()
+        before = self.read() if seq is None else None
+
+        while True:
+            current = self.sequence()
+            if seq is not None and current is not None:
+                if current != seq:
+                    text = self.read()
+                    if text:
+                        return text
+                    # Cleared or non-text write: keep waiting for the copy
+                    seq = current
+            elif seq is None:
+                text = self.read()
+                if text and text != before:
+                    return text
+
+            now = time.perf_counter()
+            if now >= deadline:
+                return None
+            await asyncio.sleep(min(self.poll_interval, deadline - now))
+
+    def close(self):
+        self.backend.close()
+
+
+_default: Optional[ClipboardService] = None
+
+
+def get_default_clipboard() -> ClipboardService:
+    """Shared clipboard service for one-off reads"""
+    global _default
+    if _default is None:
+        _default = ClipboardService()
+    return _default
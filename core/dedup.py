@@ -0,0 +1,150 @@
+"""
+Persistent dedup store for bought mints
+SQLite (WAL) on disk with a bounded in-memory LRU in front, TTL eviction
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class DedupStore:
+    """Set of mints that survives restarts
+
+    Every mint is written through to SQLite; the most recent `cache_size`
+    ones are also kept in an LRU so the hot path (a mint seen moments ago)
+    never touches the disk. Older mints are a primary-key lookup away.
+    Entries expire after `ttl` seconds (0 = never) and the table is capped
+    at `max_entries` rows, oldest first.
+    path=":memory:" gives a non-persistent store with the same behaviour.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        ttl: float = 7 * 24 * 3600,
+        cache_size: int = 100_000,
+        max_entries: int = 5_000_000,
+        prune_every: int = 1000
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, float]" = OrderedDict()
+        self._adds = 0
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS mints (mint TEXT PRIMARY KEY, added REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS mints_added ON mints (added)")
+
+        self.prune()
+        self._load()
+
+    def _cutoff(self, now: float) -> float:
+        return now - self.ttl if self.ttl > 0 else float("-inf")
+
+    def _load(self):
+        """Warm the cache with the newest entries"""
+        rows = self._db.execute(
+            "SELECT mint, added FROM mints ORDER BY added DESC LIMIT ?", (self.cache_size,)
+        ).fetchall()
+        # Oldest first so the newest end up most recently used
+        self._cache = OrderedDict(reversed(rows))
+
+    def _remember(self, mint: str, added: float):
+        self._cache[mint] = added
+        self._cache.move_to_end(mint)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _lookup(self, mint: str, now: float) -> Optional[float]:
+        """Added time of a live entry, or None"""
+        added = self._cache.get(mint)
+        if added is None:
+            row = self._db.execute("SELECT added FROM mints WHERE mint = ?", (mint,)).fetchone()
+            if row is None:
+                return None
+            added = row[0]
+            self._remember(mint, added)
+        if added < self._cutoff(now):
+            return None
+        return added
+
+    def __contains__(self, mint: str) -> bool:
+        with self._lock:
+            return self._lookup(mint, time.time()) is not None
+
+    def add(self, mint: str) -> bool:
+        """Insert a mint; False if it was already there (and not expired)"""
+        now = time.time()
+        with self._lock:
+            if self._lookup(mint, now) is not None:
+                return False
+            self._db.execute("INSERT OR REPLACE INTO mints (mint, added) VALUES (?, ?)", (mint, now))
+            self._remember(mint, now)
+
+            self._adds += 1
+            if self.prune_every and self._adds % self.prune_every == 0:
+                self._prune_locked(now)
+            return True
+
+    def discard(self, mint: str):
+        """Forget a mint (so it can be bought again)"""
+        with self._lock:
+            self._cache.pop(mint, None)
+            self._db.execute("DELETE FROM mints WHERE mint = ?", (mint,))
+
+    def prune(self) -> int:
+        """Drop expired entries and enforce max_entries; returns rows removed"""
+        with self._lock:
+            return self._prune_locked(time.time())
+
+    def _prune_locked(self, now: float) -> int:
+        removed = 0
+        if self.ttl > 0:
+            cutoff = self._cutoff(now)
+            removed += self._db.execute("DELETE FROM mints WHERE added < ?", (cutoff,)).rowcount
+            for mint in [m for m, added in self._cache.items() if added < cutoff]:
+                del self._cache[mint]
+
+        excess = self._count() - self.max_entries
+        if excess > 0:
+            # Oldest `excess` rows go (ties on the boundary timestamp go too)
+            boundary = self._db.execute(
+                "SELECT added FROM mints ORDER BY added LIMIT 1 OFFSET ?", (excess - 1,)
+            ).fetchone()[0]
+            removed += self._db.execute("DELETE FROM mints WHERE added <= ?", (boundary,)).rowcount
+            for mint in [m for m, added in self._cache.items() if added <= boundary]:
+                del self._cache[mint]
+        return removed
+
+    def _count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM mints").fetchone()[0]
+
+    def __len__(self) -> int:
+        """Entries on disk (expired ones included until the next prune)"""
+        with self._lock:
+            return self._count()
+
+    @property
+    def cached(self) -> int:
+        return len(self._cache)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
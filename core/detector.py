@@ -0,0 +1,126 @@
+"""
+Multi-probe region detector
+Grabs one ROI per scan and votes over N probes against a per-probe baseline
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .capture import CaptureBackend
+
+
+@dataclass
+class Probe:
+    """Screen point (w = h = 1) or sub-rectangle to watch"""
+    x: int
+    y: int
+    w: int = 1
+    h: int = 1
+
+
+@dataclass
+class Detection:
+    """Result of one detector scan"""
+    changed: bool
+    votes: int
+    colors: np.ndarray  # (N, 3) mean RGB per probe
+    diffs: np.ndarray  # (N,) sum of abs channel differences per probe
+
+
+def probes_from_offsets(x: int, y: int, offsets: Sequence[Sequence[int]]) -> List[Probe]:
+    """Build probes from [dx, dy] or [dx, dy, w, h] offsets around (x, y)"""
+    probes = []
+    for off in offsets:
+        dx, dy = int(off[0]), int(off[1])
+        w = int(off[2]) if len(off) > 2 else 1
+        h = int(off[3]) if len(off) > 3 else 1
+        probes.append(Probe(x + dx, y + dy, w, h))
+    return probes
+
+
+class RegionDetector:
+    """k-of-N probe voting over a single ROI grab"""
+
+    def __init__(self, probes: Sequence[Probe], tolerance: int = 15, min_votes: int = 1):
+        if not probes:
+            raise ValueError("RegionDetector needs at least one probe")
+
+        self.probes = list(probes)
+        self.tolerance = tolerance
+        self.min_votes = max(1, min(min_votes, len(self.probes)))
+        self.baseline: Optional[np.ndarray] = None
+
+        # Bounding ROI of all probes
+        self.left = min(p.x for p in self.probes)
+        self.top = min(p.y for p in self.probes)
+        self.width = max(p.x + p.w for p in self.probes) - self.left
+        self.height = max(p.y + p.h for p in self.probes) - self.top
+
+        # Flat pixel indices of every probe, grouped per probe, so one
+        # reduceat gives the per-probe sums
+        indices = []
+        starts = []
+        counts = []
+        for p in self.probes:
+            rows = np.arange(p.y - self.top, p.y - self.top + p.h)
+            cols = np.arange(p.x - self.left, p.x - self.left + p.w)
+            flat = (rows[:, None] * self.width + cols[None, :]).ravel()
+            starts.append(sum(counts))
+            counts.append(flat.size)
+            indices.append(flat)
+
+        self._indices = np.concatenate(indices)
+        self._starts = np.asarray(starts, dtype=np.intp)
+        self._counts = np.asarray(counts, dtype=np.float32)[:, None]
+        self._all_points = all(c == 1 for c in counts)
+
+    @property
+    def roi(self) -> Tuple[int, int, int, int]:
+        """(left, top, width, height) grabbed per scan"""
+        return (self.left, self.top, self.width, self.height)
+
+    def shift(self, dx: int, dy: int):
+        """Move every probe (and the ROI) by (dx, dy); the baseline is dropped"""
+        for p in self.probes:
+            p.x += dx
+            p.y += dy
+        self.left += dx
+        self.top += dy
+        self.baseline = None
+
+    def sample(self, frame: np.ndarray) -> np.ndarray:
+        """Mean RGB of every probe in an ROI frame, shape (N, 3)"""
+        pixels = frame.reshape(-1, 3)[self._indices]
+        if self._all_points:
+            return pixels.astype(np.int32)
+        sums = np.add.reduceat(pixels.astype(np.int32), self._starts, axis=0)
+        return (sums / self._counts).astype(np.int32)
+
+    def grab(self, capture: CaptureBackend) -> np.ndarray:
+        """Grab the ROI frame (view into the backend buffer)"""
+        return capture.grab(self.left, self.top, self.width, self.height)
+
+    def rebase(self, capture: CaptureBackend) -> np.ndarray:
+        """Take a new per-probe baseline from the screen"""
+        self.baseline = self.sample(self.grab(capture))
+        return self.baseline
+
+    def rebase_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Take a new per-probe baseline from an ROI frame"""
+        self.baseline = self.sample(frame)
+        return self.baseline
+
+    def check_frame(self, frame: np.ndarray) -> Detection:
+        """Vote over an ROI frame"""
+        colors = self.sample(frame)
+        if self.baseline is None:
+            self.baseline = colors
+
+        diffs = np.abs(colors - self.baseline).sum(axis=1)
+        votes = int(np.count_nonzero(diffs > self.tolerance))
+        return Detection(votes >= self.min_votes, votes, colors, diffs)
+
+    def check(self, capture: CaptureBackend) -> Detection:
+        """Grab the ROI and vote"""
+        return self.check_frame(self.grab(capture))
@@ -0,0 +1,211 @@
+"""
+Template locator
+Finds a UI element from a saved crop: coarse-to-fine pyramid search over
+the screen, then cheap tracking in a small ROI around the last position
+"""
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .capture import CaptureBackend
+
+
+@dataclass
+class Location:
+    """Where a template was found"""
+    x: int  # anchor point (the point to click) in screen coordinates
+    y: int
+    score: float  # normalized correlation, 1.0 = exact
+    mode: str  # "track" or "search"
+    ms: float
+
+
+def to_gray(img: np.ndarray) -> np.ndarray:
+    """RGB / RGBA / gray array to contiguous uint8 gray"""
+    if img.ndim == 2:
+        return np.ascontiguousarray(img, dtype=np.uint8)
+    code = cv2.COLOR_RGBA2GRAY if img.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+    return cv2.cvtColor(np.ascontiguousarray(img, dtype=np.uint8), code)
+
+
+def build_pyramid(img: np.ndarray, levels: int) -> List[np.ndarray]:
+    """[full, 1/2, 1/4, ...] (at most `levels` entries)"""
+    pyramid = [img]
+    for _ in range(levels - 1):
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
+
+def template_crop(
+    point: Tuple[int, int],
+    size: Tuple[int, int],
+    screen: Tuple[int, int, int, int]
+) -> Tuple[Tuple[int, int, int, int], Tuple[int, int]]:
+    """Crop of `size` around `point`, kept on screen: (roi, anchor inside the crop)
+
+    Near a screen edge the crop is shifted inward, so the point is no
+    longer at its center; the anchor has to be stored with the template.
+    """
+    x, y = point
+    width, height = size
+    sx, sy, sw, sh = screen
+    left = max(sx, min(x - width // 2, sx + sw - width))
+    top = max(sy, min(y - height // 2, sy + sh - height))
+    return (left, top, width, height), (x - left, y - top)
+
+
+def _peaks(result: np.ndarray, count: int, radius: Tuple[int, int]) -> List[Tuple[float, int, int]]:
+    """Best `count` maxima of a match map, suppressing a window around each"""
+    result = result.copy()
+    peaks = []
+    rx, ry = radius
+    for _ in range(count):
+        _, score, _, (x, y) = cv2.minMaxLoc(result)
+        if score <= -1:
+            break
+        peaks.append((score, x, y))
+        result[max(0, y - ry):y + ry + 1, max(0, x - rx):x + rx + 1] = -1
+    return peaks
+
+
+class TemplateLocator:
+    """Locates one template on screen
+
+    search() matches at the coarsest pyramid level and refines the best few
+    candidates down to full resolution in windows of a few pixels. track()
+    only matches inside `margin` pixels around the last hit, which is what
+    runs per snipe; locate() tries track() first and falls back to search().
+    """
+
+    def __init__(
+        self,
+        name: str,
+        template: np.ndarray,
+        anchor: Optional[Tuple[int, int]] = None,
+        expected: Optional[Tuple[int, int]] = None,
+        threshold: float = 0.8,
+        levels: int = 3,
+        margin: int = 40,
+        candidates: int = 3
+    ):
+        self.name = name
+        gray = to_gray(template)
+        self.height, self.width = gray.shape
+        # Offset of the click point inside the template (default: center)
+        self.anchor = anchor or (self.width // 2, self.height // 2)
+        self.threshold = threshold
+        self.margin = margin
+        self.candidates = candidates
+
+        # Keep the coarsest template at least 8 px on its short side
+        levels = max(1, levels)
+        while levels > 1 and min(self.width, self.height) >> (levels - 1) < 8:
+            levels -= 1
+        self.levels = levels
+        self.pyramid = build_pyramid(gray, levels)
+
+        # Top-left of the last hit (seeded from the calibrated point)
+        self.last: Optional[Tuple[int, int]] = None
+        if expected is not None:
+            self.last = (expected[0] - self.anchor[0], expected[1] - self.anchor[1])
+
+        self.tracks = 0
+        self.searches = 0
+        self.misses = 0
+
+    def _location(self, left: int, top: int, score: float, mode: str, start: float) -> Location:
+        self.last = (left, top)
+        return Location(left + self.anchor[0], top + self.anchor[1], score, mode, (time.perf_counter() - start) * 1000)
+
+    def match_roi(self, gray: np.ndarray) -> Tuple[float, int, int]:
+        """Best full-resolution match in a gray image: (score, left, top)"""
+        result = cv2.matchTemplate(gray, self.pyramid[0], cv2.TM_CCOEFF_NORMED)
+        _, score, _, (x, y) = cv2.minMaxLoc(result)
+        return score, x, y
+
+    def search_image(self, gray: np.ndarray) -> Tuple[float, int, int]:
+        """Pyramid search over a whole gray image: (score, left, top)"""
+        screen = build_pyramid(gray, self.levels)
+        top_level = self.levels - 1
+        coarse = cv2.matchTemplate(screen[top_level], self.pyramid[top_level], cv2.TM_CCOEFF_NORMED)
+        radius = (max(1, self.pyramid[top_level].shape[1] // 2), max(1, self.pyramid[top_level].shape[0] // 2))
+
+        best = (-1.0, 0, 0)
+        for _, x, y in _peaks(coarse, self.candidates, radius):
+            score = -1.0
+            for level in range(top_level - 1, -1, -1):
+                x, y = x * 2, y * 2
+                img, tpl = screen[level], self.pyramid[level]
+                th, tw = tpl.shape
+                # +-2 px at this level covers the rounding of pyrDown
+                x0, y0 = max(0, x - 2), max(0, y - 2)
+                x1 = min(img.shape[1], x + 2 + tw)
+                y1 = min(img.shape[0], y + 2 + th)
+                if x1 - x0 < tw or y1 - y0 < th:
+                    break
+                result = cv2.matchTemplate(img[y0:y1, x0:x1], tpl, cv2.TM_CCOEFF_NORMED)
+                _, score, _, (dx, dy) = cv2.minMaxLoc(result)
+                x, y = x0 + dx, y0 + dy
+            if top_level == 0:
+                score = float(coarse[y, x])
+            if score > best[0]:
+                best = (score, x, y)
+        return best
+
+    def track_roi(self) -> Optional[Tuple[int, int, int, int]]:
+        """ROI that track() matches in (None before the first hit)"""
+        if self.last is None:
+            return None
+        left = max(0, self.last[0] - self.margin)
+        top = max(0, self.last[1] - self.margin)
+        width = self.width + self.last[0] - left + self.margin
+        height = self.height + self.last[1] - top + self.margin
+        return (left, top, width, height)
+
+    def track(self, capture: CaptureBackend) -> Optional[Location]:
+        """Match in a small ROI around the last hit (None if lost)"""
+        roi = self.track_roi()
+        if roi is None:
+            return None
+        start = time.perf_counter()
+        left, top, width, height = roi
+        try:
+            roi = to_gray(capture.grab(left, top, width, height))
+        except Exception:
+            return None
+        score, x, y = self.match_roi(roi)
+        if score < self.threshold:
+            return None
+        self.tracks += 1
+        return self._location(left + x, top + y, score, "track", start)
+
+    def search(self, capture: CaptureBackend, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[Location]:
+        """Pyramid search over `region` (default: the whole screen)"""
+        start = time.perf_counter()
+        left, top, width, height = region or capture.screen_region()
+        gray = to_gray(capture.grab(left, top, width, height))
+        score, x, y = self.search_image(gray)
+        self.searches += 1
+        if score < self.threshold:
+            return None
+        return self._location(left + x, top + y, score, "search", start)
+
+    def locate(
+        self,
+        capture: CaptureBackend,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        search: bool = True
+    ) -> Optional[Location]:
+        """track(), then search() if the template left the ROI (search=False: track only)"""
+        found = self.track(capture)
+        if found is None and search:
+            found = self.search(capture, region)
+        if found is None:
+            self.misses += 1
+        return found
+
+    def stats(self):
+        return {"tracks": self.tracks, "searches": self.searches, "misses": self.misses, "last": self.last}
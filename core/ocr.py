@@ -1,80 +1,201 @@
 """
 Motor de OCR usando Tesseract
 """
-import re
-import subprocess
+import asyncio
 import numpy as np
 import cv2
-from typing import Optional, List
+from typing import Optional, List, Union
 
-# Regex para CA Solana
-CA_PATTERN = re.compile(r'[1-9A-HJ-NP-Za-km-z]{32,44}')
+from .address import find_addresses
+from .callout import CalloutMatcher, Match
+from .clipboard import get_default_clipboard
+from .ocr_cache import OCRCache, crop_key
+from .ocr_rows import RowOCR
+from .ocr_service import OCRBackend, OCRService
+from .singleflight import SingleFlight
 
 
 class OCREngine:
-    """Motor de OCR para extrair texto de screenshots"""
-
-    def __init__(self, tesseract_path: str = r"C:\Program Files\Tesseract-OCR\tesseract.exe"):
+    """Motor de OCR para extrair texto de screenshots
+
+    O reconhecimento roda num pool de workers Tesseract ja aquecidos
+    (OCRService): sem arquivo temporario e, no modo "auto" (tesserocr ou
+    libtesseract via ctypes), sem processo novo por imagem. Um cache LRU
+    pelo hash do recorte ja binarizado evita repetir o OCR de telas
+    identicas (cache_size=0 desliga).
+
+    extract_new_lines() e o modo incremental: divide o feed em faixas de
+    linha e so le as faixas que ainda nao foram vistas.
+    """
+
+    def __init__(
+        self,
+        tesseract_path: str = r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+        backend: Union[str, OCRBackend] = "auto",
+        workers: int = 2,
+        cache_size: int = 256
+    ):
         self.tesseract_path = tesseract_path
-        self._pytesseract = None
+        self.backend = backend
+        self.workers = workers
+        self._service: Optional[OCRService] = None
+        self.cache = OCRCache(cache_size) if cache_size > 0 else None
+        # Pedidos iguais ao mesmo tempo compartilham um unico OCR
+        self._flights = SingleFlight()
+        self._rows: Optional[RowOCR] = None
+        # Automato Aho-Corasick das palavras de callout (recompilado se a lista mudar)
+        self.callouts = CalloutMatcher()
+
+    def get_service(self) -> OCRService:
+        """Pool de OCR (criado e aquecido na primeira chamada)"""
+        if self._service is None:
+            self._service = OCRService(self.backend, self.workers, self.tesseract_path)
+            self._service.start()
+        return self._service
+
+    def preprocess(self, img: np.ndarray, crop_top_only: bool = True, threshold: Optional[int] = 150) -> np.ndarray:
+        """Recorte + grayscale + threshold (threshold=None usa Otsu)"""
+        # Cortar so a parte de cima onde aparece a notificacao (mais rapido)
+        if crop_top_only:
+            height = img.shape[0]
+            img = img[0:int(height * 0.35), :]
+
+        # Converter para grayscale
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+        # Threshold para melhor OCR
+        if threshold is None:
+            _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        else:
+            _, thresh = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
+        return thresh
+
+    def extract_text(self, img: np.ndarray, crop_top_only: bool = True, threshold: Optional[int] = 150) -> str:
+        """Extrai texto da imagem usando OCR"""
+        if img is None:
+            return ""
 
-    def _get_pytesseract(self):
-        """Inicializa pytesseract com caminho correto"""
-        if self._pytesseract is None:
-            import pytesseract
-            pytesseract.pytesseract.tesseract_cmd = self.tesseract_path
-            self._pytesseract = pytesseract
-        return self._pytesseract
+        try:
+            thresh = self.preprocess(img, crop_top_only, threshold)
+            if self.cache is None:
+                return self.get_service().recognize_sync(thresh)
+
+            key = crop_key(thresh)
+            text = self.cache.get(key)
+            if text is None:
+                text = self.get_service().recognize_sync(thresh)
+                self.cache.put(key, text)
+            return text
+        except Exception as e:
+            print(f"[OCR ERRO] {e}")
+            return ""
 
-    def extract_text(self, img: np.ndarray, crop_top_only: bool = True) -> str:
-        """Extrai texto da imagem usando OCR"""
+    async def extract_text_async(self, img: np.ndarray, crop_top_only: bool = True, threshold: Optional[int] = 150) -> str:
+        """extract_text sem bloquear o event loop"""
         if img is None:
             return ""
 
         try:
-            # Cortar so a parte de cima onde aparece a notificacao (mais rapido)
-            if crop_top_only:
-                height = img.shape[0]
-                img = img[0:int(height * 0.35), :]
+            thresh = self.preprocess(img, crop_top_only, threshold)
+            if self.cache is None:
+                return await self.get_service().recognize(thresh)
+
+            key = crop_key(thresh)
+            text = self.cache.get(key)
+            if text is None:
+                text = await self._flights.run(key.hex(), lambda: self._recognize_and_cache(key, thresh))
+            return text
+        except Exception as e:
+            print(f"[OCR ERRO] {e}")
+            return ""
 
-            # Converter para grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    async def _recognize_and_cache(self, key: bytes, thresh: np.ndarray) -> str:
+        text = await self.get_service().recognize(thresh)
+        self.cache.put(key, text)
+        return text
 
-            # Threshold para melhor OCR
-            _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
+    def get_rows(self) -> RowOCR:
+        """Leitor incremental do feed (compartilha o pool de OCR)"""
+        if self._rows is None:
+            self._rows = RowOCR(self.get_service())
+        return self._rows
 
-            # OCR
-            pytesseract = self._get_pytesseract()
-            text = pytesseract.image_to_string(thresh, config='--psm 6 --oem 3')
-            return text
+    def extract_new_lines(self, img: np.ndarray, crop_top_only: bool = True) -> List[str]:
+        """Linhas de texto que apareceram desde a ultima chamada"""
+        if img is None:
+            return []
 
+        try:
+            return self.get_rows().read(self.preprocess(img, crop_top_only))
         except Exception as e:
             print(f"[OCR ERRO] {e}")
-            return ""
+            return []
 
-    def find_callout(self, text: str, keywords: List[str]) -> bool:
-        """Verifica se ha callout no texto"""
-        text_lower = text.lower()
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                return True
-        return False
+    async def extract_new_lines_async(self, img: np.ndarray, crop_top_only: bool = True) -> List[str]:
+        """extract_new_lines com as faixas novas lidas em paralelo"""
+        if img is None:
+            return []
 
-    def extract_ca(self, text: str) -> Optional[str]:
-        """Extrai Contract Address do texto"""
-        matches = CA_PATTERN.findall(text)
+        try:
+            return await self.get_rows().read_async(self.preprocess(img, crop_top_only))
+        except Exception as e:
+            print(f"[OCR ERRO] {e}")
+            return []
+
+    async def reread_lines_async(self, img: np.ndarray, needle: str, threshold: Optional[int] = None) -> str:
+        """Le de novo, com outro threshold, as faixas novas da ultima leitura que tinham `needle`
+
+        Segunda leitura independente para confirmar um CA do feed (Otsu por
+        padrao, a primeira usa o threshold fixo).
+        """
+        if img is None or self._rows is None:
+            return ""
+
+        bands = [(top, bottom) for top, bottom, text in self._rows.last_bands if needle in text]
+        texts = await asyncio.gather(*(
+            self.extract_text_async(img[top:bottom], crop_top_only=False, threshold=threshold)
+            for top, bottom in bands
+        ))
+        return "\n".join(texts)
+
+    def prime_lines(self, img: np.ndarray, crop_top_only: bool = True):
+        """Marca o feed atual como ja visto (base para extract_new_lines)"""
+        if img is not None:
+            self.get_rows().prime(self.preprocess(img, crop_top_only))
+
+    def _matcher(self, keywords: Optional[List[str]]):
+        """Automato atual (troca se a lista de palavras mudou)
+
+        A troca aqui bloqueia; no event loop, compile antes com
+        callouts.reload() e chame sem keywords.
+        """
+        matcher = self.callouts.matcher
+        if keywords is not None and tuple(keywords) != matcher.keywords:
+            matcher = self.callouts.swap(keywords)
+        return matcher
+
+    def find_callout(self, text: str, keywords: Optional[List[str]] = None) -> bool:
+        """Verifica se ha callout no texto (uma passada para todas as palavras)"""
+        return self._matcher(keywords).search(text) is not None
+
+    def find_callouts(self, text: str, keywords: Optional[List[str]] = None) -> List[Match]:
+        """Todas as palavras encontradas no texto, com posicao"""
+        return self._matcher(keywords).find_all(text)
+
+    def extract_ca(self, text: str, require_pump: bool = False, check_curve: bool = True) -> Optional[str]:
+        """Extrai Contract Address do texto (chave base58 de 32 bytes)"""
+        matches = find_addresses(text, require_pump, check_curve)
 
         # Priorizar CAs que terminam em 'pump'
-        pump_cas = [m for m in matches if m.lower().endswith('pump') and 32 <= len(m) <= 44]
+        pump_cas = [m for m in matches if m.endswith('pump')]
         if pump_cas:
             return pump_cas[0]
 
         # Qualquer CA valido
         for match in matches:
-            if 32 <= len(match) <= 44:
-                lower_match = match.lower()
-                if not any(word in lower_match for word in ['view', 'coin', 'token', 'http', 'https', 'android']):
-                    return match
+            lower_match = match.lower()
+            if not any(word in lower_match for word in ['view', 'coin', 'token', 'http', 'https', 'android']):
+                return match
 
         return None
 
@@ -82,17 +203,18 @@ class OCREngine:
     def get_windows_clipboard() -> str:
         """Le clipboard do Windows"""
         try:
-            result = subprocess.run(
-                ["powershell", "-command", "Get-Clipboard"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            return result.stdout.strip()
+            return get_default_clipboard().read()
         except Exception as e:
             print(f"[CLIPBOARD ERRO] {e}")
             return ""
 
+    def close(self):
+        """Encerra os workers de OCR"""
+        if self._service is not None:
+            self._service.close()
+            self._service = None
+        self._rows = None
+
     def is_tesseract_installed(self) -> bool:
         """Verifica se Tesseract esta instalado"""
         import os
@@ -0,0 +1,91 @@
+"""
+OCR result cache
+LRU of recognized text keyed by a hash of the preprocessed crop
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def crop_key(img: np.ndarray) -> bytes:
+    """Exact 128-bit hash of a binarized crop (shape included)
+
+    Pixels are packed to one bit first (nonzero = white), so hashing reads
+    8x less memory. Exact on purpose: screen captures of an unchanged
+    screen are bit-identical, while a perceptual hash could map two CAs
+    that differ by one character to the same entry.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.asarray(img.shape, dtype=np.int32).tobytes())
+    h.update(np.packbits(img).data)
+    return h.digest()
+
+
+class OCRCache:
+    """Bounded LRU: at most `max_entries` texts and `max_bytes` of text"""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 1 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[bytes, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def _size(key: bytes, text: str) -> int:
+        return len(key) + len(text.encode("utf-8"))
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self._lock:
+            text = self._items.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: bytes, text: str):
+        size = self._size(key, text)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= self._size(key, old)
+            self._items[key] = text
+            self._bytes += size
+            while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+                k, v = self._items.popitem(last=False)
+                self._bytes -= self._size(k, v)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._items),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
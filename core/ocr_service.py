@@ -0,0 +1,390 @@
+"""
+OCR service
+Pool of warm Tesseract workers fed with numpy arrays, awaitable from the loop
+"""
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Optional, Union
+
+import numpy as np
+
+
+DEFAULT_TESSERACT = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+LIBTESSERACT_NAMES = (
+    "libtesseract-5.dll", "libtesseract-4.dll", "libtesseract.so.5", "libtesseract.so.4", "libtesseract.dylib"
+)
+
+_dll_directories = []  # os.add_dll_directory handles, kept alive while the library is loaded
+
+
+def to_pnm(img: np.ndarray) -> bytes:
+    """Encode a uint8 gray (H, W) or RGB (H, W, 3) array as binary PGM/PPM"""
+    img = np.ascontiguousarray(img, dtype=np.uint8)
+    if img.ndim == 2:
+        magic = b"P5"
+    elif img.ndim == 3 and img.shape[2] == 3:
+        magic = b"P6"
+    else:
+        raise ValueError(f"Unsupported image shape: {img.shape}")
+    height, width = img.shape[:2]
+    return b"%s\n%d %d\n255\n" % (magic, width, height) + img.tobytes()
+
+
+class OCRBackend:
+    """Base class for OCR backends (recognize() is called from worker threads)"""
+
+    name = "base"
+
+    def __init__(self, tesseract_path: str = DEFAULT_TESSERACT, lang: str = "eng", psm: int = 6, oem: int = 3):
+        self.tesseract_path = tesseract_path
+        self.lang = lang
+        self.psm = psm
+        self.oem = oem
+
+    def recognize(self, img: np.ndarray) -> str:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class TesserocrBackend(OCRBackend):
+    """libtesseract through tesserocr: one long-lived API per worker thread
+
+    tesserocr releases the GIL while recognizing, so worker threads run in
+    parallel. Pixels are handed over as raw bytes (no encoding, no files).
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self._local = threading.local()
+        self._apis = []
+        self._lock = threading.Lock()
+
+        tessdata = os.path.join(os.path.dirname(self.tesseract_path), "tessdata")
+        self._tessdata = tessdata if os.path.isdir(tessdata) else None
+
+    def _api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            tesserocr = self._tesserocr
+            kwargs = dict(lang=self.lang, psm=tesserocr.PSM(self.psm), oem=tesserocr.OEM(self.oem))
+            if self._tessdata:
+                kwargs["path"] = self._tessdata
+            api = self._local.api = tesserocr.PyTessBaseAPI(**kwargs)
+            with self._lock:
+                self._apis.append(api)
+        return api
+
+    def recognize(self, img: np.ndarray) -> str:
+        img = np.ascontiguousarray(img, dtype=np.uint8)
+        height, width = img.shape[:2]
+        channels = 1 if img.ndim == 2 else img.shape[2]
+        api = self._api()
+        api.SetImageBytes(img.tobytes(), width, height, channels, width * channels)
+        return api.GetUTF8Text()
+
+    def close(self):
+        with self._lock:
+            for api in self._apis:
+                api.End()
+            self._apis.clear()
+
+
+def load_libtesseract(tesseract_path: str = DEFAULT_TESSERACT) -> ctypes.CDLL:
+    """Load libtesseract from the Tesseract install folder or the library path"""
+    folder = os.path.dirname(tesseract_path)
+    candidates = [os.path.join(folder, name) for name in LIBTESSERACT_NAMES]
+    candidates = [path for path in candidates if os.path.isfile(path)]
+    found = ctypes.util.find_library("tesseract")
+    if found:
+        candidates.append(found)
+
+    if sys.platform == "win32" and os.path.isdir(folder):
+        # The DLL's own dependencies (leptonica, ...) live in the same folder
+        _dll_directories.append(os.add_dll_directory(folder))
+
+    errors = []
+    for path in candidates:
+        try:
+            return ctypes.CDLL(path)
+        except OSError as e:
+            errors.append(f"{path}: {e}")
+    raise OSError(f"libtesseract not found next to {tesseract_path} or on the library path"
+                  + (f" ({'; '.join(errors)})" if errors else ""))
+
+
+class TesseractCapiBackend(OCRBackend):
+    """libtesseract through its C API (ctypes): one long-lived handle per worker thread
+
+    The same in-process session as tesserocr without the extra package: the
+    library ships with the Tesseract install (libtesseract-5.dll next to
+    tesseract.exe). ctypes releases the GIL during each call, so worker
+    threads run in parallel.
+    """
+
+    name = "capi"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        lib = self._lib = load_libtesseract(self.tesseract_path)
+        handle = ctypes.c_void_p
+        lib.TessBaseAPICreate.restype = handle
+        lib.TessBaseAPICreate.argtypes = []
+        lib.TessBaseAPIInit2.restype = ctypes.c_int
+        lib.TessBaseAPIInit2.argtypes = [handle, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+        lib.TessBaseAPISetPageSegMode.restype = None
+        lib.TessBaseAPISetPageSegMode.argtypes = [handle, ctypes.c_int]
+        lib.TessBaseAPISetImage.restype = None
+        lib.TessBaseAPISetImage.argtypes = [handle, ctypes.c_void_p] + [ctypes.c_int] * 4
+        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p  # freed with TessDeleteText
+        lib.TessBaseAPIGetUTF8Text.argtypes = [handle]
+        lib.TessDeleteText.restype = None
+        lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIEnd.restype = None
+        lib.TessBaseAPIEnd.argtypes = [handle]
+        lib.TessBaseAPIDelete.restype = None
+        lib.TessBaseAPIDelete.argtypes = [handle]
+
+        self._local = threading.local()
+        self._handles = []
+        self._lock = threading.Lock()
+
+        tessdata = os.path.join(os.path.dirname(self.tesseract_path), "tessdata")
+        self._tessdata = tessdata if os.path.isdir(tessdata) else None
+
+    def _handle(self) -> int:
+        handle = getattr(self._local, "handle", None)
+        if handle is None:
+            lib = self._lib
+            handle = lib.TessBaseAPICreate()
+            datapath = self._tessdata.encode() if self._tessdata else None
+            if lib.TessBaseAPIInit2(handle, datapath, self.lang.encode(), self.oem) != 0:
+                lib.TessBaseAPIDelete(handle)
+                raise RuntimeError(f"libtesseract could not load language {self.lang!r} (tessdata: {self._tessdata})")
+            lib.TessBaseAPISetPageSegMode(handle, self.psm)
+            self._local.handle = handle
+            with self._lock:
+                self._handles.append(handle)
+        return handle
+
+    def recognize(self, img: np.ndarray) -> str:
+        img = np.ascontiguousarray(img, dtype=np.uint8)
+        height, width = img.shape[:2]
+        channels = 1 if img.ndim == 2 else img.shape[2]
+        lib = self._lib
+        handle = self._handle()
+        lib.TessBaseAPISetImage(handle, img.ctypes.data, width, height, channels, width * channels)
+        text = lib.TessBaseAPIGetUTF8Text(handle)
+        if not text:
+            return ""
+        try:
+            return ctypes.string_at(text).decode("utf-8", "replace")
+        finally:
+            lib.TessDeleteText(text)
+
+    def close(self):
+        with self._lock:
+            for handle in self._handles:
+                self._lib.TessBaseAPIEnd(handle)
+                self._lib.TessBaseAPIDelete(handle)
+            self._handles.clear()
+
+
+class TesseractCliBackend(OCRBackend):
+    """tesseract executable reading the image from stdin (no temp files)
+
+    Still one process per image, so "auto" never picks it; set
+    ocr_backend to "cli" to opt in.
+    """
+
+    name = "cli"
+
+    def __init__(self, *args, timeout: float = 10.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timeout = timeout
+        self._args = [
+            self.tesseract_path, "stdin", "stdout",
+            "--psm", str(self.psm), "--oem", str(self.oem), "-l", self.lang,
+        ]
+        self._flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+
+    def recognize(self, img: np.ndarray) -> str:
+        result = subprocess.run(
+            self._args,
+            input=to_pnm(img),
+            capture_output=True,
+            timeout=self.timeout,
+            creationflags=self._flags
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.decode("utf-8", "replace").strip() or "tesseract failed")
+        return result.stdout.decode("utf-8", "replace")
+
+
+class PytesseractBackend(OCRBackend):
+    """Old path: pytesseract.image_to_string (temp file + process per call)"""
+
+    name = "pytesseract"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        import pytesseract
+
+        pytesseract.pytesseract.tesseract_cmd = self.tesseract_path
+        self._pytesseract = pytesseract
+        self._config = f"--psm {self.psm} --oem {self.oem}"
+
+    def recognize(self, img: np.ndarray) -> str:
+        return self._pytesseract.image_to_string(img, lang=self.lang, config=self._config)
+
+
+OCR_BACKENDS = {
+    TesserocrBackend.name: TesserocrBackend,
+    TesseractCapiBackend.name: TesseractCapiBackend,
+    TesseractCliBackend.name: TesseractCliBackend,
+    PytesseractBackend.name: PytesseractBackend,
+}
+
+
+def create_ocr_backend(name: str = "auto", **kwargs) -> OCRBackend:
+    """Create an OCR backend by name
+
+    "auto" only picks an in-process session: tesserocr if installed, else
+    libtesseract through ctypes. Without either it fails instead of quietly
+    paying a process launch per image.
+    """
+    if name == "auto":
+        try:
+            return TesserocrBackend(**kwargs)
+        except ImportError as e:
+            tesserocr_error = e
+        try:
+            return TesseractCapiBackend(**kwargs)
+        except OSError as e:
+            raise RuntimeError(
+                f"no in-process OCR ({tesserocr_error}; {e}): pip install tesserocr, "
+                f"or set ocr_backend to \"cli\" to accept one tesseract process per image"
+            ) from e
+
+    if name not in OCR_BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {name}")
+    return OCR_BACKENDS[name](**kwargs)
+
+
+class OCRService:
+    """Fixed pool of OCR worker threads around one backend
+
+    start() spins up every worker and runs a warm-up image on each, so the
+    first real recognition doesn't pay for thread creation or model
+    loading. recognize() is awaitable; recognize_sync() blocks.
+    """
+
+    def __init__(
+        self,
+        backend: Union[str, OCRBackend] = "auto",
+        workers: int = 2,
+        tesseract_path: str = DEFAULT_TESSERACT,
+        lang: str = "eng",
+        psm: int = 6,
+        oem: int = 3
+    ):
+        if isinstance(backend, OCRBackend):
+            self.backend = backend
+        else:
+            self.backend = create_ocr_backend(backend, tesseract_path=tesseract_path, lang=lang, psm=psm, oem=oem)
+        self.workers = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self._times: Deque[float] = deque(maxlen=1000)
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    def start(self) -> float:
+        """Create and warm all workers; returns ms spent"""
+        start = time.perf_counter()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ocr")
+
+        # One warm-up per worker: the barrier keeps each job on its own thread
+        barrier = threading.Barrier(self.workers)
+        blank = np.full((32, 96), 255, dtype=np.uint8)
+
+        def warm():
+            barrier.wait(timeout=30)
+            try:
+                self.backend.recognize(blank)
+            except Exception:
+                pass
+
+        for future in [self._executor.submit(warm) for _ in range(self.workers)]:
+            future.result()
+        return (time.perf_counter() - start) * 1000
+
+    def _run(self, img: np.ndarray) -> str:
+        with self._lock:
+            self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return self.backend.recognize(img)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.in_flight -= 1
+                self.calls += 1
+                self._times.append(elapsed)
+
+    def recognize_sync(self, img: np.ndarray) -> str:
+        """Recognize on a worker and wait for the text"""
+        if self._executor is None:
+            self.start()
+        return self._executor.submit(self._run, img).result()
+
+    async def recognize(self, img: np.ndarray) -> str:
+        """Recognize on a worker without blocking the event loop"""
+        if self._executor is None:
+            self.start()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._run, img)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            times = sorted(self._times)
+        if not times:
+            return {"calls": self.calls, "errors": self.errors, "in_flight": self.in_flight}
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "mean_ms": sum(times) / len(times) * 1000,
+            "p50_ms": times[len(times) // 2] * 1000,
+            "p99_ms": times[min(len(times) - 1, int(len(times) * 0.99))] * 1000,
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.backend.close()
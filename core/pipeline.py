@@ -0,0 +1,254 @@
+"""
+Detection event queue and snipe stages
+The monitor loop puts events in, snipe workers take them out; a bounded
+queue with an explicit policy for events that are stale or superseded.
+Each snipe then runs as a cancellable task, stage by stage, every stage
+under its own timeout budget.
+"""
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Deque, Dict, Optional, Set
+
+
+LATEST = "latest"  # only the newest waiting event is worth sniping
+FIFO = "fifo"      # every event in arrival order
+EVENT_POLICIES = (LATEST, FIFO)
+
+# Snipe stages, in order. Detection has no stage of its own: its budget is
+# the event queue's max_age (frame to start of OPEN).
+QUEUED = "queued"    # taken from the queue, waiting for the mouse
+OPEN = "open"        # View Coin settles, relocate, click
+READY = "ready"      # chart / CA field shows up
+ACQUIRE = "acquire"  # clipboard / OCR race for the CA
+BUY = "buy"          # buy round
+STAGES = (OPEN, READY, ACQUIRE, BUY)
+
+# Seconds per stage (0 = no limit); above the waits each stage does on its own
+DEFAULT_STAGE_TIMEOUTS = {OPEN: 1.5, READY: 4.0, ACQUIRE: 4.0, BUY: 30.0}
+
+
+@dataclass
+class DetectionEvent:
+    """One detected change at the watched spot"""
+    seq: int
+    frame_ts: int  # perf_counter_ns of the frame that triggered it
+    votes: int
+    trace: Any = None
+    queued_at: float = field(default_factory=time.perf_counter)
+    ca: Optional[str] = None  # already read from the feed (callout): the snipe goes straight to buy
+
+    @property
+    def age(self) -> float:
+        """Seconds since the triggering frame"""
+        return (time.perf_counter_ns() - self.frame_ts) / 1e9
+
+
+class EventQueue:
+    """Bounded queue of detection events
+
+    latest: get() hands out the newest waiting event and drops the older
+            ones as superseded (the screen only shows the newest anyway)
+    fifo:   get() hands out events in order
+    Either way an event older than `max_age` is dropped as stale, and a put()
+    on a full queue drops the oldest event (overflow).
+    """
+
+    def __init__(self, policy: str = LATEST, maxsize: int = 8, max_age: float = 2.0):
+        if policy not in EVENT_POLICIES:
+            raise ValueError(f"Unknown event policy: {policy}")
+        self.policy = policy
+        self.maxsize = max(1, maxsize)
+        self.max_age = max_age
+        self._events: Deque[DetectionEvent] = deque()
+        self._ready: Optional[asyncio.Event] = None  # created on the running loop
+        self._closed = False
+
+        self.queued = 0
+        self.taken = 0
+        self.stale = 0
+        self.superseded = 0
+        self.overflow = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def _signal(self) -> asyncio.Event:
+        if self._ready is None:
+            self._ready = asyncio.Event()
+        return self._ready
+
+    def is_stale(self, event: DetectionEvent) -> bool:
+        return self.max_age > 0 and event.age > self.max_age
+
+    def drop_if_stale(self, event: DetectionEvent) -> bool:
+        """Count and report an event that went stale after it was taken"""
+        if self.is_stale(event):
+            self.stale += 1
+            self.taken -= 1
+            return True
+        return False
+
+    def newest(self) -> Optional[DetectionEvent]:
+        """Newest waiting event, without taking it"""
+        return self._events[-1] if self._events else None
+
+    def supersede(self, event: DetectionEvent):
+        """Count an event superseded after it was taken"""
+        self.superseded += 1
+        self.taken -= 1
+
+    def put(self, event: DetectionEvent) -> Optional[DetectionEvent]:
+        """Queue an event; returns the event dropped to make room, if any"""
+        dropped = None
+        if len(self._events) >= self.maxsize:
+            dropped = self._events.popleft()
+            self.overflow += 1
+        self._events.append(event)
+        self.queued += 1
+        self._signal().set()
+        return dropped
+
+    def _pop(self) -> Optional[DetectionEvent]:
+        """Next event by policy, skipping stale ones (None if nothing usable)"""
+        while self._events:
+            if self.policy == LATEST:
+                event = self._events.pop()
+                self.superseded += len(self._events)
+                self._events.clear()
+            else:
+                event = self._events.popleft()
+            if self.is_stale(event):
+                self.stale += 1
+                continue
+            self.taken += 1
+            return event
+        return None
+
+    async def get(self) -> Optional[DetectionEvent]:
+        """Wait for the next usable event (None once closed)"""
+        while True:
+            event = self._pop()
+            if event is not None:
+                return event
+            if self._closed:
+                return None
+            ready = self._signal()
+            ready.clear()
+            await ready.wait()
+
+    def close(self, drop_pending: bool = True):
+        """Wake every waiting get() with None"""
+        self._closed = True
+        if drop_pending:
+            self._events.clear()
+        self._signal().set()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queued,
+            "taken": self.taken,
+            "stale": self.stale,
+            "superseded": self.superseded,
+            "overflow": self.overflow,
+            "waiting": len(self._events),
+        }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"{s['taken']}/{s['queued']} sniped, {s['superseded']} superseded, "
+                f"{s['stale']} stale, {s['overflow']} overflow")
+
+
+class StageTimeout(Exception):
+    """A stage ran past its budget"""
+
+    def __init__(self, stage: str, budget: float):
+        super().__init__(f"{stage} stage over its {budget:.1f}s budget")
+        self.stage = stage
+        self.budget = budget
+
+
+class SnipeJob:
+    """One snipe in flight: its task, the stage it is in, why it was cancelled"""
+
+    def __init__(self, event: DetectionEvent):
+        self.event = event
+        self.stage = QUEUED
+        self.mint: Optional[str] = None  # set when the buy stage starts
+        self.task: Optional[asyncio.Task] = None
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str) -> bool:
+        """Cancel the task (first reason wins); False if it already finished"""
+        if self.task is None or self.task.done():
+            return False
+        if self.reason is None:
+            self.reason = reason
+        return self.task.cancel()
+
+
+class BuyProgress:
+    """Attempts of one buy round that actually left (past the rate limiter) / came back"""
+
+    def __init__(self):
+        self.sent: Set[int] = set()
+        self.answered = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.sent) - self.answered
+
+    @property
+    def between_attempts(self) -> bool:
+        """At least one attempt answered and none on the wire"""
+        return self.answered > 0 and self.in_flight <= 0
+
+
+class StageRunner:
+    """Runs snipe stages under their timeout budgets and counts the outcomes"""
+
+    def __init__(self, timeouts: Optional[Dict[str, float]] = None):
+        self.timeouts = dict(DEFAULT_STAGE_TIMEOUTS)
+        if timeouts:
+            unknown = set(timeouts) - set(STAGES)
+            if unknown:
+                raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+            self.timeouts.update(timeouts)
+        self.runs = {stage: 0 for stage in STAGES}
+        self.timed_out = {stage: 0 for stage in STAGES}
+        self.cancelled = {stage: 0 for stage in STAGES}
+
+    async def run(self, job: SnipeJob, stage: str, aw: Awaitable) -> Any:
+        """Await `aw` as `stage` of `job`; StageTimeout past the budget"""
+        job.stage = stage
+        self.runs[stage] += 1
+        budget = self.timeouts.get(stage, 0)
+        try:
+            if budget > 0:
+                return await asyncio.wait_for(aw, budget)
+            return await aw
+        except asyncio.TimeoutError:
+            self.timed_out[stage] += 1
+            raise StageTimeout(stage, budget) from None
+        except asyncio.CancelledError:
+            self.cancelled[stage] += 1
+            raise
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            stage: {"runs": self.runs[stage], "timeouts": self.timed_out[stage], "cancelled": self.cancelled[stage]}
+            for stage in STAGES
+        }
+
+    def summary(self) -> str:
+        parts = []
+        for stage in STAGES:
+            extra = []
+            if self.timed_out[stage]:
+                extra.append(f"{self.timed_out[stage]} timed out")
+            if self.cancelled[stage]:
+                extra.append(f"{self.cancelled[stage]} cancelled")
+            parts.append(f"{stage} {self.runs[stage]}" + (f" ({', '.join(extra)})" if extra else ""))
+        return " | ".join(parts)
@@ -0,0 +1,156 @@
+"""
+Async token-bucket rate limiter with priority lanes
+One per API client; every trade request takes a token before it is sent
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+PRIORITY_HIGH = 0  # first attempt on a fresh mint
+PRIORITY_LOW = 1   # retries, extra attempts
+
+LANE_NAMES = {PRIORITY_HIGH: "high", PRIORITY_LOW: "low"}
+
+
+class LaneStats:
+    """Queueing delay of one priority lane"""
+
+    def __init__(self, window: int = 1000):
+        self.granted = 0
+        self.queued = 0  # requests that had to wait
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waits: Deque[float] = deque(maxlen=window)
+
+    def record(self, wait: float):
+        self.granted += 1
+        if wait > 0:
+            self.queued += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.waits.append(wait)
+
+    def percentile(self, pct: float) -> float:
+        if not self.waits:
+            return 0.0
+        ordered = sorted(self.waits)
+        return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "granted": self.granted,
+            "queued": self.queued,
+            "mean_ms": self.total_wait / self.granted * 1000 if self.granted else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max_wait * 1000,
+        }
+
+
+class RateLimiter:
+    """Token bucket: `rate` requests/sec on average, bursts up to `burst`
+
+    Waiters are served strictly by priority (lower value first), FIFO
+    within a priority. rate <= 0 disables limiting.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 10):
+        self.rate = rate
+        self.burst = max(1, burst)
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.lanes: Dict[int, LaneStats] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    @property
+    def pending(self) -> int:
+        """Requests waiting for a token"""
+        return sum(1 for *_, fut in self._waiters if not fut.done())
+
+    def _lane(self, priority: int) -> LaneStats:
+        lane = self.lanes.get(priority)
+        if lane is None:
+            lane = self.lanes[priority] = LaneStats()
+        return lane
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority: int = PRIORITY_LOW) -> float:
+        """Take one token, waiting if needed; returns seconds waited"""
+        if not self.enabled:
+            self._lane(priority).record(0.0)
+            return 0.0
+
+        now = time.monotonic()
+        self._refill(now)
+        if self._tokens >= 1 and not self._waiters:
+            self._tokens -= 1
+            self._lane(priority).record(0.0)
+            return 0.0
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), now, fut))
+        self._schedule()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Token was granted right as we got cancelled: give it back
+                self._tokens = min(self.burst, self._tokens + 1)
+                self._drain()
+            raise
+        return fut.result()
+
+    def _drain(self):
+        """Hand out available tokens to waiters in priority order"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+        while self._waiters and self._tokens >= 1:
+            priority, _, queued_at, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            self._tokens -= 1
+            wait = now - queued_at
+            self._lane(priority).record(wait)
+            fut.set_result(wait)
+        # Drop cancelled waiters left at the top
+        while self._waiters and self._waiters[0][3].done():
+            heapq.heappop(self._waiters)
+        self._schedule()
+
+    def _schedule(self):
+        """Wake up when the next token is due"""
+        if self._timer is not None or not self._waiters:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._drain)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Queueing delay per lane"""
+        return {LANE_NAMES.get(p, str(p)): lane.to_dict() for p, lane in sorted(self.lanes.items())}
+
+    def summary(self) -> str:
+        parts = []
+        for name, s in self.stats().items():
+            parts.append(
+                f"{name}: {s['queued']}/{s['granted']} queued, "
+                f"wait p50 {s['p50_ms']:.0f}ms p99 {s['p99_ms']:.0f}ms max {s['max_ms']:.0f}ms"
+            )
+        return " | ".join(parts) if parts else "no requests"
+
@@ -0,0 +1,151 @@
+"""
+Vision-based readiness probes
+Poll a small ROI until the UI is ready instead of sleeping a fixed time
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import numpy as np
+
+from .capture import CaptureBackend
+
+
+class ReadinessProbe:
+    """Watch one ROI until a readiness condition holds
+
+    Modes:
+        signature - ROI matches a reference crop (mean abs diff <= tolerance)
+        change    - ROI differs from the snapshot taken by arm()
+        stable    - ROI within `stable_tolerance` of itself `stable_window`
+                    seconds earlier, for `stable_frames` polls in a row
+                    (after having changed from the armed snapshot, if
+                    require_change is set). Comparing across a window
+                    instead of poll to poll keeps a slow fade, whose
+                    per-poll step is below the tolerance, from passing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        roi: Tuple[int, int, int, int],
+        mode: str = "stable",
+        signature: Optional[np.ndarray] = None,
+        tolerance: float = 8.0,
+        stable_frames: int = 3,
+        require_change: bool = False,
+        stable_window: float = 0.1,
+        stable_tolerance: float = 3.0
+    ):
+        if mode not in ("signature", "change", "stable"):
+            raise ValueError(f"Unknown readiness mode: {mode}")
+        if mode == "signature" and signature is None:
+            raise ValueError("Signature mode needs a reference crop")
+
+        self.name = name
+        self.left, self.top, self.width, self.height = roi
+        self.mode = mode
+        self.signature = signature.astype(np.int16) if signature is not None else None
+        self.tolerance = tolerance
+        self.stable_frames = stable_frames
+        self.require_change = require_change
+        self.stable_window = stable_window
+        self.stable_tolerance = stable_tolerance
+
+        self._armed: Optional[np.ndarray] = None
+        self._history: Deque[Tuple[float, np.ndarray]] = deque()
+        self._changed = False
+        self._stable = 0
+
+    @property
+    def roi(self) -> Tuple[int, int, int, int]:
+        return (self.left, self.top, self.width, self.height)
+
+    def shift(self, dx: int, dy: int):
+        """Move the ROI by (dx, dy)"""
+        self.left += dx
+        self.top += dy
+        self._history.clear()
+
+    @staticmethod
+    def _distance(a: np.ndarray, b: np.ndarray) -> float:
+        return float(np.abs(a - b).mean())
+
+    def grab(self, capture: CaptureBackend) -> np.ndarray:
+        return capture.grab(self.left, self.top, self.width, self.height).astype(np.int16)
+
+    def arm(self, capture: CaptureBackend):
+        """Snapshot the ROI before the action that should change it"""
+        self._armed = self.grab(capture)
+        self._history.clear()
+        self._changed = False
+        self._stable = 0
+
+    def update(self, frame: np.ndarray, now: Optional[float] = None) -> bool:
+        """Feed one ROI frame (int16) taken at `now` (perf_counter), return True when ready"""
+        if self.mode == "signature":
+            return self._distance(frame, self.signature) <= self.tolerance
+
+        if self._armed is not None and not self._changed:
+            self._changed = self._distance(frame, self._armed) > self.tolerance
+
+        if self.mode == "change":
+            return self._changed
+
+        # stable: compare with the newest frame at least stable_window old
+        now = time.perf_counter() if now is None else now
+        history = self._history
+        while len(history) > 1 and history[1][0] <= now - self.stable_window:
+            history.popleft()
+        if history and history[0][0] <= now - self.stable_window:
+            if self._distance(frame, history[0][1]) <= self.stable_tolerance:
+                self._stable += 1
+            else:
+                self._stable = 0
+        history.append((now, frame))
+
+        if self.require_change and not self._changed:
+            return False
+        return self._stable >= self.stable_frames
+
+    async def wait(
+        self,
+        capture: CaptureBackend,
+        timeout: float,
+        poll_interval: float = 0.01
+    ) -> Optional[float]:
+        """Poll until ready; return seconds waited, or None on timeout"""
+        start = time.perf_counter()
+        deadline = start + timeout
+        while True:
+            if self.update(self.grab(capture)):
+                return time.perf_counter() - start
+            now = time.perf_counter()
+            if now >= deadline:
+                return None
+            await asyncio.sleep(min(poll_interval, deadline - now))
+
+
+def roi_around(x: int, y: int, size: int) -> Tuple[int, int, int, int]:
+    """Square ROI of side `size` centered on (x, y)"""
+    half = size // 2
+    return (max(0, x - half), max(0, y - half), size, size)
+
+
+def load_signature(path: str) -> np.ndarray:
+    """Load a reference crop saved with save_signature() or as an image"""
+    if path.endswith(".npy"):
+        return np.load(path)
+    from PIL import Image
+    return np.asarray(Image.open(path).convert("RGB"))
+
+
+def save_signature(capture: CaptureBackend, roi: Tuple[int, int, int, int], path: str):
+    """Save the current ROI as a reference crop"""
+    crop = capture.grab(*roi).copy()
+    if path.endswith(".npy"):
+        np.save(path, crop)
+    else:
+        from PIL import Image
+        Image.fromarray(crop).save(path)
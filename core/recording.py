@@ -0,0 +1,297 @@
+"""
+Record and replay of watched ROI frames
+Memory-mapped file of zlib-compressed XOR deltas with periodic keyframes
+"""
+import mmap
+import struct
+import time
+import zlib
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .capture import CAPTURE_BACKENDS, CaptureBackend
+
+
+MAGIC = b"PFSR"
+VERSION = 1
+
+# magic, version, width, height, channels, left, top
+HEADER = struct.Struct("<4sHHHHii")
+# timestamp_ns, kind, payload length
+RECORD = struct.Struct("<qBI")
+
+KIND_KEY = 1
+KIND_DELTA = 2
+
+
+def union_roi(rois: Sequence[Optional[Tuple[int, int, int, int]]]) -> Tuple[int, int, int, int]:
+    """Smallest (left, top, width, height) covering every ROI (None entries are skipped)"""
+    boxes = [roi for roi in rois if roi]
+    if not boxes:
+        raise ValueError("No ROI to cover")
+    left = min(roi[0] for roi in boxes)
+    top = min(roi[1] for roi in boxes)
+    right = max(roi[0] + roi[2] for roi in boxes)
+    bottom = max(roi[1] + roi[3] for roi in boxes)
+    return (left, top, right - left, bottom - top)
+
+
+class FrameRecorder:
+    """Append ROI frames with capture timestamps to a memory-mapped file"""
+
+    def __init__(
+        self,
+        path: str,
+        roi: Tuple[int, int, int, int],
+        keyframe_interval: int = 256,
+        chunk_size: int = 4 << 20,
+        level: int = 1
+    ):
+        self.path = path
+        self.left, self.top, self.width, self.height = roi
+        self.keyframe_interval = keyframe_interval
+        self.chunk_size = chunk_size
+        self.level = level
+
+        self.frames = 0
+        self.raw_bytes = 0
+
+        self._prev = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        self._delta = np.empty_like(self._prev)
+        self._file = open(path, "w+b")
+        self._map: Optional[mmap.mmap] = None
+        self._capacity = 0
+        self._pos = 0
+
+        self._reserve(HEADER.size)
+        self._put(HEADER.pack(MAGIC, VERSION, self.width, self.height, 3, self.left, self.top))
+
+    @property
+    def roi(self) -> Tuple[int, int, int, int]:
+        return (self.left, self.top, self.width, self.height)
+
+    @property
+    def size(self) -> int:
+        """Bytes written so far"""
+        return self._pos
+
+    def _reserve(self, n: int):
+        """Make sure n more bytes fit in the mapping"""
+        if self._pos + n <= self._capacity:
+            return
+        new_capacity = max(self._pos + n, self._capacity + self.chunk_size)
+        if self._map is not None:
+            self._map.close()
+        self._file.truncate(new_capacity)
+        self._map = mmap.mmap(self._file.fileno(), new_capacity)
+        self._capacity = new_capacity
+
+    def _put(self, data: bytes):
+        end = self._pos + len(data)
+        self._map[self._pos:end] = data
+        self._pos = end
+
+    def write(self, frame: np.ndarray, timestamp_ns: Optional[int] = None):
+        """Append one frame"""
+        if timestamp_ns is None:
+            timestamp_ns = time.perf_counter_ns()
+
+        if self.frames % self.keyframe_interval == 0:
+            kind = KIND_KEY
+            payload = zlib.compress(np.ascontiguousarray(frame).tobytes(), self.level)
+        else:
+            kind = KIND_DELTA
+            np.bitwise_xor(frame, self._prev, out=self._delta)
+            payload = zlib.compress(self._delta.tobytes(), self.level)
+        np.copyto(self._prev, frame)
+
+        self._reserve(RECORD.size + len(payload))
+        self._put(RECORD.pack(timestamp_ns, kind, len(payload)))
+        self._put(payload)
+        self.frames += 1
+        self.raw_bytes += frame.nbytes
+
+    def grab(self, capture: CaptureBackend, timestamp_ns: Optional[int] = None):
+        """Grab the recorded ROI from `capture` and append it"""
+        self.write(capture.grab(self.left, self.top, self.width, self.height), timestamp_ns)
+
+    def close(self):
+        """Flush and trim the file to the written size"""
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        self._file.truncate(self._pos)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FrameRecording:
+    """Read-only view of a recording file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, width, height, channels, left, top = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a frame recording: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported recording version: {version}")
+
+        self.width = width
+        self.height = height
+        self.left = left
+        self.top = top
+        self.shape = (height, width, channels)
+
+        # Index of records; stops at the first incomplete one (crashed writer)
+        offsets = []
+        timestamps = []
+        kinds = []
+        pos = HEADER.size
+        size = len(self._map)
+        while pos + RECORD.size <= size:
+            ts, kind, length = RECORD.unpack_from(self._map, pos)
+            if kind not in (KIND_KEY, KIND_DELTA) or pos + RECORD.size + length > size:
+                break
+            offsets.append(pos + RECORD.size)
+            timestamps.append(ts)
+            kinds.append(kind)
+            pos += RECORD.size + length
+
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.kinds = np.asarray(kinds, dtype=np.uint8)
+        self._ends = np.append(self.offsets[1:] - RECORD.size, pos).astype(np.int64)
+
+    @property
+    def roi(self) -> Tuple[int, int, int, int]:
+        return (self.left, self.top, self.width, self.height)
+
+    @property
+    def duration(self) -> float:
+        """Recorded span in seconds"""
+        if len(self.timestamps) < 2:
+            return 0.0
+        return (self.timestamps[-1] - self.timestamps[0]) / 1e9
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def decode_into(self, index: int, out: np.ndarray):
+        """Apply record `index` to `out` (holding frame index-1 for deltas)"""
+        raw = zlib.decompress(self._map[self.offsets[index]:self._ends[index]])
+        data = np.frombuffer(raw, dtype=np.uint8).reshape(self.shape)
+        if self.kinds[index] == KIND_KEY:
+            np.copyto(out, data)
+        else:
+            np.bitwise_xor(out, data, out=out)
+
+    def frames(self, start: int = 0) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """Yield (index, timestamp_ns, frame); the frame buffer is reused"""
+        out = np.zeros(self.shape, dtype=np.uint8)
+        # Decode forward from the keyframe at or before start
+        first = start
+        while first > 0 and self.kinds[first] != KIND_KEY:
+            first -= 1
+        for i in range(first, len(self)):
+            self.decode_into(i, out)
+            if i >= start:
+                yield i, int(self.timestamps[i]), out
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayCaptureBackend(CaptureBackend):
+    """Capture source feeding frames from a recording
+
+    realtime=True follows the recorded timestamps (scaled by speed);
+    realtime=False holds each frame until advance(), so the scan loop runs
+    as fast as it can and other grabs (readiness probes, locators) see the
+    same frame instead of eating the recording. Grabs must fall inside the
+    recorded ROI, which also stands in for the whole screen.
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str, realtime: bool = True, speed: float = 1.0):
+        super().__init__()
+        self.recording = FrameRecording(path)
+        self.realtime = realtime
+        self.speed = speed
+        self.index = -1
+
+        self._frame = np.zeros(self.recording.shape, dtype=np.uint8)
+        self._start: Optional[float] = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.index >= len(self.recording) - 1
+
+    @property
+    def timestamp_ns(self) -> int:
+        """Recorded timestamp of the current frame"""
+        return int(self.recording.timestamps[max(self.index, 0)])
+
+    def _seek(self, target: int):
+        """Decode forward to frame `target`"""
+        rec = self.recording
+        target = min(target, len(rec) - 1)
+        while self.index < target:
+            self.index += 1
+            rec.decode_into(self.index, self._frame)
+
+    def advance(self):
+        """Next recorded frame (realtime replay follows the clock instead)"""
+        if not self.realtime:
+            self._seek(self.index + 1)
+
+    def _advance(self):
+        """Decode forward to the frame due now"""
+        rec = self.recording
+        if not len(rec):
+            raise EOFError("Recording is empty")
+        if not self.realtime:
+            self._seek(max(self.index, 0))
+            return
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now
+        due = rec.timestamps[0] + int((now - self._start) * self.speed * 1e9)
+        self._seek(max(0, int(np.searchsorted(rec.timestamps, due, side="right")) - 1))
+
+    def screen_region(self) -> Tuple[int, int, int, int]:
+        return self.recording.roi
+
+    def _grab_into(self, left: int, top: int, out: np.ndarray):
+        height, width = out.shape[:2]
+        x = left - self.recording.left
+        y = top - self.recording.top
+        if x < 0 or y < 0 or x + width > self.recording.width or y + height > self.recording.height:
+            raise ValueError("Grab outside the recorded ROI")
+        self._advance()
+        np.copyto(out, self._frame[y:y + height, x:x + width])
+
+    def close_recording(self):
+        """Close the recording file (the backend can't grab afterwards)"""
+        self.recording.close()
+
+
+CAPTURE_BACKENDS[ReplayCaptureBackend.name] = ReplayCaptureBackend
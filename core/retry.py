@@ -0,0 +1,216 @@
+"""
+Retry policy and circuit breaker for buy attempts
+Classify failed BuyResults and decide: retry now, back off, or abort the token
+"""
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Pattern, Tuple
+
+if TYPE_CHECKING:
+    from .api import BuyResult
+
+
+# Error classes
+OK = "ok"
+AUTH = "auth"                  # bad / missing API key
+FUNDS = "funds"                # wallet can't pay
+BAD_TOKEN = "bad_token"        # invalid mint, curve complete, ...
+SLIPPAGE = "slippage"          # price moved past the slippage limit
+RATE_LIMITED = "rate_limited"  # 429
+TRANSIENT = "transient"        # timeout, connection error, 5xx
+UNKNOWN = "unknown"
+
+# Actions
+RETRY = "retry"      # next attempt right away
+BACKOFF = "backoff"  # next attempt after an exponential delay
+ABORT = "abort"      # give up on this token
+
+DEFAULT_ACTIONS: Dict[str, str] = {
+    AUTH: ABORT,
+    FUNDS: ABORT,
+    BAD_TOKEN: ABORT,
+    SLIPPAGE: RETRY,
+    RATE_LIMITED: BACKOFF,
+    TRANSIENT: BACKOFF,
+    UNKNOWN: BACKOFF,
+}
+
+# Failures that say nothing about the token, only about us or the service
+SYSTEMIC = (AUTH, FUNDS, RATE_LIMITED, TRANSIENT)
+
+# Systemic failures that won't fix themselves: trip the breaker at once
+FATAL = (AUTH, FUNDS)
+
+# (class, pattern over the error text) checked in order
+DEFAULT_PATTERNS: List[Tuple[str, str]] = [
+    (AUTH, r"api[ -]?key|unauthori[sz]ed|forbidden"),
+    (RATE_LIMITED, r"rate[ -]?limit|too many requests"),
+    (FUNDS, r"insufficient|not enough (sol|funds|balance)"),
+    (SLIPPAGE, r"slippage|price impact|exceeds desired|tolerance"),
+    (BAD_TOKEN, r"invalid mint|mint .*not found|bonding curve.*complete|token not found|invalid (token|address)"),
+    (TRANSIENT, r"timeout|timed out|connect|reset by peer|server disconnected|temporarily|unavailable"),
+]
+
+TRANSIENT_EXCEPTIONS = (
+    "TimeoutError", "ServerTimeoutError", "ClientConnectorError", "ClientOSError",
+    "ServerDisconnectedError", "ClientPayloadError", "ConnectionResetError",
+)
+
+
+@dataclass
+class RetryDecision:
+    """What to do after one attempt"""
+    error_class: str
+    action: str
+    delay: float = 0.0
+
+
+class RetryPolicy:
+    """Classifies buy failures and maps each class to an action
+
+    Backoff delays grow as base * factor**n (n = backoffs so far for this
+    token), capped at backoff_max, with +-jitter.
+    """
+
+    def __init__(
+        self,
+        actions: Optional[Dict[str, str]] = None,
+        patterns: Optional[List[Tuple[str, str]]] = None,
+        backoff_base: float = 0.25,
+        backoff_factor: float = 2.0,
+        backoff_max: float = 2.0,
+        jitter: float = 0.1
+    ):
+        self.actions = dict(DEFAULT_ACTIONS)
+        if actions:
+            self.actions.update(actions)
+        self.patterns: List[Tuple[str, Pattern]] = [
+            (cls, re.compile(p, re.IGNORECASE)) for cls, p in (patterns or DEFAULT_PATTERNS)
+        ]
+        self.backoff_base = backoff_base
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+
+    def classify(self, result: "BuyResult") -> str:
+        """Error class of a result"""
+        if result.success:
+            return OK
+
+        status = result.status
+        if status in (401, 403):
+            return AUTH
+        if status == 429:
+            return RATE_LIMITED
+
+        text = result.error or ""
+        for cls, pattern in self.patterns:
+            if pattern.search(text):
+                return cls
+
+        if result.error_type in TRANSIENT_EXCEPTIONS:
+            return TRANSIENT
+        if status is not None and status >= 500:
+            return TRANSIENT
+        return UNKNOWN
+
+    def backoff_delay(self, n: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * self.backoff_factor ** n)
+        if self.jitter:
+            delay *= 1.0 + random.uniform(-self.jitter, self.jitter)
+        return delay
+
+    def decide(self, result: "BuyResult", backoffs: int = 0) -> RetryDecision:
+        """Decision after `result`; `backoffs` = backoffs already taken for this token"""
+        cls = self.classify(result)
+        if cls == OK:
+            return RetryDecision(OK, RETRY)
+        action = self.actions.get(cls, BACKOFF)
+        delay = self.backoff_delay(backoffs) if action == BACKOFF else 0.0
+        return RetryDecision(cls, action, delay)
+
+
+class CircuitBreaker:
+    """Pauses sniping after repeated systemic failures
+
+    closed    - normal
+    open      - `threshold` systemic failures in a row (or one fatal one);
+                snipes are skipped for `cooldown` seconds
+    half_open - after the cooldown, one snipe is let through; a success
+                closes the breaker, a systemic failure opens it again.
+                Other snipes wait until that probe's result is recorded (or
+                a probe that never reached the API is a cooldown old)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        cooldown: float = 60.0,
+        on_change: Optional[Callable[[str, str], None]] = None
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.on_change = on_change
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.reason = ""
+        self._opened_at = 0.0
+        self._probe_at: Optional[float] = None  # start of the half-open probe in flight
+
+    def _set(self, state: str, reason: str = ""):
+        if state == self.state:
+            return
+        self.state = state
+        self._probe_at = None
+        self.reason = reason
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            self.trips += 1
+        if self.on_change:
+            self.on_change(state, reason)
+
+    def allow(self) -> bool:
+        """True if a snipe may start now (half-open: only the probe)"""
+        now = time.monotonic()
+        if self.state == self.OPEN and now - self._opened_at >= self.cooldown:
+            self._set(self.HALF_OPEN, "cooldown elapsed")
+        if self.state == self.HALF_OPEN:
+            if self._probe_at is not None and now - self._probe_at < self.cooldown:
+                return False
+            self._probe_at = now
+        return self.state != self.OPEN
+
+    @property
+    def remaining(self) -> float:
+        """Seconds until the breaker half-opens (0 unless open)"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+    def record(self, error_class: str):
+        """Feed the class of every buy result"""
+        self._probe_at = None
+        if error_class == OK:
+            self.failures = 0
+            self._set(self.CLOSED)
+            return
+        if error_class not in SYSTEMIC:
+            return
+
+        self.failures += 1
+        if error_class in FATAL:
+            self._set(self.OPEN, error_class)
+        elif self.state == self.HALF_OPEN or self.failures >= self.threshold:
+            self._set(self.OPEN, f"{self.failures}x {error_class}")
+
+    def reset(self):
+        self.failures = 0
+        self._set(self.CLOSED)
@@ -0,0 +1,111 @@
+"""
+Preallocated frame ring buffer
+Single producer, single consumer, no locks (per-slot sequence check)
+"""
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class FrameRing:
+    """Fixed-size ring of timestamped frames
+
+    The producer claims a slot with begin_write(), fills it in place and
+    calls publish(). Each slot carries the sequence number of the frame it
+    holds and is invalidated (-1) while being written, so a reader can
+    detect a frame that was overwritten under it and retry.
+    """
+
+    def __init__(self, capacity: int, shape: Tuple[int, ...], dtype=np.uint8):
+        if capacity < 2:
+            raise ValueError("FrameRing capacity must be >= 2")
+
+        self.capacity = capacity
+        self.shape = tuple(shape)
+        self.frames = np.zeros((capacity,) + self.shape, dtype=dtype)
+        self.timestamps = np.zeros(capacity, dtype=np.int64)  # perf_counter_ns
+        self.slot_seq = np.full(capacity, -1, dtype=np.int64)
+
+        # Next sequence number to be written (only the producer writes it)
+        self.write_seq = 0
+
+        # Consumer side counters
+        self.consumed = 0
+        self.dropped = 0
+
+    @property
+    def produced(self) -> int:
+        return self.write_seq
+
+    # Producer
+
+    def begin_write(self) -> np.ndarray:
+        """Claim the next slot and return it for in-place filling"""
+        idx = self.write_seq % self.capacity
+        self.slot_seq[idx] = -1
+        return self.frames[idx]
+
+    def publish(self, timestamp_ns: Optional[int] = None) -> int:
+        """Publish the slot claimed by begin_write(), return its sequence"""
+        seq = self.write_seq
+        idx = seq % self.capacity
+        self.timestamps[idx] = timestamp_ns if timestamp_ns is not None else time.perf_counter_ns()
+        self.slot_seq[idx] = seq
+        self.write_seq = seq + 1
+        return seq
+
+    def push(self, frame: np.ndarray, timestamp_ns: Optional[int] = None) -> int:
+        """Copy a frame into the next slot and publish it"""
+        np.copyto(self.begin_write(), frame)
+        return self.publish(timestamp_ns)
+
+    # Consumer
+
+    def read(self, seq: int, out: np.ndarray) -> Optional[int]:
+        """Copy frame `seq` into `out`; return its timestamp or None if gone"""
+        if seq < 0 or seq >= self.write_seq or self.write_seq - seq > self.capacity:
+            return None
+        idx = seq % self.capacity
+        if self.slot_seq[idx] != seq:
+            return None
+        ts = int(self.timestamps[idx])
+        np.copyto(out, self.frames[idx])
+        # Overwritten while copying?
+        if self.slot_seq[idx] != seq:
+            return None
+        return ts
+
+    def read_latest(self, last_seq: int, out: np.ndarray) -> Optional[Tuple[int, int]]:
+        """Copy the newest frame after `last_seq` into `out`
+
+        Returns (seq, timestamp_ns) or None when nothing new. Frames
+        between last_seq and the newest one are counted as dropped.
+        """
+        while True:
+            seq = self.write_seq - 1
+            if seq <= last_seq:
+                return None
+            ts = self.read(seq, out)
+            if ts is None:
+                continue
+            self.dropped += seq - last_seq - 1
+            self.consumed += 1
+            return seq, ts
+
+    def read_next(self, last_seq: int, out: np.ndarray) -> Optional[Tuple[int, int]]:
+        """Copy the oldest still-available frame after `last_seq` (in order)
+
+        Frames already overwritten are counted as dropped.
+        """
+        while True:
+            newest = self.write_seq - 1
+            if newest <= last_seq:
+                return None
+            seq = max(last_seq + 1, newest - self.capacity + 2)
+            ts = self.read(seq, out)
+            if ts is None:
+                continue
+            self.dropped += seq - last_seq - 1
+            self.consumed += 1
+            return seq, ts
@@ -0,0 +1,237 @@
+"""
+Deadline-based scan scheduler
+Keeps a fixed scan cadence regardless of capture cost and records jitter
+"""
+import asyncio
+import bisect
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+# Inter-scan interval bucket upper edges (ms); last bucket is open-ended
+DEFAULT_BUCKETS_MS = [1, 2, 5, 10, 15, 20, 25, 30, 40, 50, 60, 75, 100, 150, 200, 300, 500, 1000]
+
+
+class IntervalHistogram:
+    """Fixed-bucket histogram of intervals in milliseconds"""
+
+    def __init__(self, buckets_ms: Optional[List[float]] = None):
+        self.edges = list(buckets_ms or DEFAULT_BUCKETS_MS)
+        self.reset()
+
+    def reset(self):
+        """Clear all samples"""
+        self.counts = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def add(self, value_ms: float):
+        """Record one sample"""
+        self.counts[bisect.bisect_left(self.edges, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms < self.min_ms:
+            self.min_ms = value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Upper bucket edge containing the given percentile"""
+        if not self.count:
+            return 0.0
+        target = pct / 100.0 * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target and c:
+                return self.edges[i] if i < len(self.edges) else self.max_ms
+        return self.max_ms
+
+    def format(self) -> str:
+        """Text rendering, one line per non-empty bucket"""
+        lines = []
+        lower = 0
+        for i, c in enumerate(self.counts):
+            upper = f"{self.edges[i]}" if i < len(self.edges) else "inf"
+            if c:
+                bar = "#" * max(1, int(40 * c / self.count))
+                lines.append(f"{lower:>6}-{upper:<6}ms {c:>7} {bar}")
+            if i < len(self.edges):
+                lower = self.edges[i]
+        return "\n".join(lines)
+
+
+def enable_high_resolution_timer(enabled: bool = True):
+    """Request 1ms timer resolution on Windows (default tick is ~15.6ms)"""
+    if sys.platform != "win32":
+        return
+    try:
+        import ctypes
+        if enabled:
+            ctypes.windll.winmm.timeBeginPeriod(1)
+        else:
+            ctypes.windll.winmm.timeEndPeriod(1)
+    except Exception:
+        pass
+
+
+class ScanScheduler:
+    """Wait for the next scan deadline instead of sleeping after the work
+
+    Deadlines advance by a fixed interval from the previous deadline, so
+    capture cost does not stretch the period. When a deadline has already
+    passed the scan is an overrun and the schedule re-anchors on now.
+    burst() temporarily switches to a shorter interval.
+
+    The waiter (capture thread or loop) and burst()/reset() (loop) may run
+    on different threads, so the schedule state sits behind a lock. A wait
+    sleeps until spin_threshold before the deadline and only spins the rest.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        burst_interval: float = 0.01,
+        burst_duration: float = 0.5,
+        spin_threshold: float = 0.001
+    ):
+        self.interval = interval
+        self.burst_interval = burst_interval
+        self.burst_duration = burst_duration
+        self.spin_threshold = spin_threshold
+
+        self.histogram = IntervalHistogram()
+        self.overruns = 0
+        self.scans = 0
+        self.bursts = 0
+
+        self._deadline: Optional[float] = None
+        self._last_scan: Optional[float] = None
+        self._burst_until = 0.0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)  # burst()/reset() wake a blocked waiter
+
+    @property
+    def in_burst(self) -> bool:
+        return time.perf_counter() < self._burst_until
+
+    @property
+    def current_interval(self) -> float:
+        return self.burst_interval if self.in_burst else self.interval
+
+    def start(self):
+        """Begin a fresh schedule"""
+        enable_high_resolution_timer(True)
+        self.reset()
+
+    def stop(self):
+        """Release timer resources"""
+        enable_high_resolution_timer(False)
+
+    def reset(self):
+        """Re-anchor the schedule on now (e.g. after a long pipeline run)"""
+        with self._lock:
+            self._deadline = None
+            self._last_scan = None
+            self._changed.notify_all()
+
+    def burst(self, duration: Optional[float] = None):
+        """Scan at burst_interval for the next `duration` seconds"""
+        with self._lock:
+            if not self.in_burst:
+                self.bursts += 1
+            self._burst_until = time.perf_counter() + (duration if duration is not None else self.burst_duration)
+            # Pull the next deadline in so the burst takes effect right away
+            if self._deadline is not None and self._last_scan is not None:
+                self._deadline = min(self._deadline, self._last_scan + self.burst_interval)
+            self._changed.notify_all()
+
+    def mark(self):
+        """Record a scan at the current time"""
+        with self._lock:
+            now = time.perf_counter()
+            if self._last_scan is not None:
+                self.histogram.add((now - self._last_scan) * 1000.0)
+            self._last_scan = now
+            self.scans += 1
+
+    def _advance(self):
+        """Move the deadline one interval on (re-anchor on now after an overrun)"""
+        with self._lock:
+            now = time.perf_counter()
+            interval = self.current_interval
+            if self._deadline is None or interval <= 0:
+                # First scan, or free-running (e.g. replay at max speed)
+                self._deadline = now
+                return
+
+            self._deadline += interval
+            if self._deadline < now:
+                self.overruns += 1
+                self._deadline = now
+
+    def _remaining_locked(self) -> float:
+        if self._deadline is None:
+            return 0.0
+        return self._deadline - time.perf_counter()
+
+    def _remaining(self) -> float:
+        """Seconds to the current deadline (burst() may have pulled it in, reset() cleared it)"""
+        with self._lock:
+            return self._remaining_locked()
+
+    def _spin(self):
+        """Busy-wait the last fraction (<= spin_threshold) up to the deadline"""
+        while self._remaining() > 0:
+            pass
+        self.mark()
+
+    async def wait(self):
+        """Sleep until the next deadline, then record the scan"""
+        self._advance()
+        remaining = self._remaining()
+        while remaining > self.spin_threshold:
+            await asyncio.sleep(remaining - self.spin_threshold)
+            remaining = self._remaining()
+        self._spin()
+
+    def wait_blocking(self):
+        """Same as wait() for a dedicated thread; burst()/reset() cut the sleep short"""
+        self._advance()
+        with self._changed:
+            remaining = self._remaining_locked()
+            while remaining > self.spin_threshold:
+                self._changed.wait(remaining - self.spin_threshold)
+                remaining = self._remaining_locked()
+        self._spin()
+
+    def stats(self) -> Dict[str, float]:
+        """Summary of measured cadence"""
+        h = self.histogram
+        return {
+            "scans": self.scans,
+            "overruns": self.overruns,
+            "bursts": self.bursts,
+            "mean_ms": h.mean_ms,
+            "min_ms": h.min_ms if h.count else 0.0,
+            "max_ms": h.max_ms,
+            "p50_ms": h.percentile(50),
+            "p99_ms": h.percentile(99),
+            "hz": 1000.0 / h.mean_ms if h.mean_ms else 0.0,
+        }
+
+    def summary(self) -> str:
+        """One-line stats for logs"""
+        s = self.stats()
+        return (
+            f"{s['hz']:.1f} Hz, mean {s['mean_ms']:.1f}ms, p99 <= {s['p99_ms']:.0f}ms, "
+            f"max {s['max_ms']:.1f}ms, overruns {s['overruns']}"
+        )
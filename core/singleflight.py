@@ -0,0 +1,135 @@
+"""
+Single-flight execution per key
+Concurrent callers for the same key share one in-flight run and its result
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+PENDING = "pending"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class Flight:
+    """One run for one key"""
+
+    def __init__(self, key: str, task: asyncio.Task):
+        self.key = key
+        self.task = task
+        self.state = PENDING
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+        self.joiners = 0
+        self.error: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class SingleFlight:
+    """Coalesces concurrent runs of the same key
+
+    run(key, fn) starts fn() as its own task if nothing is in flight for
+    key; otherwise the caller joins the pending run. Every caller, the one
+    that started it included, awaits the task through shield(): a caller
+    being cancelled (stop, stage timeout) never cancels the shared run.
+    Only cancel(key) does, and then every caller gets CancelledError.
+    Finished flights keep their state (up to `history` keys) for
+    state()/flight(). `succeeded(result)` decides between SUCCEEDED and FAILED.
+    """
+
+    def __init__(
+        self,
+        succeeded: Callable[[Any], bool] = bool,
+        history: int = 10000
+    ):
+        self.succeeded = succeeded
+        self.history = history
+        self._flights: "OrderedDict[str, Flight]" = OrderedDict()
+        self.started = 0
+        self.joined = 0
+
+    def flight(self, key: str) -> Optional[Flight]:
+        return self._flights.get(key)
+
+    def state(self, key: str) -> Optional[str]:
+        """PENDING / SUCCEEDED / FAILED, or None if never run"""
+        flight = self._flights.get(key)
+        return flight.state if flight else None
+
+    def in_flight(self, key: str) -> bool:
+        return self.state(key) == PENDING
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for f in self._flights.values() if f.state == PENDING)
+
+    def counts(self) -> Dict[str, int]:
+        out = {PENDING: 0, SUCCEEDED: 0, FAILED: 0}
+        for f in self._flights.values():
+            out[f.state] += 1
+        return out
+
+    async def run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        on_join: Optional[Callable[[Flight], None]] = None
+    ) -> Any:
+        """Run fn() once per key at a time; concurrent callers share the result"""
+        flight = self._flights.get(key)
+        if flight is not None and flight.state == PENDING:
+            flight.joiners += 1
+            self.joined += 1
+            if on_join:
+                on_join(flight)
+        else:
+            flight = Flight(key, asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            self._flights.move_to_end(key)
+            self.started += 1
+            flight.task.add_done_callback(lambda task, flight=flight: self._finish(flight))
+        return await asyncio.shield(flight.task)
+
+    def cancel(self, key: str) -> bool:
+        """Cancel the pending run of `key` for every caller"""
+        flight = self._flights.get(key)
+        if flight is None or flight.state != PENDING:
+            return False
+        return flight.task.cancel()
+
+    def _finish(self, flight: Flight):
+        task = flight.task
+        if task.cancelled():
+            flight.state = FAILED
+            flight.error = "CancelledError"
+        elif task.exception() is not None:
+            # Retrieved here, so asyncio won't log "exception never retrieved"
+            # when every caller has been cancelled
+            e = task.exception()
+            flight.state = FAILED
+            flight.error = str(e) or type(e).__name__
+        else:
+            flight.state = SUCCEEDED if self.succeeded(task.result()) else FAILED
+        flight.finished = time.monotonic()
+        self._trim()
+
+    def _trim(self):
+        """Forget the oldest finished flights beyond `history`"""
+        excess = len(self._flights) - self.history
+        if excess <= 0:
+            return
+        finished = []
+        for key, flight in self._flights.items():
+            if flight.state != PENDING:
+                finished.append(key)
+                if len(finished) >= excess:
+                    break
+        for key in finished:
+            del self._flights[key]
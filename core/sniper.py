@@ -4,19 +4,37 @@ Monitors pixel color change on View Coin and executes buys
 """
 import asyncio
 import time
-import re
 import ctypes
 from ctypes import wintypes
-from typing import Optional, Callable, Tuple
+from typing import Optional, Callable, Dict, Tuple, List
 from enum import Enum, auto
+import numpy as np
 from PIL import ImageGrab
-import subprocess
 
+from .acquire import CA_SOURCES, CLIPBOARD, OCR, CARace
+from .address import extract_ca
 from .api import PumpPortalAPI, BuyResult
+from .capture import CaptureBackend, CaptureThread, create_capture_backend
+from .dedup import DedupStore
+from .locator import Location, TemplateLocator
+from .detector import RegionDetector, probes_from_offsets
+from .ocr import OCREngine
+from .pipeline import (
+    ACQUIRE, BUY, LATEST, OPEN, QUEUED, READY, STAGES,
+    BuyProgress, DetectionEvent, EventQueue, SnipeJob, StageRunner, StageTimeout
+)
+from .scheduler import ScanScheduler
+from .singleflight import SingleFlight
+from .ratelimit import RateLimiter
+from .recording import FrameRecorder, union_roi
+from .retry import ABORT, BACKOFF, CircuitBreaker, RetryPolicy
+from .tracing import SnipeTrace, TraceCollector
+from .readiness import ReadinessProbe, load_signature, roi_around
+from .clipboard import ClipboardService, create_clipboard_backend, get_default_clipboard
 
 
-# Solana CA regex
-CA_PATTERN = re.compile(r'[1-9A-HJ-NP-Za-km-z]{32,44}')
+# Binarizations alternated by the CA OCR (None = Otsu)
+OCR_THRESHOLDS = (150, None)
 
 
 class SniperState(Enum):
@@ -27,10 +45,11 @@ class SniperState(Enum):
     WAITING_CHART = auto()
     COPYING_CA = auto()
     BUYING = auto()
+    PAUSED = auto()
 
 
 def get_pixel_color(x: int, y: int) -> Tuple[int, int, int]:
-    """Capture pixel color on screen"""
+    """Capture pixel color on screen (one-shot, use a CaptureBackend in loops)"""
     # Capture 1x1 pixel area
     img = ImageGrab.grab(bbox=(x, y, x + 1, y + 1))
     return img.getpixel((0, 0))
@@ -57,28 +76,12 @@ def windows_click(x: int, y: int):
 
 def get_clipboard() -> str:
     """Read Windows clipboard"""
-    try:
-        result = subprocess.run(
-            ["powershell", "-command", "Get-Clipboard"],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        return result.stdout.strip()
-    except:
-        return ""
+    return get_default_clipboard().read()
 
 
 def clear_clipboard():
     """Clear clipboard"""
-    try:
-        subprocess.run(
-            ["powershell", "-command", "Set-Clipboard -Value $null"],
-            capture_output=True,
-            timeout=2
-        )
-    except:
-        pass
+    get_default_clipboard().clear()
 
 
 class Sniper:
@@ -92,10 +95,77 @@ class Sniper:
         priority_fee: float = 0.12,
         num_attempts: int = 5,
         delay_between: float = 0.5,
+        buy_concurrency: int = 1,
+        buy_stagger: float = 0.0,
+        buy_stop_after: int = 0,
         view_coin_x: int = 764,
         view_coin_y: int = 344,
         ca_area_x: int = 440,
         ca_area_y: int = 198,
+        capture_backend: str = "auto",
+        capture: Optional[CaptureBackend] = None,
+        replay_path: str = "",
+        replay_realtime: bool = True,
+        probe_offsets: Optional[List[List[int]]] = None,
+        probe_votes: int = 1,
+        pixel_tolerance: int = 15,
+        scan_interval: float = 0.05,
+        burst_interval: float = 0.01,
+        burst_duration: float = 0.5,
+        capture_thread: bool = True,
+        frame_ring_size: int = 64,
+        record_path: str = "",
+        view_coin_delay: float = 0.4,
+        chart_load_time: float = 2.5,
+        ready_roi_size: int = 40,
+        ready_stable_frames: int = 3,
+        ready_stable_window: float = 0.1,
+        ready_poll_interval: float = 0.01,
+        ca_signature_path: str = "",
+        clipboard_backend: str = "auto",
+        clipboard: Optional[ClipboardService] = None,
+        ca_copy_timeout: float = 1.0,
+        api_url: str = "",
+        api_endpoints: Optional[List[str]] = None,
+        race_mode: str = "hedged",
+        hedge_delay: float = 0.15,
+        retry_policy: bool = True,
+        backoff_base: float = 0.25,
+        backoff_max: float = 2.0,
+        breaker_threshold: int = 5,
+        breaker_cooldown: float = 60.0,
+        rate_limit: float = 10.0,
+        rate_burst: int = 10,
+        dedup_path: str = "",
+        dedup_ttl: float = 7 * 24 * 3600,
+        dedup: Optional[DedupStore] = None,
+        ca_require_pump: bool = False,
+        ca_check_curve: bool = True,
+        ca_source: str = "race",
+        ca_ocr_width: int = 520,
+        ca_ocr_height: int = 40,
+        ca_ocr_interval: float = 0.05,
+        feed_region: Optional[List[int]] = None,
+        callout_keywords: Optional[List[str]] = None,
+        feed_interval: float = 0.25,
+        ocr_backend: str = "auto",
+        ocr_workers: int = 2,
+        tesseract_path: str = r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+        ocr: Optional[OCREngine] = None,
+        view_coin_template: str = "",
+        ca_template: str = "",
+        view_coin_anchor: Optional[List[int]] = None,
+        ca_anchor: Optional[List[int]] = None,
+        locate_threshold: float = 0.8,
+        locate_margin: int = 40,
+        locate_levels: int = 3,
+        snipe_concurrency: int = 2,
+        event_queue_size: int = 8,
+        event_policy: str = "latest",
+        event_max_age: float = 2.0,
+        event_holdoff: float = 0.4,
+        event_preempt: bool = False,
+        stage_timeouts: Optional[Dict[str, float]] = None,
         **kwargs  # Ignore other parameters
     ):
         # Buy config
@@ -105,6 +175,9 @@ class Sniper:
         self.priority_fee = priority_fee
         self.num_attempts = num_attempts
         self.delay_between = delay_between
+        self.buy_concurrency = buy_concurrency
+        self.buy_stagger = buy_stagger
+        self.buy_stop_after = buy_stop_after
 
         # Coordinates
         self.view_coin_x = view_coin_x
@@ -112,20 +185,174 @@ class Sniper:
         self.ca_area_x = ca_area_x
         self.ca_area_y = ca_area_y
 
+        # Failure handling (classified retries, pause after systemic failures)
+        self.retry_policy = RetryPolicy(backoff_base=backoff_base, backoff_max=backoff_max) if retry_policy else None
+        self.classifier = self.retry_policy or RetryPolicy()
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown, on_change=self._on_breaker_change)
+
         # API
-        self.api = PumpPortalAPI(api_key)
+        self.api = PumpPortalAPI(
+            api_key,
+            base_url=api_url or None,
+            endpoints=api_endpoints or None,
+            race_mode=race_mode,
+            hedge_delay=hedge_delay,
+            retry_policy=self.retry_policy,
+            rate_limiter=RateLimiter(rate_limit, rate_burst) if rate_limit > 0 else None
+        )
+
+        # Screen capture (kept open while running); "replay" plays a recording instead of the screen
+        if capture is None:
+            options = dict(path=replay_path, realtime=replay_realtime) if capture_backend == "replay" else {}
+            capture = create_capture_backend(capture_backend, **options)
+        self.capture = capture
+
+        # Change detector (probes are offsets around View Coin)
+        self.detector = RegionDetector(
+            probes_from_offsets(view_coin_x, view_coin_y, probe_offsets or [[0, 0]]),
+            tolerance=pixel_tolerance,
+            min_votes=probe_votes
+        )
+
+        # Scan cadence
+        self.scheduler = ScanScheduler(scan_interval, burst_interval, burst_duration)
+
+        # Producer thread feeding ROI frames to the loop (None = capture inline).
+        # A non-realtime replay is stepped by the scan loop itself, one frame per scan.
+        self.capture_thread: Optional[CaptureThread] = None
+        if capture_thread and self.capture.realtime:
+            self.capture_thread = CaptureThread(self.capture, self.detector.roi, self.scheduler, frame_ring_size)
+
+        # Readiness probes (waits end as soon as the UI is ready)
+        self.view_coin_delay = view_coin_delay
+        self.chart_load_time = chart_load_time
+        self.ready_poll_interval = ready_poll_interval
+        self.view_coin_probe = ReadinessProbe(
+            "view_coin",
+            roi_around(view_coin_x, view_coin_y, ready_roi_size),
+            mode="stable",
+            stable_frames=ready_stable_frames,
+            stable_window=ready_stable_window
+        )
+        if ca_signature_path:
+            self.ca_probe = ReadinessProbe(
+                "ca_field",
+                roi_around(ca_area_x, ca_area_y, ready_roi_size),
+                mode="signature",
+                signature=load_signature(ca_signature_path)
+            )
+        else:
+            self.ca_probe = ReadinessProbe(
+                "ca_field",
+                roi_around(ca_area_x, ca_area_y, ready_roi_size),
+                mode="stable",
+                stable_frames=ready_stable_frames,
+                stable_window=ready_stable_window,
+                require_change=True
+            )
+
+        # Template locators: follow View Coin / the CA field if the page shifts
+        self.view_coin_locator = self._make_locator(
+            "View Coin", view_coin_template, view_coin_anchor, (view_coin_x, view_coin_y),
+            locate_threshold, locate_margin, locate_levels
+        )
+        self.ca_locator = self._make_locator(
+            "CA field", ca_template, ca_anchor, (ca_area_x, ca_area_y),
+            locate_threshold, locate_margin, locate_levels
+        )
+        self._watch_moved = False
+        self._searches: Dict[str, asyncio.Task] = {}  # full-screen searches off the snipe path
+
+        # Clipboard (long-lived backend)
+        self.clipboard = clipboard or ClipboardService(create_clipboard_backend(clipboard_backend))
+        self.ca_copy_timeout = ca_copy_timeout
+
+        # CA validation (32-byte base58 key, optional checks)
+        self.ca_require_pump = ca_require_pump
+        self.ca_check_curve = ca_check_curve
+
+        # CA sources: clipboard copy and/or OCR of the CA field, raced
+        if ca_source not in CA_SOURCES:
+            raise ValueError(f"Unknown CA source: {ca_source}")
+        self.ca_source = ca_source
+        self.ca_ocr_roi = (
+            max(0, ca_area_x - ca_ocr_width // 2),
+            max(0, ca_area_y - ca_ocr_height // 2),
+            ca_ocr_width,
+            ca_ocr_height
+        )
+        self.ca_ocr_interval = ca_ocr_interval
+        # Optional callout watch: OCR of the feed, only the lines that are new
+        self.feed_region = tuple(feed_region) if feed_region else None
+        self.callout_keywords = list(callout_keywords or [])
+        self.feed_interval = feed_interval
+        watch_feed = bool(self.feed_region and self.callout_keywords)
+
+        self.ocr: Optional[OCREngine] = None
+        if ca_source != CLIPBOARD or watch_feed:
+            self.ocr = ocr or OCREngine(tesseract_path, ocr_backend, ocr_workers)
+        self.ca_race = CARace()
+
+        # Optional recording of every ROI a snipe grabs (see _record_roi)
+        self.record_path = record_path
+        self.recorder: Optional[FrameRecorder] = None
 
         # State
         self.state = SniperState.STOPPED
-        self.bought_tokens: set = set()
+        # Bought mints (persistent when dedup_path is set)
+        self._owns_dedup = dedup is None
+        self.bought_tokens = dedup or DedupStore(dedup_path or ":memory:", ttl=dedup_ttl)
+
+        # One buy round per mint at a time (pending / succeeded / failed)
+        self.buys = SingleFlight(succeeded=lambda results: any(r.success for r in results))
+        self._buy_progress: Dict[str, BuyProgress] = {}
+
+        # Detection -> queue -> snipe workers, monitoring never stops.
+        # Only one snipe drives the mouse at a time (_ui_lock); buys overlap.
+        self.snipe_concurrency = max(1, snipe_concurrency)
+        self.event_holdoff = event_holdoff
+        self.event_preempt = event_preempt
+        self.events = EventQueue(event_policy, event_queue_size, event_max_age)
+        self._ui_lock: Optional[asyncio.Lock] = None
+        self._ui_busy = False
+        self._event_seq = 0
+        self._holdoff_until = 0.0
+
+        # Each snipe is a task going through the stages under their budgets;
+        # stop() and newer events cancel them at whatever await they are in
+        self.stages = StageRunner(stage_timeouts)
+        self._jobs: Dict[int, SnipeJob] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._main_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stop_requested = 0.0
         self._running = False
         self.base_pixel_color: Optional[Tuple[int, int, int]] = None
 
+        # Stage latency traces
+        self.tracer = TraceCollector()
+
         # Callbacks
         self.on_log: Optional[Callable[[str], None]] = None
         self.on_state_change: Optional[Callable[[SniperState], None]] = None
         self.on_ca_found: Optional[Callable[[str], None]] = None
         self.on_buy_result: Optional[Callable[[BuyResult], None]] = None
+        self.on_trace: Optional[Callable[[SnipeTrace], None]] = None
+
+    @staticmethod
+    def _make_locator(
+        name: str,
+        path: str,
+        anchor: Optional[List[int]],
+        expected: Tuple[int, int],
+        threshold: float,
+        margin: int,
+        levels: int
+    ) -> Optional[TemplateLocator]:
+        if not path:
+            return None
+        return TemplateLocator(name, load_signature(path), anchor=tuple(anchor) if anchor else None,
+                               expected=expected, threshold=threshold, levels=levels, margin=margin)
 
     def log(self, msg: str):
         """Emit log"""
@@ -139,32 +366,72 @@ class Sniper:
         if self.on_state_change:
             self.on_state_change(state)
 
-    async def buy_token(self, mint: str):
-        """Execute buys"""
-        if mint in self.bought_tokens:
+    async def buy_token(self, mint: str, trace: Optional[SnipeTrace] = None):
+        """Execute buys (concurrent calls for the same mint share one round)"""
+        if not self.buys.in_flight(mint) and not self.bought_tokens.add(mint):
             self.log(f"[SKIP] Token already bought: {mint}")
             return
 
-        self.bought_tokens.add(mint)
+        def joined(flight):
+            self.log(f"[JOIN] Buy already in flight for {mint} ({flight.joiners} waiting)")
+            if trace:
+                trace.mark("buy_joined")
+
+        return await self.buys.run(mint, lambda: self._buy_round(mint, trace), on_join=joined)
+
+    async def _buy_round(self, mint: str, trace: Optional[SnipeTrace]) -> List[BuyResult]:
+        """One full set of buy attempts for a mint"""
         self.set_state(SniperState.BUYING)
 
         self.log("=" * 50)
         self.log(f"CA DETECTED: {mint}")
-        self.log(f"BUYING: {self.num_attempts}x {self.buy_amount} SOL")
+        mode = f"{self.buy_concurrency} in parallel" if self.buy_concurrency > 1 else "sequential"
+        self.log(f"BUYING: {self.num_attempts}x {self.buy_amount} SOL ({mode})")
         self.log("=" * 50)
 
         if self.on_ca_found:
             self.on_ca_found(mint)
 
-        results = await self.api.buy_multiple(
-            mint=mint,
-            amount=self.buy_amount,
-            slippage=self.slippage,
-            priority_fee=self.priority_fee,
-            num_attempts=self.num_attempts,
-            delay_between=self.delay_between,
-            on_result=self._on_buy_result
-        )
+        progress = self._buy_progress[mint] = BuyProgress()
+
+        def answered(result: BuyResult):
+            progress.answered += 1
+            self._on_buy_result(result)
+            # Between attempts now: a token waiting for a worker may take this one
+            self._preempt()
+
+        try:
+            results = await self.api.buy_multiple(
+                mint=mint,
+                amount=self.buy_amount,
+                slippage=self.slippage,
+                priority_fee=self.priority_fee,
+                num_attempts=self.num_attempts,
+                delay_between=self.delay_between,
+                on_result=answered,
+                concurrency=self.buy_concurrency,
+                stagger=self.buy_stagger,
+                stop_after=self.buy_stop_after,
+                on_send=progress.sent.add
+            )
+        except asyncio.CancelledError:
+            # Nothing left the rate limiter: the token was never bought
+            if not progress.sent:
+                self.bought_tokens.discard(mint)
+                self.log(f"[*] Round for {mint} cancelled before any attempt was sent, not marked as bought")
+            raise
+        finally:
+            del self._buy_progress[mint]
+
+        if trace:
+            for r in results:
+                if r.sent_ns is not None:
+                    trace.mark(f"buy_{r.attempt}_sent", r.sent_ns)
+                    trace.mark(f"buy_{r.attempt}_answered", r.answered_ns)
+
+        limiter = self.api.rate_limiter
+        if limiter is not None and any(r.queued_ms for r in results):
+            self.log(f"[RATE] {limiter.summary()}")
 
         self.log("=" * 50)
         self.log("BUYS COMPLETED")
@@ -174,111 +441,685 @@ class Sniper:
 
     def _on_buy_result(self, result: BuyResult):
         """Buy result callback"""
+        via = f" via {result.endpoint}" if len(self.api.endpoints) > 1 else ""
         if result.success:
-            self.log(f"[{result.attempt}/{self.num_attempts}] OK - TX: {result.signature[:20]}...")
+            self.log(f"[{result.attempt}/{self.num_attempts}] OK - TX: {result.signature[:20]}...{via}")
         else:
-            self.log(f"[{result.attempt}/{self.num_attempts}] ERROR: {result.error}")
+            error_class = result.error_class or self.classifier.classify(result)
+            self.log(f"[{result.attempt}/{self.num_attempts}] ERROR ({error_class}): {result.error}{via}")
+            if result.action == ABORT:
+                self.log(f"[ABORT] {error_class} error, giving up on this token")
+            elif result.action == BACKOFF:
+                self.log(f"[BACKOFF] {error_class} error, slowing down retries")
+
+        self.breaker.record(result.error_class or self.classifier.classify(result))
 
         if self.on_buy_result:
             self.on_buy_result(result)
 
+    def _on_breaker_change(self, state: str, reason: str):
+        """Circuit breaker transitions"""
+        if state == CircuitBreaker.OPEN:
+            self.log(f"[PAUSED] Circuit open ({reason}): skipping snipes for {self.breaker.cooldown:.0f}s")
+            self.set_state(SniperState.PAUSED)
+        elif state == CircuitBreaker.HALF_OPEN:
+            self.log("[*] Circuit half-open: next snipe is a probe")
+        else:
+            self.log("[*] Circuit closed: sniping resumed")
+
     async def run(self):
         """Main loop"""
         self._running = True
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._main_task = asyncio.current_task()
         self.set_state(SniperState.MONITORING)
 
+        if self.record_path:
+            self.recorder = FrameRecorder(self.record_path, self._record_roi())
+
+        self.capture.open()
+        self.scheduler.start()
+        if self.capture_thread:
+            self.capture_thread.recorder = self.recorder
+            self.capture_thread.start()
+        try:
+            warm_ms = await self.api.start()
+            if warm_ms is None:
+                self.log("[!] API warm-up failed (will connect on first buy)")
+            else:
+                self.log(f"[*] API connection warmed in {warm_ms:.0f}ms")
+            await self._start_ocr()
+            await self._relocate(self.view_coin_locator)
+            await self._relocate(self.ca_locator)
+            await self._run_pipeline()
+        except asyncio.CancelledError:
+            # stop() cancels this task; any other cancellation is the caller's
+            if not self._stopping:
+                raise
+        finally:
+            self._main_task = None
+            for task in list(self._searches.values()):
+                task.cancel()
+            await self.api.close()
+            if self.ocr:
+                self.ocr.close()
+            if self.capture_thread:
+                self.capture_thread.stop()
+            self.scheduler.stop()
+            self.capture.close()
+            if self.recorder:
+                self.recorder.close()
+                self.log(f"[*] Recorded {self.recorder.frames} frames to {self.record_path}")
+            if self._owns_dedup:
+                self.bought_tokens.close()
+
+        if self._stopping:
+            self.log(f"[*] Stopped {(time.perf_counter() - self._stop_requested) * 1000:.0f}ms after the request")
+        self.set_state(SniperState.STOPPED)
+
+    async def _start_ocr(self):
+        """Warm the OCR workers (falls back to clipboard only if OCR is unavailable)"""
+        if not self.ocr:
+            return
+        try:
+            service = await asyncio.get_running_loop().run_in_executor(None, self.ocr.get_service)
+            if service.name in ("cli", "pytesseract") and not self.ocr.is_tesseract_installed():
+                raise RuntimeError(f"Tesseract not found at {self.ocr.tesseract_path}")
+            self.log(f"[*] OCR ready ({service.name}, {service.workers} workers)")
+        except Exception as e:
+            self.ocr.close()
+            self.ocr = None
+            if self.ca_source == OCR:
+                raise RuntimeError(f"OCR unavailable: {e}")
+            self.log(f"[!] OCR unavailable ({e}), CA from clipboard only")
+
+    async def _next_frame(self) -> Optional[Tuple[np.ndarray, int]]:
+        """Next ROI frame and its capture time (perf_counter_ns)
+
+        Returns None once a finite capture source (replay) is exhausted.
+        """
+        if self.capture_thread:
+            if self.capture.exhausted and not self.capture_thread.is_alive():
+                item = self.capture_thread.latest()
+                if item is None:
+                    return None
+            else:
+                try:
+                    item = await asyncio.wait_for(self.capture_thread.next_frame(), 1.0)
+                except asyncio.TimeoutError:
+                    if self.capture.exhausted:
+                        return None
+                    raise RuntimeError(f"No frames from capture thread ({self.capture_thread.last_error})")
+            _, ts, frame = item
+            return frame, ts
+
+        if self.capture.exhausted:
+            return None
+        await self.scheduler.wait()
+        self.capture.advance()
+        frame = self.detector.grab(self.capture)
+        ts = time.perf_counter_ns()
+        if self.recorder:
+            self.recorder.grab(self.capture, ts)
+        return frame, ts
+
+    def _record_roi(self) -> Tuple[int, int, int, int]:
+        """Everything a snipe grabs: detector, readiness boxes, CA OCR box, feed and locator ROIs
+
+        A recording of this box replays a whole session, not just the detections.
+        """
+        locators = [loc.track_roi() for loc in (self.view_coin_locator, self.ca_locator) if loc is not None]
+        left, top, width, height = union_roi([
+            self.detector.roi, self.view_coin_probe.roi, self.ca_probe.roi,
+            self.ca_ocr_roi, self.feed_region, *locators
+        ])
+        # Boxes hanging off the screen (a wide CA OCR box) are cut at its edge
+        sx, sy, sw, sh = self.capture.screen_region()
+        right, bottom = min(left + width, sx + sw), min(top + height, sy + sh)
+        left, top = max(left, sx), max(top, sy)
+        return (left, top, right - left, bottom - top)
+
+    async def _relocate(self, locator: Optional[TemplateLocator], search: bool = True) -> Optional[Location]:
+        """Find a template near its last position and follow it
+
+        With search=False (inside a snipe stage) only the small ROI around
+        the last hit is matched; if the template left it, the full-screen
+        search runs in the background and the next snipe tracks from there.
+        """
+        if locator is None:
+            return None
+        try:
+            loc = await asyncio.get_running_loop().run_in_executor(
+                None, locator.locate, self.capture, None, search
+            )
+        except Exception as e:
+            self.log(f"[LOCATE] {locator.name} error: {e}")
+            return None
+        if loc is None:
+            if search:
+                self.log(f"[LOCATE] {locator.name} not found, keeping calibrated position")
+            else:
+                self.log(f"[LOCATE] {locator.name} lost, keeping the last position and searching in the background")
+                self._search_later(locator)
+            return None
+
+        if locator is self.view_coin_locator:
+            dx, dy = loc.x - self.view_coin_x, loc.y - self.view_coin_y
+            if dx or dy:
+                self._move_view_coin(dx, dy)
+        else:
+            dx, dy = loc.x - self.ca_area_x, loc.y - self.ca_area_y
+            if dx or dy:
+                self._move_ca_area(dx, dy)
+        if dx or dy:
+            self.log(f"[LOCATE] {locator.name} moved by ({dx:+d}, {dy:+d}) -> ({loc.x}, {loc.y}) "
+                     f"[{loc.mode}, score {loc.score:.2f}, {loc.ms:.1f}ms]")
+        return loc
+
+    def _search_later(self, locator: TemplateLocator):
+        """Full-screen search outside the snipe (one at a time per locator)"""
+        if locator.name in self._searches:
+            return
+        task = asyncio.ensure_future(self._background_search(locator))
+        self._searches[locator.name] = task
+        task.add_done_callback(lambda _: self._searches.pop(locator.name, None))
+
+    async def _background_search(self, locator: TemplateLocator):
+        try:
+            loc = await asyncio.get_running_loop().run_in_executor(None, locator.search, self.capture)
+        except Exception as e:
+            self.log(f"[LOCATE] {locator.name} search error: {e}")
+            return
+        if loc is None:
+            self.log(f"[LOCATE] {locator.name} not found on screen")
+        else:
+            # locator.last now points there; the next snipe's track() applies the move
+            self.log(f"[LOCATE] {locator.name} found at ({loc.x}, {loc.y}) [{loc.ms:.1f}ms], used from the next snipe")
+
+    def _move_view_coin(self, dx: int, dy: int):
+        """Shift the View Coin click point and everything watching it"""
+        self.view_coin_x += dx
+        self.view_coin_y += dy
+        self.detector.shift(dx, dy)
+        self.view_coin_probe.shift(dx, dy)
+        if self.capture_thread:
+            self.capture_thread.move(self.detector.left, self.detector.top)
+        self._watch_moved = True
+
+    def _move_ca_area(self, dx: int, dy: int):
+        """Shift the CA click point, its readiness probe and OCR box"""
+        self.ca_area_x += dx
+        self.ca_area_y += dy
+        self.ca_probe.shift(dx, dy)
+        left, top, width, height = self.ca_ocr_roi
+        self.ca_ocr_roi = (max(0, left + dx), max(0, top + dy), width, height)
+
+    async def _rebase(self):
+        """Take a new detector baseline"""
+        if self._watch_moved and self.capture_thread:
+            # Up to two queued / in-flight frames still show the old spot
+            for _ in range(2):
+                if await self._next_frame() is None:
+                    break
+        self._watch_moved = False
+        item = await self._next_frame()
+        if item is None:
+            raise RuntimeError("Capture source has no frames")
+        baseline = self.detector.rebase_frame(item[0])
+        self.base_pixel_color = tuple(int(c) for c in baseline[0])
+
+    async def _run_pipeline(self):
+        """Monitor loop plus snipe workers"""
+        self._ui_lock = asyncio.Lock()
+        self.events = EventQueue(self.events.policy, self.events.maxsize, self.events.max_age)
+        workers = [asyncio.ensure_future(self._snipe_worker()) for _ in range(self.snipe_concurrency)]
+        feed = asyncio.ensure_future(self._watch_feed())
+        try:
+            await self._monitor()
+        finally:
+            feed.cancel()
+            # Drop the queued events; snipes in flight finish unless stopping
+            self.events.close()
+            if self._stopping:
+                for job in list(self._jobs.values()):
+                    job.cancel("stopped")
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _snipe_worker(self):
+        """Take detection events and snipe them until the queue closes"""
+        while True:
+            event = await self.events.get()
+            if event is None:
+                return
+            job = SnipeJob(event)
+            job.task = asyncio.ensure_future(self._snipe(job))
+            self._jobs[event.seq] = job
+            try:
+                await job.task
+            except asyncio.CancelledError:
+                # The snipe was cancelled (stop / preempted), not this worker
+                if not job.task.done():
+                    raise
+            except Exception as e:
+                self.log(f"[ERROR] Snipe #{event.seq} failed: {e}")
+            finally:
+                del self._jobs[event.seq]
+                if not self._jobs and self._running:
+                    if self.breaker.state == CircuitBreaker.OPEN:
+                        self.set_state(SniperState.PAUSED)
+                    else:
+                        self.log("[*] Returning to monitoring...")
+                        self.set_state(SniperState.MONITORING)
+
+    async def _snipe(self, job: SnipeJob):
+        """Run one snipe stage by stage; only the UI stages hold the mouse"""
+        event = job.event
+        trace = event.trace
+        trace.mark("dequeued")
+        try:
+            if event.ca:
+                # Callout from the feed: the CA is known, no clicks needed
+                trace.info["ca_source"] = "feed"
+                job.mint = event.ca
+                await self.stages.run(job, BUY, self.buy_token(event.ca, trace))
+                return
+            async with self._ui_lock:
+                # The screen may have moved on while another snipe held it
+                if self.events.drop_if_stale(event):
+                    self.log(f"[DROP] Event #{event.seq} stale ({event.age * 1000:.0f}ms old)")
+                    trace.info["dropped"] = "stale"
+                    return
+                self._ui_busy = True
+                try:
+                    await self.stages.run(job, OPEN, self._open(trace))
+                    await self.stages.run(job, READY, self._wait_ready(trace))
+                    ca = await self.stages.run(job, ACQUIRE, self._read_ca(trace))
+                finally:
+                    self._ui_busy = False
+            if ca:
+                job.mint = ca
+                await self.stages.run(job, BUY, self.buy_token(ca, trace))
+        except StageTimeout as e:
+            self.log(f"[TIMEOUT] Snipe #{event.seq}: {e}")
+            trace.info["timeout"] = e.stage
+            self._cancel_round(job)
+        except asyncio.CancelledError:
+            self._cancel_round(job)
+            reason = job.reason or "cancelled"
+            self.log(f"[CANCEL] Snipe #{event.seq} {reason} during {job.stage}")
+            trace.info["cancelled"] = f"{job.stage}: {reason}"
+            raise
+        finally:
+            self._finish_trace(trace)
+
+    async def _watch_feed(self):
+        """Read new feed lines with OCR and queue a buy for each callout with a CA
+
+        The CA has to come out the same from a second read of its band with
+        the Otsu threshold, and the circuit breaker has to let it through.
+        Only row bands that weren't on screen before are recognized
+        (OCREngine.extract_new_lines), so a quiet feed costs a split and a
+        hash per poll, not an OCR of the whole region.
+        """
+        if not (self.feed_region and self.callout_keywords):
+            return
+        if not self.ocr:
+            self.log("[!] Callout watch off: OCR unavailable")
+            return
+        try:
+            # What is already on the feed is not a new callout
+            self.ocr.prime_lines(self.capture.grab(*self.feed_region).copy(), crop_top_only=False)
+        except Exception as e:
+            self.log(f"[!] Callout watch off: {e}")
+            return
+        # Build the keyword automaton off the event loop (long lists take tens of ms)
+        await self.ocr.callouts.reload(self.callout_keywords)
+        self.log(
+            f"[*] Watching the feed at {self.feed_region} for {len(self.callout_keywords)} callout keywords "
+            f"(matcher built in {self.ocr.callouts.build_ms:.1f}ms)"
+        )
+
+        while True:
+            await asyncio.sleep(self.feed_interval)
+            try:
+                frame = self.capture.grab(*self.feed_region).copy()
+                frame_ts = time.perf_counter_ns()
+                lines = await self.ocr.extract_new_lines_async(frame, crop_top_only=False)
+            except Exception as e:
+                self.log(f"[FEED] {e}")
+                continue
+            if not lines:
+                continue
+            text = "\n".join(lines)
+            if not self.ocr.find_callout(text):
+                continue
+            # A callout buys without a human in the loop: always check the
+            # curve and confirm with a second read, as _ca_from_ocr does
+            ca = self.ocr.extract_ca(text, self.ca_require_pump, check_curve=True)
+            if ca is None:
+                self.log(f"[CALLOUT] No valid CA in: {text!r}")
+                continue
+            try:
+                again = await self.ocr.reread_lines_async(frame, ca, threshold=OCR_THRESHOLDS[1])
+            except Exception as e:
+                self.log(f"[FEED] {e}")
+                continue
+            confirmed = extract_ca(again, self.ca_require_pump, check_curve=True)
+            if confirmed != ca:
+                self.log(f"[CALLOUT] OCR reads disagree: {ca} / {confirmed}, skipped")
+                continue
+            if not self.breaker.allow():
+                self.log(
+                    f"[PAUSED] Callout {ca} ignored, circuit open ({self.breaker.reason}), "
+                    f"{self.breaker.remaining:.0f}s left"
+                )
+                continue
+
+            trace = self.tracer.start(frame_ts)
+            trace.mark("detected")
+            self._event_seq += 1
+            event = DetectionEvent(self._event_seq, frame_ts, 0, trace, ca=ca)
+            self.log(f"[CALLOUT] Event #{event.seq}: {ca}")
+            dropped = self.events.put(event)
+            if dropped is not None:
+                self.log(f"[DROP] Event #{dropped.seq} overflowed the queue")
+            self._preempt(event)
+
+    async def set_callout_keywords(self, keywords: List[str]):
+        """Swap the callout keywords of a running feed watch
+
+        The new automaton is built on a worker thread; feed polls keep
+        matching the old list until it is installed.
+        """
+        if self.ocr:
+            await self.ocr.callouts.reload(keywords)
+        self.callout_keywords = list(keywords)
+
+    def _cancel_round(self, job: SnipeJob):
+        """The buy round runs apart from its callers: stop it with the snipe"""
+        if job.stage == BUY and job.mint:
+            self.buys.cancel(job.mint)
+
+    def _preempt(self, event: Optional[DetectionEvent] = None):
+        """Make room for a newer event (latest policy; default: the newest waiting one)
+
+        A snipe still waiting for the mouse is superseded outright. With
+        event_preempt, if every worker is busy buying, the oldest buy round
+        that is between attempts (one answered, none on the wire) gives up
+        its remaining retries.
+        """
+        if self.events.policy != LATEST:
+            return
+        event = event or self.events.newest()
+        if event is None:
+            return
+        jobs = sorted(self._jobs.values(), key=lambda j: j.event.seq)
+        for job in jobs:
+            if job.stage == QUEUED and job.event.seq < event.seq and job.cancel(f"superseded by #{event.seq}"):
+                self.events.supersede(job.event)
+                return
+        if not self.event_preempt or len(jobs) < self.snipe_concurrency:
+            return
+        for job in jobs:
+            progress = self._buy_progress.get(job.mint) if job.stage == BUY else None
+            if progress and progress.between_attempts and job.cancel(f"preempted by #{event.seq}"):
+                return
+
+    async def _open(self, trace: SnipeTrace):
+        """Open stage: wait for View Coin to settle and click it"""
+        self.set_state(SniperState.CLICKING_VIEW_COIN)
+
+        # Wait for the View Coin button to settle (max view_coin_delay)
+        self.view_coin_probe.arm(self.capture)
+        waited = await self.view_coin_probe.wait(self.capture, self.view_coin_delay, self.ready_poll_interval)
+        self.log(f"[*] View Coin {self._ready_text(waited, self.view_coin_delay)}")
+        trace.mark("view_coin_ready")
+
+        # Follow the button if the page moved
+        if await self._relocate(self.view_coin_locator, search=False):
+            trace.mark("view_coin_located")
+
+        # Click View Coin
+        self.ca_probe.arm(self.capture)
+        self.log(f"[*] Clicking View Coin ({self.view_coin_x}, {self.view_coin_y})")
+        windows_click(self.view_coin_x, self.view_coin_y)
+        trace.mark("view_coin_clicked")
+
+    async def _wait_ready(self, trace: SnipeTrace):
+        """Ready stage: wait for the chart / CA field"""
+        # Wait for the chart / CA field (max chart_load_time)
+        self.set_state(SniperState.WAITING_CHART)
+        waited = await self.ca_probe.wait(self.capture, self.chart_load_time, self.ready_poll_interval)
+        self.log(f"[*] Chart {self._ready_text(waited, self.chart_load_time)}")
+        trace.mark("chart_ready")
+
+        if await self._relocate(self.ca_locator, search=False):
+            trace.mark("ca_located")
+
+    async def _read_ca(self, trace: SnipeTrace) -> Optional[str]:
+        """Acquire stage: copy and/or OCR the CA"""
+        # Copy and/or OCR the CA, first valid one wins
+        self.set_state(SniperState.COPYING_CA)
+        sources = {}
+        if self.ca_source != OCR:
+            sources[CLIPBOARD] = lambda: self._ca_from_clipboard(trace)
+        if self.ocr and self.ca_source != CLIPBOARD:
+            sources[OCR] = lambda: self._ca_from_ocr(trace)
+
+        winner, ca, elapsed = await self.ca_race.run(sources)
+        if ca is None:
+            self.log(f"[!] No valid CA found ({elapsed * 1000:.0f}ms)")
+            return None
+
+        trace.mark("ca_validated")
+        trace.info["ca"] = ca
+        trace.info["ca_source"] = winner
+        self.log(f"[+] CA found via {winner} in {elapsed * 1000:.0f}ms: {ca}")
+        if len(sources) > 1:
+            self.log(f"[CA] {self.ca_race.summary()}")
+        return ca
+
+    async def _ca_from_clipboard(self, trace: SnipeTrace) -> Optional[str]:
+        """Click up to 3x on the CA and validate what lands in the clipboard"""
+        # Clear clipboard before copying
+        self.clipboard.clear()
+        self.log(f"[*] Clicking up to 3x on CA ({self.ca_area_x}, {self.ca_area_y})")
+
+        for i in range(3):
+            seq = self.clipboard.sequence()
+            windows_click(self.ca_area_x, self.ca_area_y)
+            trace.mark(f"ca_click_{i + 1}")
+            self.log(f"    Click {i+1}/3")
+
+            # React as soon as the clipboard changes (max ca_copy_timeout)
+            clipboard = await self.clipboard.wait_for_change(self.ca_copy_timeout, since=seq)
+            trace.mark(f"clipboard_read_{i + 1}")
+
+            if clipboard:
+                ca = extract_ca(clipboard, self.ca_require_pump, self.ca_check_curve)
+                if ca:
+                    return ca
+                self.log(f"    No valid CA in clipboard: {clipboard[:60]!r}")
+        return None
+
+    async def _ca_from_ocr(self, trace: SnipeTrace) -> Optional[str]:
+        """OCR the CA field until two reads in a row agree (same budget as the clipboard)
+
+        OCR can swap one base58 character for another (l/I/1, O/0) and about
+        half of those swaps still land on the curve, so one read never wins.
+        Reads alternate between a fixed and an Otsu threshold: a static field
+        still gets two different binarizations, not the same cached read twice.
+        """
+        deadline = time.perf_counter() + 3 * self.ca_copy_timeout
+        reads = 0
+        last: Optional[str] = None
+        while True:
+            try:
+                img = self.capture.grab(*self.ca_ocr_roi)
+                threshold = OCR_THRESHOLDS[reads % len(OCR_THRESHOLDS)]
+                text = await self.ocr.extract_text_async(img, crop_top_only=False, threshold=threshold)
+            except Exception as e:
+                self.log(f"    OCR error: {e}")
+                return None
+            reads += 1
+            trace.mark(f"ca_ocr_{reads}")
+
+            ca = extract_ca(text, self.ca_require_pump, check_curve=True)
+            if ca and ca == last:
+                return ca
+            if ca and last:
+                self.log(f"    OCR reads disagree: {last} / {ca}")
+            last = ca
+            now = time.perf_counter()
+            if now >= deadline:
+                self.log(f"    OCR found no valid CA ({reads} reads): {text.strip()[:60]!r}")
+                return None
+            await asyncio.sleep(min(self.ca_ocr_interval, deadline - now))
+
+    @staticmethod
+    def _ready_text(waited: Optional[float], timeout: float) -> str:
+        if waited is None:
+            return f"not detected, timeout {timeout:.1f}s"
+        return f"ready in {waited * 1000:.0f}ms"
+
+    def _finish_trace(self, trace: SnipeTrace):
+        """Store the trace and report it"""
+        trace.mark("done")
+        self.tracer.finish(trace)
+        stages = " | ".join(f"{stage} {ms:.0f}" for stage, ms in trace.since_start_ms().items())
+        self.log(f"[TRACE #{trace.trace_id}] {trace.total_ms:.0f}ms: {stages}")
+        if self.on_trace:
+            self.on_trace(trace)
+
+    async def _monitor(self):
+        """Pixel monitoring loop"""
         # Capture base pixel color
-        self.base_pixel_color = get_pixel_color(self.view_coin_x, self.view_coin_y)
+        await self._rebase()
 
         self.log("=" * 50)
         self.log("SNIPER STARTED")
         self.log(f"View Coin: ({self.view_coin_x}, {self.view_coin_y})")
         self.log(f"CA Area: ({self.ca_area_x}, {self.ca_area_y})")
         self.log(f"Base pixel: RGB{self.base_pixel_color}")
+        self.log(f"Capture: {self.capture.name}{' (thread)' if self.capture_thread else ''}")
+        self.log(f"Clipboard: {self.clipboard.name}")
+        self.log(f"CA source: {self.ca_source if self.ocr else CLIPBOARD}")
+        self.log(f"Probes: {len(self.detector.probes)} (trigger on {self.detector.min_votes})")
+        if self.ca_probe.mode != "signature":
+            self.log("[!] No CA signature (ca_signature_path): chart readiness only waits for the CA area "
+                     "to stop changing, save a reference crop for a reliable check")
+        self.log(f"Scan interval: {self.scheduler.interval * 1000:.0f}ms (burst {self.scheduler.burst_interval * 1000:.0f}ms)")
         self.log(f"Config: {self.num_attempts}x {self.buy_amount} SOL")
+        self.log(f"Pipeline: {self.snipe_concurrency} snipes in flight, {self.events.policy} events "
+                 f"(max age {self.events.max_age:.1f}s)")
+        self.log("Stage budgets: " + ", ".join(
+            f"{stage} {self.stages.timeouts[stage]:.1f}s" if self.stages.timeouts[stage] > 0 else f"{stage} -"
+            for stage in STAGES
+        ))
         self.log("=" * 50)
         self.log("Monitoring pixel change...")
 
         # Clear clipboard before starting
-        clear_clipboard()
+        self.clipboard.clear()
 
         scan_count = 0
 
         while self._running:
             try:
+                # Wait for the next frame (scan deadline)
+                item = await self._next_frame()
+                if item is None:
+                    self.log("[*] Capture source finished")
+                    self._running = False
+                    break
+                frame, frame_ts = item
                 scan_count += 1
 
-                # Capture current pixel color
-                current_color = get_pixel_color(self.view_coin_x, self.view_coin_y)
+                # Our own clicks, or the last notification still animating:
+                # follow the screen instead of voting
+                if self._ui_busy or time.perf_counter() < self._holdoff_until:
+                    self.detector.rebase_frame(frame)
+                    continue
+
+                # Vote over the probes
+                detection = self.detector.check_frame(frame)
+                current_color = tuple(int(c) for c in detection.colors[0])
 
                 # Check if changed
-                if colors_different(self.base_pixel_color, current_color, tolerance=15):
-                    self.log(f"[!] PIXEL CHANGED! {self.base_pixel_color} -> {current_color}")
-                    self.set_state(SniperState.CLICKING_VIEW_COIN)
-
-                    # Wait 0.4s before clicking
-                    self.log("[*] Waiting 0.4s...")
-                    await asyncio.sleep(0.4)
-
-                    # Click View Coin
-                    self.log(f"[*] Clicking View Coin ({self.view_coin_x}, {self.view_coin_y})")
-                    windows_click(self.view_coin_x, self.view_coin_y)
-
-                    # Wait 2.5s for chart to load
-                    self.set_state(SniperState.WAITING_CHART)
-                    self.log("[*] Waiting 2.5s for chart to load...")
-                    await asyncio.sleep(2.5)
-
-                    # Clear clipboard before copying
-                    clear_clipboard()
-
-                    # Click 3x on CA with 1s interval
-                    self.set_state(SniperState.COPYING_CA)
-                    self.log(f"[*] Clicking 3x on CA ({self.ca_area_x}, {self.ca_area_y})")
-
-                    for i in range(3):
-                        windows_click(self.ca_area_x, self.ca_area_y)
-                        self.log(f"    Click {i+1}/3")
-
-                        # Check clipboard after each click
-                        await asyncio.sleep(0.3)
-                        clipboard = get_clipboard()
-
-                        if clipboard:
-                            ca_match = CA_PATTERN.search(clipboard)
-                            if ca_match:
-                                ca = ca_match.group()
-                                if 32 <= len(ca) <= 44:
-                                    self.log(f"[+] CA found: {ca}")
-                                    await self.buy_token(ca)
-                                    break
-
-                        if i < 2:
-                            await asyncio.sleep(0.7)  # Complete 1s
-
-                    # Update base color for next detection
-                    self.base_pixel_color = get_pixel_color(self.view_coin_x, self.view_coin_y)
-                    self.log(f"[*] New base color: RGB{self.base_pixel_color}")
-                    self.log("[*] Returning to monitoring...")
-                    self.set_state(SniperState.MONITORING)
+                if detection.changed and not self.breaker.allow():
+                    self.log(
+                        f"[PAUSED] Change ignored, circuit open ({self.breaker.reason}), "
+                        f"{self.breaker.remaining:.0f}s left"
+                    )
+                    await self._rebase()
+
+                elif detection.changed:
+                    if self.state == SniperState.PAUSED:
+                        self.set_state(SniperState.MONITORING)
+                    self.log(
+                        f"[!] PIXEL CHANGED! {self.base_pixel_color} -> {current_color} "
+                        f"({detection.votes}/{len(self.detector.probes)} probes, "
+                        f"frame age {(time.perf_counter_ns() - frame_ts) / 1e6:.1f}ms)"
+                    )
+                    trace = self.tracer.start(frame_ts)
+                    trace.mark("detected")
+                    self._event_seq += 1
+                    event = DetectionEvent(self._event_seq, frame_ts, detection.votes, trace)
+                    dropped = self.events.put(event)
+                    if dropped is not None:
+                        self.log(f"[DROP] Event #{dropped.seq} overflowed the queue")
+                    self._preempt(event)
+                    if self._ui_busy or len(self._jobs) >= self.snipe_concurrency:
+                        self.log(f"[QUEUE] Event #{event.seq} waiting ({len(self.events)} queued)")
+
+                    # Watch for the next notification from here on
+                    self.detector.rebase_frame(frame)
+                    self.base_pixel_color = current_color
+                    self._holdoff_until = time.perf_counter() + self.event_holdoff
+
+                elif detection.votes:
+                    # Some probes moved, scan faster until it settles
+                    self.scheduler.burst()
 
                 # Periodic log
                 if scan_count % 100 == 0:
-                    self.log(f"[SCAN #{scan_count}] Pixel: RGB{current_color}")
-
-                # Interval between scans (very fast)
-                await asyncio.sleep(0.05)  # 50ms = 20 scans/sec
+                    self.log(f"[SCAN #{scan_count}] Pixel: RGB{current_color} | {self.scheduler.summary()}")
+                    if self.capture_thread:
+                        stats = self.capture_thread.stats()
+                        self.log(f"    Frames: {stats['captured']} captured, {stats['dropped']} dropped, {stats['errors']} errors")
+                    if self.events.queued:
+                        self.log(f"    Events: {self.events.summary()}")
+                        self.log(f"    Stages: {self.stages.summary()}")
 
             except Exception as e:
                 self.log(f"[ERROR] {e}")
                 await asyncio.sleep(0.5)
-
-        self.set_state(SniperState.STOPPED)
+                if not self.capture_thread:
+                    self.scheduler.reset()
 
     def stop(self):
-        """Stop the sniper"""
+        """Stop the sniper (safe from any thread)
+
+        Cancels the main task, which stops the monitor and every snipe in
+        flight at its current await instead of letting the stages run out.
+        """
         self._running = False
+        if self._stopping:
+            return
+        self._stopping = True
+        self._stop_requested = time.perf_counter()
         self.log("[!] Stopping sniper...")
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._cancel_main)
+            except RuntimeError:
+                pass  # loop closed in between
+
+    def _cancel_main(self):
+        if self._main_task is not None:
+            self._main_task.cancel()
 
     def is_running(self) -> bool:
         """Check if running"""
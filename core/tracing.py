@@ -0,0 +1,115 @@
+"""
+Per-snipe stage latency tracing
+One trace per snipe with perf_counter_ns marks, aggregated to percentiles
+"""
+import json
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class SnipeTrace:
+    """Monotonic timestamps of every stage of one snipe"""
+
+    def __init__(self, trace_id: int, start_ns: Optional[int] = None):
+        self.trace_id = trace_id
+        self.start_ns = start_ns if start_ns is not None else time.perf_counter_ns()
+        self.wall_time = time.time()
+        self.marks: List[Tuple[str, int]] = []
+        self.info: Dict[str, str] = {}
+
+    def mark(self, stage: str, ns: Optional[int] = None) -> int:
+        """Record a stage at `ns` (default: now)"""
+        if ns is None:
+            ns = time.perf_counter_ns()
+        self.marks.append((stage, ns))
+        return ns
+
+    def since_start_ms(self) -> "OrderedDict[str, float]":
+        """Milliseconds from the trace start to each stage (first mark wins)"""
+        out: "OrderedDict[str, float]" = OrderedDict()
+        for stage, ns in sorted(self.marks, key=lambda m: m[1]):
+            if stage not in out:
+                out[stage] = (ns - self.start_ns) / 1e6
+        return out
+
+    def stage_ms(self) -> "OrderedDict[str, float]":
+        """Milliseconds spent reaching each stage from the previous one"""
+        out: "OrderedDict[str, float]" = OrderedDict()
+        prev = self.start_ns
+        for stage, ns in sorted(self.marks, key=lambda m: m[1]):
+            if stage not in out:
+                out[stage] = (ns - prev) / 1e6
+            prev = ns
+        return out
+
+    @property
+    def total_ms(self) -> float:
+        if not self.marks:
+            return 0.0
+        return (max(ns for _, ns in self.marks) - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.trace_id,
+            "wall_time": self.wall_time,
+            "info": self.info,
+            "total_ms": self.total_ms,
+            "since_start_ms": self.since_start_ms(),
+            "stage_ms": self.stage_ms(),
+        }
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    n = len(ordered)
+
+    def pick(pct: float) -> float:
+        return ordered[min(n - 1, max(0, int(round(pct / 100.0 * n + 0.5)) - 1))]
+
+    return {"count": n, "p50": pick(50), "p90": pick(90), "p99": pick(99), "max": ordered[-1]}
+
+
+class TraceCollector:
+    """Keeps the last N snipe traces and aggregates them per stage"""
+
+    def __init__(self, max_traces: int = 1000):
+        self.traces: Deque[SnipeTrace] = deque(maxlen=max_traces)
+        self._next_id = 1
+
+    def start(self, start_ns: Optional[int] = None) -> SnipeTrace:
+        """Begin a trace (start_ns = frame capture time when known)"""
+        trace = SnipeTrace(self._next_id, start_ns)
+        self._next_id += 1
+        return trace
+
+    def finish(self, trace: SnipeTrace):
+        """Store a completed trace"""
+        self.traces.append(trace)
+
+    def summary(self, relative_to_start: bool = True) -> "OrderedDict[str, Dict[str, float]]":
+        """p50/p90/p99 per stage (since trace start, or since previous stage)"""
+        samples: "OrderedDict[str, List[float]]" = OrderedDict()
+        for trace in list(self.traces):
+            values = trace.since_start_ms() if relative_to_start else trace.stage_ms()
+            for stage, ms in values.items():
+                samples.setdefault(stage, []).append(ms)
+        return OrderedDict((stage, _percentiles(v)) for stage, v in samples.items())
+
+    def format_summary(self, relative_to_start: bool = True) -> str:
+        """Text table of the summary"""
+        lines = [f"{'stage':<22}{'n':>5}{'p50':>9}{'p90':>9}{'p99':>9}"]
+        for stage, s in self.summary(relative_to_start).items():
+            lines.append(f"{stage:<22}{s['count']:>5}{s['p50']:>9.1f}{s['p90']:>9.1f}{s['p99']:>9.1f}")
+        return "\n".join(lines)
+
+    def export(self, path: str):
+        """Write traces and aggregates as JSON"""
+        data = {
+            "exported_at": time.time(),
+            "summary_since_start_ms": self.summary(True),
+            "summary_stage_ms": self.summary(False),
+            "traces": [t.to_dict() for t in list(self.traces)],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
@@ -7,7 +7,17 @@ from typing import Optional, Callable
 import ctypes
 import time
 
-from config.settings import Settings
+from config.settings import Settings, get_data_path
+from core.capture import create_capture_backend
+from core.locator import template_crop
+from core.readiness import save_signature
+
+
+# Template crop sizes (w, h) around the calibrated point (shifted inward at screen edges)
+TEMPLATE_SIZES = {
+    "view_coin": (120, 40),
+    "ca_area": (240, 30),
+}
 
 
 def windows_click(x: int, y: int):
@@ -208,6 +218,14 @@ class CoordinatesTab(ctk.CTkFrame):
         )
         self.vc_test_btn.pack(side="left", padx=5)
 
+        self.vc_template_btn = ctk.CTkButton(
+            vc_btns,
+            text="Save Template",
+            command=lambda: self._save_template("view_coin"),
+            width=120
+        )
+        self.vc_template_btn.pack(side="left", padx=5)
+
         # === CA Area ===
         ca_frame = ctk.CTkFrame(main_frame)
         ca_frame.pack(fill="x", padx=10, pady=15)
@@ -256,6 +274,14 @@ class CoordinatesTab(ctk.CTkFrame):
         )
         self.ca_test_btn.pack(side="left", padx=5)
 
+        self.ca_template_btn = ctk.CTkButton(
+            ca_btns,
+            text="Save Template",
+            command=lambda: self._save_template("ca_area"),
+            width=120
+        )
+        self.ca_template_btn.pack(side="left", padx=5)
+
         # === Status and Save ===
         bottom_frame = ctk.CTkFrame(self, fg_color="transparent")
         bottom_frame.pack(fill="x", padx=20, pady=10)
@@ -381,6 +407,46 @@ class CoordinatesTab(ctk.CTkFrame):
             text_color="green"
         ))
 
+    def _save_template(self, mode: str):
+        """Save a crop around the point so the sniper can find it if the page moves"""
+        try:
+            if mode == "view_coin":
+                x, y = int(self.vc_x_entry.get()), int(self.vc_y_entry.get())
+            else:
+                x, y = int(self.ca_x_entry.get()), int(self.ca_y_entry.get())
+        except ValueError:
+            self.status_label.configure(text="Error: invalid coordinates", text_color="red")
+            return
+
+        self.status_label.configure(text="Capturing template...", text_color="orange")
+        self.update()
+
+        # Minimize so the window isn't in the crop
+        self.winfo_toplevel().iconify()
+        self.after(300, lambda: self._do_save_template(mode, x, y))
+
+    def _do_save_template(self, mode: str, x: int, y: int):
+        """Capture and store the template crop"""
+        name = f"{mode}_template.png"
+        try:
+            with create_capture_backend(self.settings.capture_backend) as capture:
+                roi, anchor = template_crop((x, y), TEMPLATE_SIZES[mode], capture.screen_region())
+                save_signature(capture, roi, get_data_path(name))
+            if mode == "view_coin":
+                self.settings.view_coin_template = name
+                self.settings.view_coin_anchor = list(anchor)
+            else:
+                self.settings.ca_template = name
+                self.settings.ca_anchor = list(anchor)
+            self.settings.save()
+            status, color = f"Template saved: {name}", "green"
+        except Exception as e:
+            status, color = f"Error saving template: {e}", "red"
+
+        self.after(100, lambda: self.winfo_toplevel().deiconify())
+        self.after(150, lambda: self.winfo_toplevel().lift())
+        self.after(150, lambda: self.status_label.configure(text=status, text_color=color))
+
     def _save(self):
         """Save coordinates"""
         try:
@@ -4,10 +4,11 @@ Bot monitoring tab
 import customtkinter as ctk
 import asyncio
 import threading
+from tkinter import filedialog
 from typing import Optional
 from datetime import datetime
 
-from config.settings import Settings
+from config.settings import Settings, get_data_path
 from core.sniper import Sniper, SniperState
 
 
@@ -105,6 +106,31 @@ class MonitorTab(ctk.CTkFrame):
         )
         self.stop_btn.pack(side="left", padx=5)
 
+        # Latency Frame
+        latency_frame = ctk.CTkFrame(self)
+        latency_frame.pack(fill="x", padx=10, pady=5)
+
+        latency_header = ctk.CTkFrame(latency_frame, fg_color="transparent")
+        latency_header.pack(fill="x", padx=5, pady=2)
+
+        ctk.CTkLabel(latency_header, text="Latency (ms since detection):", anchor="w").pack(side="left")
+        self.export_btn = ctk.CTkButton(
+            latency_header,
+            text="Export",
+            command=self._export_traces,
+            width=80
+        )
+        self.export_btn.pack(side="right")
+
+        self.latency_text = ctk.CTkTextbox(
+            latency_frame,
+            height=110,
+            font=ctk.CTkFont(family="Courier", size=11)
+        )
+        self.latency_text.pack(fill="x", padx=5, pady=5)
+        self.latency_text.insert("end", "No snipes yet")
+        self.latency_text.configure(state="disabled")
+
         # Log Frame
         log_frame = ctk.CTkFrame(self)
         log_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -149,6 +175,7 @@ class MonitorTab(ctk.CTkFrame):
             SniperState.WAITING_CHART: ("WAITING FOR CHART", "orange"),
             SniperState.COPYING_CA: ("COPYING CA", "orange"),
             SniperState.BUYING: ("BUYING!", "blue"),
+            SniperState.PAUSED: ("PAUSED (API FAILING)", "red"),
         }
         text, color = status_map.get(state, ("UNKNOWN", "gray"))
         self.status_label.configure(text=text, text_color=color)
@@ -165,6 +192,37 @@ class MonitorTab(ctk.CTkFrame):
             self.buy_count += 1
             self.buy_label.configure(text=str(self.buy_count))
 
+    def _on_trace(self, trace):
+        """Callback when a snipe trace is completed"""
+        if not self.sniper:
+            return
+        summary = self.sniper.tracer.format_summary()
+
+        self.latency_text.configure(state="normal")
+        self.latency_text.delete("1.0", "end")
+        self.latency_text.insert("end", summary)
+        self.latency_text.configure(state="disabled")
+
+    def _export_traces(self):
+        """Export snipe traces to JSON"""
+        if not self.sniper or not self.sniper.tracer.traces:
+            self._log("No traces to export")
+            return
+
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+            initialfile="snipe_traces.json"
+        )
+        if not path:
+            return
+
+        try:
+            self.sniper.tracer.export(path)
+            self._log(f"Traces exported: {path}")
+        except Exception as e:
+            self._log(f"ERROR exporting traces: {e}")
+
     def _start_sniper(self):
         """Start the sniper"""
         # Reload settings
@@ -183,10 +241,72 @@ class MonitorTab(ctk.CTkFrame):
             priority_fee=self.settings.priority_fee,
             num_attempts=self.settings.num_attempts,
             delay_between=self.settings.delay_between,
+            buy_concurrency=self.settings.buy_concurrency,
+            buy_stagger=self.settings.buy_stagger,
+            buy_stop_after=self.settings.buy_stop_after,
+            api_endpoints=self.settings.api_endpoints,
+            race_mode=self.settings.race_mode,
+            hedge_delay=self.settings.hedge_delay,
+            retry_policy=self.settings.retry_policy,
+            backoff_base=self.settings.backoff_base,
+            backoff_max=self.settings.backoff_max,
+            breaker_threshold=self.settings.breaker_threshold,
+            breaker_cooldown=self.settings.breaker_cooldown,
+            rate_limit=self.settings.rate_limit,
+            rate_burst=self.settings.rate_burst,
+            dedup_path=get_data_path(self.settings.dedup_path) if self.settings.dedup_path else "",
+            dedup_ttl=self.settings.dedup_ttl_hours * 3600,
             view_coin_x=self.settings.view_coin_x,
             view_coin_y=self.settings.view_coin_y,
             ca_area_x=self.settings.ca_area_x,
-            ca_area_y=self.settings.ca_area_y
+            ca_area_y=self.settings.ca_area_y,
+            view_coin_template=get_data_path(self.settings.view_coin_template) if self.settings.view_coin_template else "",
+            ca_template=get_data_path(self.settings.ca_template) if self.settings.ca_template else "",
+            view_coin_anchor=self.settings.view_coin_anchor,
+            ca_anchor=self.settings.ca_anchor,
+            locate_threshold=self.settings.locate_threshold,
+            locate_margin=self.settings.locate_margin,
+            locate_levels=self.settings.locate_levels,
+            capture_backend=self.settings.capture_backend,
+            replay_path=self.settings.replay_path,
+            replay_realtime=self.settings.replay_realtime,
+            capture_thread=self.settings.capture_thread,
+            frame_ring_size=self.settings.frame_ring_size,
+            record_path=self.settings.record_path,
+            view_coin_delay=self.settings.view_coin_delay,
+            chart_load_time=self.settings.chart_load_time,
+            ready_roi_size=self.settings.ready_roi_size,
+            ready_stable_frames=self.settings.ready_stable_frames,
+            ready_stable_window=self.settings.ready_stable_window,
+            ready_poll_interval=self.settings.ready_poll_interval,
+            snipe_concurrency=self.settings.snipe_concurrency,
+            event_queue_size=self.settings.event_queue_size,
+            event_policy=self.settings.event_policy,
+            event_max_age=self.settings.event_max_age,
+            event_holdoff=self.settings.event_holdoff,
+            event_preempt=self.settings.event_preempt,
+            stage_timeouts=self.settings.stage_timeouts,
+            ca_signature_path=self.settings.ca_signature_path,
+            clipboard_backend=self.settings.clipboard_backend,
+            ca_copy_timeout=self.settings.ca_copy_timeout,
+            ca_require_pump=self.settings.ca_require_pump,
+            ca_check_curve=self.settings.ca_check_curve,
+            ca_source=self.settings.ca_source,
+            ca_ocr_width=self.settings.ca_ocr_width,
+            ca_ocr_height=self.settings.ca_ocr_height,
+            ca_ocr_interval=self.settings.ca_ocr_interval,
+            feed_region=self.settings.feed_region,
+            callout_keywords=self.settings.callout_keywords,
+            feed_interval=self.settings.feed_interval,
+            ocr_backend=self.settings.ocr_backend,
+            ocr_workers=self.settings.ocr_workers,
+            tesseract_path=self.settings.tesseract_path,
+            probe_offsets=self.settings.probe_offsets,
+            probe_votes=self.settings.probe_votes,
+            pixel_tolerance=self.settings.pixel_tolerance,
+            scan_interval=self.settings.scan_interval,
+            burst_interval=self.settings.burst_interval,
+            burst_duration=self.settings.burst_duration
         )
 
         # Callbacks
@@ -194,6 +314,7 @@ class MonitorTab(ctk.CTkFrame):
         self.sniper.on_state_change = lambda state: self.after(0, lambda: self._update_status(state))
         self.sniper.on_ca_found = lambda ca: self.after(0, lambda: self._on_ca_found(ca))
         self.sniper.on_buy_result = lambda r: self.after(0, lambda: self._on_buy_result(r))
+        self.sniper.on_trace = lambda t: self.after(0, lambda: self._on_trace(t))
 
         # Update UI
         self.start_btn.configure(state="disabled")
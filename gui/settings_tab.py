@@ -104,6 +104,22 @@ class SettingsTab(ctk.CTkFrame):
         self.delay_entry = ctk.CTkEntry(delay_frame, width=100)
         self.delay_entry.pack(side="left", padx=5)
 
+        # Concurrency
+        concurrency_frame = ctk.CTkFrame(buy_frame, fg_color="transparent")
+        concurrency_frame.pack(fill="x", padx=5, pady=2)
+
+        ctk.CTkLabel(concurrency_frame, text="Parallel (1 = seq):", width=150, anchor="w").pack(side="left")
+        self.concurrency_entry = ctk.CTkEntry(concurrency_frame, width=100)
+        self.concurrency_entry.pack(side="left", padx=5)
+
+        # Stop after N successes
+        stop_frame = ctk.CTkFrame(buy_frame, fg_color="transparent")
+        stop_frame.pack(fill="x", padx=5, pady=2)
+
+        ctk.CTkLabel(stop_frame, text="Stop After N OK:", width=150, anchor="w").pack(side="left")
+        self.stop_after_entry = ctk.CTkEntry(stop_frame, width=100)
+        self.stop_after_entry.pack(side="left", padx=5)
+
         # Info pool=auto
         ctk.CTkLabel(
             buy_frame,
@@ -156,6 +172,12 @@ class SettingsTab(ctk.CTkFrame):
         self.delay_entry.delete(0, "end")
         self.delay_entry.insert(0, str(self.settings.delay_between))
 
+        self.concurrency_entry.delete(0, "end")
+        self.concurrency_entry.insert(0, str(self.settings.buy_concurrency))
+
+        self.stop_after_entry.delete(0, "end")
+        self.stop_after_entry.insert(0, str(self.settings.buy_stop_after))
+
     def _save(self):
         """Save settings"""
         try:
@@ -165,6 +187,8 @@ class SettingsTab(ctk.CTkFrame):
             self.settings.priority_fee = float(self.priority_fee_entry.get())
             self.settings.num_attempts = int(self.attempts_entry.get())
             self.settings.delay_between = float(self.delay_entry.get())
+            self.settings.buy_concurrency = max(1, int(self.concurrency_entry.get()))
+            self.settings.buy_stop_after = max(0, int(self.stop_after_entry.get()))
 
             self.settings.save()
 
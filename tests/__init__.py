@@ -0,0 +1 @@
+# Tests (run with: python -m pytest tests)
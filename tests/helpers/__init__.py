@@ -0,0 +1 @@
+# Fakes and scenarios shared by the tests and the benchmarks
@@ -0,0 +1,154 @@
+"""
+Running Sniper plus fake UI, with one scenario per cancellable snipe stage
+Shared by tests/test_stop.py and benchmarks/bench_stop.py
+"""
+import asyncio
+import random
+import time
+
+import core.sniper as sniper_module
+from core.capture import SyntheticCaptureBackend
+from core.clipboard import ClipboardService, MemoryClipboardBackend
+from core.pipeline import ACQUIRE, BUY, OPEN, READY
+from tests.helpers.stub_server import StubServer
+from tests.helpers.ui import CA_AREA, VIEW_COIN, FakeUI, random_mint
+
+
+SLOW = 5000  # ms, longer than any budget below
+
+
+class Harness:
+    """A running Sniper plus the fake UI around it"""
+
+    def __init__(self, rng: random.Random, chart_ms: float = 100, copy_ms: float = 20, api_ms: float = 20, **kwargs):
+        self.rng = rng
+        self.api_ms = api_ms
+        self.capture = SyntheticCaptureBackend(800, 600)
+        self.memory = MemoryClipboardBackend()
+        self.ui = FakeUI(self.capture, self.memory, chart_ms, copy_ms)
+        self.clicks = []
+        self.traces = []
+        self.kwargs = kwargs
+
+    def click(self, x: int, y: int):
+        self.clicks.append(time.perf_counter())
+        self.ui.click(x, y)
+
+    async def start(self):
+        self.server = StubServer(delay=self.api_ms / 1000)
+        url = await self.server.start()
+        sniper_module.windows_click = self.click
+        options = dict(
+            view_coin_delay=0.1, chart_load_time=SLOW / 1000, ca_copy_timeout=SLOW / 1000,
+            num_attempts=3, delay_between=0.3, rate_limit=0, scan_interval=0.01,
+            ca_source="clipboard", event_holdoff=0.05, event_max_age=10.0
+        )
+        options.update(self.kwargs)
+        self.sniper = sniper_module.Sniper(
+            "key", capture=self.capture, clipboard=ClipboardService(self.memory), api_url=url,
+            view_coin_x=VIEW_COIN[0], view_coin_y=VIEW_COIN[1], ca_area_x=CA_AREA[0], ca_area_y=CA_AREA[1],
+            **options
+        )
+        self.sniper.log = lambda msg: None
+        self.sniper.on_trace = self.traces.append
+        self.task = asyncio.ensure_future(self.sniper.run())
+        await asyncio.sleep(0.2)
+
+    async def wait_stage(self, stage: str, timeout: float = 5.0) -> bool:
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if any(job.stage == stage for job in self.sniper._jobs.values()):
+                return True
+            await asyncio.sleep(0.002)
+        return False
+
+    async def animate(self, seconds: float):
+        """Notification still animating: the View Coin pixel never settles"""
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            shade = self.rng.randrange(256)
+            self.capture.paint(VIEW_COIN[0], VIEW_COIN[1], 1, 1, (shade, 0, 255 - shade))
+            await asyncio.sleep(0.005)
+
+    async def stop(self) -> float:
+        """stop() from another thread; ms until run() returned"""
+        requested = {}
+
+        def stop():
+            requested["at"] = time.perf_counter()
+            self.sniper.stop()
+
+        await asyncio.get_running_loop().run_in_executor(None, stop)
+        await self.task
+        idle = time.perf_counter()
+        await self.server.stop()
+        self.stopped_at = requested["at"]
+        return (idle - requested["at"]) * 1000
+
+    def clicks_after_stop(self) -> int:
+        return sum(1 for t in self.clicks if t > self.stopped_at)
+
+
+async def stop_in(stage: str, rng: random.Random) -> float:
+    """Stop-to-idle ms with a snipe parked in `stage` (or just monitoring)"""
+    options = {
+        OPEN: dict(view_coin_delay=SLOW / 1000),
+        READY: dict(chart_ms=SLOW),
+        ACQUIRE: dict(copy_ms=SLOW),
+        BUY: dict(api_ms=SLOW),
+    }.get(stage, {})
+    options["stage_timeouts"] = {OPEN: 0, READY: 0, ACQUIRE: 0, BUY: 0}
+    harness = Harness(rng, **options)
+    await harness.start()
+    animation = None
+    if stage != "monitor":
+        harness.ui.notify(random_mint(rng))
+        if stage == OPEN:
+            await asyncio.sleep(0.03)
+            animation = asyncio.ensure_future(harness.animate(SLOW / 1000))
+        if not await harness.wait_stage(stage):
+            raise RuntimeError(f"snipe never reached {stage}")
+    await asyncio.sleep(rng.uniform(0.02, 0.08))
+    ms = await harness.stop()
+    if animation:
+        animation.cancel()
+    if harness.clicks_after_stop():
+        raise RuntimeError(f"{harness.clicks_after_stop()} clicks after stop ({stage})")
+    return ms
+
+
+async def timeout_overshoot(stage: str, budget: float, rng: random.Random) -> float:
+    """ms the snipe outlived its stage budget"""
+    options = {READY: dict(chart_ms=SLOW), ACQUIRE: dict(copy_ms=SLOW), BUY: dict(api_ms=SLOW)}[stage]
+    harness = Harness(rng, stage_timeouts={stage: budget}, **options)
+    await harness.start()
+    harness.ui.notify(random_mint(rng))
+    await harness.wait_stage(stage)
+    entered = time.perf_counter()
+    while not harness.traces:
+        await asyncio.sleep(0.002)
+    ended = time.perf_counter()
+    await harness.stop()
+    trace = harness.traces[0]
+    if trace.info.get("timeout") != stage:
+        raise RuntimeError(f"expected a {stage} timeout, got {trace.info}")
+    return (ended - entered) * 1000 - budget * 1000
+
+
+async def preempt_wait(preempt: bool, rng: random.Random) -> float:
+    """ms a new token waits for a worker while the only one is buying"""
+    harness = Harness(rng, api_ms=500, snipe_concurrency=1, event_preempt=preempt, stage_timeouts={BUY: 0})
+    await harness.start()
+    harness.ui.notify(random_mint(rng))
+    await harness.wait_stage(BUY)
+    await asyncio.sleep(rng.uniform(0.02, 0.08))
+    harness.ui.notify(random_mint(rng))
+    while True:
+        job = harness.sniper._jobs.get(2)
+        if job and any(stage == "dequeued" for stage, _ in job.event.trace.marks):
+            break
+        await asyncio.sleep(0.001)
+    trace = job.event.trace
+    await harness.stop()
+    marks = trace.since_start_ms()
+    return marks["dequeued"] - marks["detected"]
@@ -0,0 +1,88 @@
+"""
+Synthetic recorded sessions and a detector pass over them
+Shared by tests/test_replay.py and benchmarks/bench_replay.py
+"""
+import time
+
+import numpy as np
+
+from core.capture import SyntheticCaptureBackend
+from core.detector import RegionDetector, probes_from_offsets
+from core.recording import FrameRecorder, ReplayCaptureBackend
+
+
+X, Y = 764, 344
+
+
+def grid_offsets(n: int, spacing: int = 4):
+    """n probe offsets on a square grid centered on (0, 0)"""
+    side = int(np.ceil(np.sqrt(n)))
+    half = side // 2
+    offsets = [[(i % side - half) * spacing, (i // side - half) * spacing] for i in range(n)]
+    return offsets[:n]
+
+
+def record_synthetic(path: str, frames: int, probes: int, every: int = 400, seed: int = 1) -> int:
+    """Record a synthetic 20 Hz session with noise and a new token every `every` frames
+
+    Like the real feed, each notification replaces the previous one (a new
+    color that stays) instead of going away. Returns the notification count.
+    """
+    rng = np.random.default_rng(seed)
+    detector = RegionDetector(probes_from_offsets(X, Y, grid_offsets(probes)))
+    left, top, width, height = roi = detector.roi
+    backend = SyntheticCaptureBackend(left + width, top + height)
+
+    ts = time.perf_counter_ns()
+    color = (30, 30, 40)
+    with FrameRecorder(path, roi) as recorder:
+        for i in range(frames):
+            if i % every == every - 1:
+                n = i // every + 1
+                color = (n * 67 % 256, 120 + n * 29 % 120, n * 151 % 256)
+            backend.paint(left, top, width, height, color)
+            dx, dy = rng.integers(0, width), rng.integers(0, height)
+            backend.screen[top + dy, left + dx] = rng.integers(0, 256, size=3)
+            recorder.write(backend.grab(left, top, width, height), ts)
+            ts += 50_000_000
+        print(f"recorded {recorder.frames} frames, {recorder.raw_bytes:,} raw bytes -> {recorder.size:,} on disk, "
+              f"{frames // every} notifications")
+    return frames // every
+
+
+def replay(path: str, probes: int, votes: int, holdoff: float = 0.4):
+    """Detector over the recording the way Sniper._monitor runs it
+
+    Each detection rebases on the new screen, and changes within `holdoff`
+    seconds (recorded time) of it follow the screen instead of voting.
+    """
+    replay = ReplayCaptureBackend(path, realtime=False)
+    rec = replay.recording
+    offsets = grid_offsets(probes)
+    cx, cy = rec.left + rec.width // 2, rec.top + rec.height // 2
+    detector = RegionDetector(probes_from_offsets(cx, cy, offsets), tolerance=15, min_votes=votes)
+    detector.rebase(replay)
+
+    detections = 0
+    holdoff_until = 0
+    start = time.perf_counter()
+    while not replay.exhausted:
+        replay.advance()
+        frame = detector.grab(replay)
+        if replay.timestamp_ns < holdoff_until:
+            detector.rebase_frame(frame)
+            continue
+        if detector.check_frame(frame).changed:
+            detections += 1
+            detector.rebase_frame(frame)
+            holdoff_until = replay.timestamp_ns + int(holdoff * 1e9)
+    elapsed = time.perf_counter() - start
+
+    frames = len(rec)
+    print(
+        f"replayed {frames} frames ({rec.duration:.0f}s of session) in {elapsed * 1000:.0f}ms: "
+        f"{frames / elapsed:,.0f} frames/s, {rec.duration / elapsed:,.0f}x real time, "
+        f"{detections} detections (probes={probes}, k={detector.min_votes})"
+    )
+    replay.close_recording()
+    return detections
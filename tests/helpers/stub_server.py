@@ -0,0 +1,142 @@
+"""
+Local PumpPortal stub: a trade endpoint with injectable faults
+Used by the tests and the benchmarks (python -m benchmarks.stub_server)
+"""
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+
+from aiohttp import web
+
+
+# Injectable faults: kind -> (HTTP status, JSON body); None = special handling
+FAULTS = {
+    "429": (429, {"error": "Too many requests"}),
+    "500": (500, {"error": "Internal server error"}),
+    "503": (503, None),  # plain-text body
+    "401": (401, {"error": "Invalid API key"}),
+    "slippage": (200, {"error": "Slippage tolerance exceeded"}),
+    "funds": (200, {"error": "Insufficient SOL balance"}),
+    "bad_mint": (200, {"error": "Invalid mint address"}),
+    "timeout": None,  # never answers (client timeout)
+    "reset": None,    # drops the connection
+}
+
+
+class StubServer:
+    """Minimal trade endpoint answering with a fake signature after `delay` seconds
+
+    `jitter` adds a uniform random 0..jitter seconds to every answer.
+    `faults` maps a FAULTS kind to the probability of injecting it on a
+    request; changing it while running takes effect on the next request.
+    `rate_limit` > 0 answers 429 to requests above that many per second
+    (token bucket of `rate_burst`), like the real API.
+    """
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        jitter: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+        rate_limit: float = 0.0,
+        rate_burst: int = 10
+    ):
+        for kind in faults or {}:
+            if kind not in FAULTS:
+                raise ValueError(f"Unknown fault: {kind}")
+        self.delay = delay
+        self.jitter = jitter
+        self.host = host
+        self.port = port
+        self.faults = dict(faults or {})
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.requests = 0
+        self.rejected = 0
+        self._tokens = float(rate_burst)
+        self._refilled = time.monotonic()
+        self.injected: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._hung = set()
+        self._runner: Optional[web.AppRunner] = None
+
+    def _pick_fault(self) -> Optional[str]:
+        roll = self._random.random()
+        for kind, rate in self.faults.items():
+            if roll < rate:
+                return kind
+            roll -= rate
+        return None
+
+    def _over_limit(self) -> bool:
+        if self.rate_limit <= 0:
+            return False
+        now = time.monotonic()
+        self._tokens = min(self.rate_burst, self._tokens + (now - self._refilled) * self.rate_limit)
+        self._refilled = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/trade"
+
+    async def _trade(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        payload = await request.json()
+        if self._over_limit():
+            self.rejected += 1
+            return web.json_response({"error": "Too many requests"}, status=429)
+        delay = self.delay + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        fault = self._pick_fault()
+        if fault is not None:
+            self.injected[fault] = self.injected.get(fault, 0) + 1
+            if fault == "timeout":
+                # Held until the client gives up or the server stops
+                hold = asyncio.get_running_loop().create_future()
+                self._hung.add(hold)
+                try:
+                    await hold
+                finally:
+                    self._hung.discard(hold)
+                return web.Response(status=503, text="Service Unavailable")
+            if fault == "reset":
+                request.transport.close()
+                return web.Response(status=500)  # never reaches the client
+            status, body = FAULTS[fault]
+            if body is None:
+                return web.Response(status=status, text="Service Unavailable")
+            return web.json_response(body, status=status)
+        signature = "".join(random.choice("123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz") for _ in range(88))
+        return web.json_response({"signature": signature, "mint": payload.get("mint")})
+
+    async def _root(self, request: web.Request) -> web.Response:
+        return web.Response(text="ok")
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/api/trade", self._trade)
+        app.router.add_route("*", "/", self._root)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.url
+
+    async def stop(self):
+        for hold in list(self._hung):
+            if not hold.done():
+                hold.set_result(None)
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
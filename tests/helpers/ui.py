@@ -0,0 +1,60 @@
+"""
+Fake trading UI on a synthetic screen: notifications, chart page, CA copy
+"""
+import asyncio
+import random
+
+from core.address import BASE58_ALPHABET, is_valid_address
+from core.capture import SyntheticCaptureBackend
+from core.clipboard import MemoryClipboardBackend
+
+
+VIEW_COIN = (100, 100)
+CA_AREA = (320, 220)
+
+
+def random_mint(rng: random.Random) -> str:
+    """Base58 of 32 random bytes that pass the CA validator (on curve)"""
+    while True:
+        n = rng.getrandbits(256) | 1 << 255  # no leading zero byte
+        chars = []
+        while n:
+            n, r = divmod(n, 58)
+            chars.append(BASE58_ALPHABET[r])
+        mint = "".join(reversed(chars))
+        if is_valid_address(mint, check_curve=True):
+            return mint
+
+
+class FakeUI:
+    """Notification feed + chart page driven by fake clicks"""
+
+    def __init__(self, capture: SyntheticCaptureBackend, clipboard: MemoryClipboardBackend, chart_ms: float, copy_ms: float = 20):
+        self.capture = capture
+        self.clipboard = clipboard
+        self.chart_delay = chart_ms / 1000
+        self.copy_delay = copy_ms / 1000
+        self.shown = None  # mint of the notification on screen
+        self.opened = None  # mint of the chart page
+        self.count = 0
+
+    def notify(self, mint: str):
+        self.count += 1
+        self.shown = mint
+        color = (self.count * 37 % 256, self.count * 91 % 256, 200)
+        self.capture.paint(VIEW_COIN[0], VIEW_COIN[1], 1, 1, color)
+
+    def click(self, x: int, y: int):
+        loop = asyncio.get_running_loop()
+        if (x, y) == VIEW_COIN:
+            mint = self.shown
+
+            def load():
+                self.opened = mint
+                shade = self.count * 53 % 200 + 30
+                self.capture.paint(CA_AREA[0] - 30, CA_AREA[1] - 30, 60, 60, (shade, shade, shade))
+
+            loop.call_later(self.chart_delay, load)
+        else:
+            mint = self.opened
+            loop.call_later(self.copy_delay, lambda: self.clipboard.set_text(mint))
@@ -0,0 +1,70 @@
+"""CA validation: base58 decode, 32-byte length, ed25519 on-curve check, "pump" suffix"""
+import hashlib
+
+import pytest
+
+from core.address import b58decode, extract_ca, find_addresses, is_on_curve, is_valid_address
+
+
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+WSOL = "So11111111111111111111111111111111111111112"
+SYSTEM_PROGRAM = "11111111111111111111111111111111"
+METAPLEX = "metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a6bBmtyuUh"
+# Metaplex metadata account of USDC: PDA of ["metadata", METAPLEX, USDC], bump 255
+USDC_METADATA = "FhjBac6BXFeJRKrVyMpNR8SF33YqVahFKxHzSDPCXqkm"
+PUMP_CA = "Bbd9DcnZrGZPwUUszZ5XW7eGiu7Bhn6XnPfY6R3Xpump"
+
+
+@pytest.mark.parametrize("address", [USDC, TOKEN_PROGRAM, WSOL, SYSTEM_PROGRAM, PUMP_CA])
+def test_known_keys_are_valid_and_on_curve(address):
+    assert len(b58decode(address)) == 32
+    assert is_on_curve(b58decode(address))
+    assert is_valid_address(address, check_curve=True)
+
+
+def test_leading_ones_are_zero_bytes():
+    assert b58decode(SYSTEM_PROGRAM) == bytes(32)
+    assert b58decode(WSOL)[0] == 0x06
+
+
+def test_pda_is_off_curve():
+    seeds = b"metadata" + b58decode(METAPLEX) + b58decode(USDC)
+    digest = hashlib.sha256(seeds + bytes([255]) + b58decode(METAPLEX) + b"ProgramDerivedAddress").digest()
+    assert b58decode(USDC_METADATA) == digest
+
+    assert not is_on_curve(digest)
+    # Still a well-formed 32-byte key: only the curve check rejects it
+    assert is_valid_address(USDC_METADATA)
+    assert not is_valid_address(USDC_METADATA, check_curve=True)
+
+
+@pytest.mark.parametrize("address", [
+    USDC[:-2],                 # 42 chars, 31 bytes
+    "1" * 31,                  # 31 zero bytes
+    "z" * 44,                  # 44 chars, 33 bytes
+    USDC + "1",                # 45 chars, 33 bytes
+    "",
+])
+def test_wrong_length_is_rejected(address):
+    assert not is_valid_address(address)
+
+
+@pytest.mark.parametrize("bad", ["0", "O", "I", "l", "-", " "])
+def test_non_base58_is_rejected(bad):
+    address = USDC[:10] + bad + USDC[11:]
+    assert b58decode(address) is None
+    assert not is_valid_address(address)
+
+
+def test_require_pump():
+    assert is_valid_address(PUMP_CA, require_pump=True, check_curve=True)
+    assert not is_valid_address(USDC, require_pump=True)
+    assert find_addresses(f"{USDC} {PUMP_CA}", require_pump=True) == [PUMP_CA]
+    assert extract_ca(f"{USDC} {PUMP_CA}") == PUMP_CA
+    assert extract_ca(USDC, require_pump=True) is None
+
+
+def test_ca_glued_to_text():
+    assert extract_ca(f"CA:{PUMP_CA}jointhechat") == PUMP_CA
+    assert find_addresses(f"see {USDC_METADATA} and {USDC}", check_curve=True) == [USDC]
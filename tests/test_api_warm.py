@@ -0,0 +1,49 @@
+import asyncio
+
+from core.api import PumpPortalAPI
+from core.ratelimit import RateLimiter
+from tests.helpers.stub_server import StubServer
+
+
+def test_keep_warm_pings_take_a_low_lane_token():
+    async def main():
+        server = StubServer(delay=0)
+        url = await server.start()
+        limiter = RateLimiter(rate=20, burst=1)
+        api = PumpPortalAPI("key", base_url=url, keep_warm_interval=0.05, rate_limiter=limiter)
+        try:
+            assert await api.start() is not None
+            await asyncio.sleep(0.2)
+        finally:
+            await api.close()
+            await server.stop()
+        return limiter.stats()
+
+    stats = asyncio.run(main())
+    # start() plus keep-warm pings, all in the low lane
+    assert stats["low"]["granted"] >= 2
+    assert "high" not in stats
+
+
+def test_race_uses_the_prebuilt_endpoint_urls():
+    async def main():
+        slow, fast = StubServer(delay=0.2), StubServer(delay=0)
+        endpoints = [await slow.start(), await fast.start()]
+        api = PumpPortalAPI("key", endpoints=endpoints, race_mode="all")
+        template = api.get_template(0.1)
+        assert template.urls == {url: f"{url}?api-key=key" for url in endpoints}
+
+        def rebuilt(endpoint):
+            raise AssertionError(f"URL rebuilt for {endpoint}")
+
+        api.endpoint_url = rebuilt
+        try:
+            return await api.buy("mint", 0.1), endpoints
+        finally:
+            await api.close()
+            await slow.stop()
+            await fast.stop()
+
+    result, endpoints = asyncio.run(main())
+    assert result.success
+    assert result.endpoint == endpoints[1]
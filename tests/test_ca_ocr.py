@@ -0,0 +1,55 @@
+"""CA from OCR: a single read must never win"""
+import asyncio
+
+from core.capture import SyntheticCaptureBackend
+from core.clipboard import ClipboardService, MemoryClipboardBackend
+from core.sniper import OCR_THRESHOLDS, Sniper
+from core.tracing import SnipeTrace
+
+
+CA = "Bbd9DcnZrGZPwUUszZ5XW7eGiu7Bhn6XnPfY6R3Xpump"
+MISREAD = "Bbd9DcnZr6ZPwUUszZ5XW7eGiu7Bhn6XnPfY6R3Xpump"  # G -> 6, still on the curve
+
+
+class ScriptedOCR:
+    """OCREngine stand-in returning one scripted text per read"""
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+        self.thresholds = []
+
+    async def extract_text_async(self, img, crop_top_only=True, threshold=150):
+        self.thresholds.append(threshold)
+        return self.texts.pop(0) if self.texts else ""
+
+
+def read_ca(texts, timeout=0.05):
+    sniper = Sniper(
+        "key", capture=SyntheticCaptureBackend(800, 600), clipboard=ClipboardService(MemoryClipboardBackend()),
+        ca_copy_timeout=timeout, ca_ocr_interval=0.001, ocr=ScriptedOCR(texts)
+    )
+    ca = asyncio.run(sniper._ca_from_ocr(SnipeTrace(1)))
+    return ca, sniper.ocr
+
+
+def test_single_read_does_not_win():
+    ca, _ = read_ca([f"CA: {CA}"])
+    assert ca is None
+
+
+def test_two_agreeing_reads_win():
+    ca, ocr = read_ca([f"CA: {CA}", f"CA {CA} copy"])
+    assert ca == CA
+    # Alternating binarizations, not the same cached read twice
+    assert ocr.thresholds == list(OCR_THRESHOLDS)
+
+
+def test_disagreeing_reads_need_a_third():
+    ca, ocr = read_ca([MISREAD, CA, CA])
+    assert ca == CA
+    assert len(ocr.thresholds) == 3
+
+
+def test_misread_never_confirmed_against_the_real_ca():
+    ca, _ = read_ca([MISREAD, CA, MISREAD, CA])
+    assert ca is None
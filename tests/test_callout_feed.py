@@ -0,0 +1,130 @@
+"""Callout watch: new feed lines go through OCR, a callout with a CA is bought"""
+import asyncio
+import threading
+
+import numpy as np
+
+import core.sniper as sniper_module
+from core.capture import SyntheticCaptureBackend
+from core.clipboard import ClipboardService, MemoryClipboardBackend
+from core.ocr import OCREngine
+from core.ocr_service import OCRBackend
+from core.retry import AUTH
+from tests.helpers.stub_server import StubServer
+
+
+CA = "Bbd9DcnZrGZPwUUszZ5XW7eGiu7Bhn6XnPfY6R3Xpump"
+# One-character OCR slip (G -> 6) that still lands on the curve
+MISREAD = "Bbd9DcnZr6ZPwUUszZ5XW7eGiu7Bhn6XnPfY6R3Xpump"
+FEED = (0, 300, 400, 200)
+LINES = ["gm frens", "chart looks good", f"CALLOUT {CA}"]
+
+
+class WidthOCR(OCRBackend):
+    """Reads a feed line from its ink width (line i is 10 * (i + 1) px wide)"""
+
+    name = "width"
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def recognize(self, img: np.ndarray) -> str:
+        self.calls += 1
+        ink = int((img < 128).any(axis=0).sum())
+        return LINES[ink // 10 - 1] if ink else ""
+
+
+class MisreadOCR(WidthOCR):
+    """WidthOCR whose first read of the callout line slips a character"""
+
+    def __init__(self):
+        super().__init__()
+        self.callout_reads = 0
+
+    def recognize(self, img: np.ndarray) -> str:
+        text = super().recognize(img)
+        if CA in text:
+            self.callout_reads += 1
+            if self.callout_reads == 1:
+                return text.replace(CA, MISREAD)
+        return text
+
+
+def post(capture: SyntheticCaptureBackend, index: int):
+    """New message at the bottom of the feed"""
+    top = FEED[1] + 20 + 20 * index
+    capture.paint(FEED[0] + 10, top, 10 * (index + 1), 8, (0, 0, 0))
+
+
+def run_feed(monkeypatch, backend: WidthOCR, trip_breaker: bool = False):
+    """Post two lines then the callout; returns (bought, clicks, OCR calls before the callout, log)"""
+    clicks = []
+    monkeypatch.setattr(sniper_module, "windows_click", lambda x, y: clicks.append((x, y)))
+    capture = SyntheticCaptureBackend(400, 500, (255, 255, 255))
+    post(capture, 0)  # already on screen at start: primed, never read
+
+    async def main():
+        server = StubServer(delay=0.005)
+        url = await server.start()
+        sniper = sniper_module.Sniper(
+            "key", capture=capture, clipboard=ClipboardService(MemoryClipboardBackend()), api_url=url,
+            ca_source="clipboard", ocr=OCREngine(backend=backend, workers=1),
+            feed_region=list(FEED), callout_keywords=["callout"], feed_interval=0.01,
+            num_attempts=1, rate_limit=0, dedup_path="", scan_interval=0.01
+        )
+        log = []
+        sniper.log = log.append
+        bought = []
+        sniper.on_ca_found = bought.append
+        swaps = []
+        swap = sniper.ocr.callouts.swap
+
+        def record_swap(keywords):
+            swaps.append(threading.current_thread())
+            return swap(keywords)
+
+        sniper.ocr.callouts.swap = record_swap
+        if trip_breaker:
+            sniper.breaker.record(AUTH)
+        task = asyncio.ensure_future(sniper.run())
+        await asyncio.sleep(0.1)
+        post(capture, 1)
+        await asyncio.sleep(0.1)
+        calls_before_callout = backend.calls
+        post(capture, 2)
+        for _ in range(30):
+            if bought:
+                break
+            await asyncio.sleep(0.01)
+        sniper.stop()
+        await task
+        await server.stop()
+        # The automaton was built once, off the event loop
+        assert len(swaps) == 1 and swaps[0] is not threading.main_thread()
+        return bought, calls_before_callout, log
+
+    bought, calls_before_callout, log = asyncio.run(main())
+    return bought, clicks, calls_before_callout, log
+
+
+def test_callout_in_new_feed_line_is_bought(monkeypatch):
+    backend = WidthOCR()
+    bought, clicks, calls_before_callout, _ = run_feed(monkeypatch, backend)
+    assert bought == [CA]
+    # Warm-up plus one read for the single new line, not the whole feed
+    assert calls_before_callout == 2
+    assert clicks == []
+
+
+def test_misread_callout_never_reaches_buy(monkeypatch):
+    bought, clicks, _, log = run_feed(monkeypatch, MisreadOCR())
+    assert bought == []
+    assert clicks == []
+    assert any("disagree" in line and MISREAD in line for line in log)
+
+
+def test_callout_waits_for_the_circuit(monkeypatch):
+    bought, _, _, log = run_feed(monkeypatch, WidthOCR(), trip_breaker=True)
+    assert bought == []
+    assert any(line.startswith("[PAUSED] Callout") for line in log)
@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+from core.capture import MSSCaptureBackend
+
+
+def _display_available() -> bool:
+    try:
+        import mss
+        (getattr(mss, "MSS", None) or mss.mss)().close()
+        return True
+    except Exception:
+        return False
+
+
+@pytest.mark.skipif(not _display_available(), reason="mss needs a display")
+def test_mss_handles_are_closed():
+    capture = MSSCaptureBackend()
+
+    def worker(release: bool):
+        capture.grab(0, 0, 4, 4)
+        if release:
+            capture.release()
+
+    capture.grab(0, 0, 4, 4)
+    threads = [threading.Thread(target=worker, args=(i % 2 == 0,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # This thread plus the two workers that didn't release
+    assert len(capture._handles) == 3
+
+    capture.close()
+    assert capture._handles == []
+    # A thread grabbing again after close() gets a fresh handle
+    capture.grab(0, 0, 4, 4)
+    assert len(capture._handles) == 1
+    capture.close()
@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+
+from core.capture import SyntheticCaptureBackend
+from core.clipboard import ClipboardService, MemoryClipboardBackend
+from core.locator import TemplateLocator, template_crop
+from core.readiness import save_signature
+from core.sniper import Sniper
+
+
+SCREEN = (0, 0, 640, 480)
+
+
+def textured_screen(seed: int = 1) -> SyntheticCaptureBackend:
+    capture = SyntheticCaptureBackend(SCREEN[2], SCREEN[3])
+    rng = np.random.default_rng(seed)
+    block = rng.integers(0, 256, size=(SCREEN[3] // 8, SCREEN[2] // 8, 3), dtype=np.uint8)
+    capture.screen[:] = np.kron(block, np.ones((8, 8, 1), dtype=np.uint8))
+    return capture
+
+
+def test_template_crop_is_shifted_inward_at_edges():
+    assert template_crop((10, 5), (120, 40), SCREEN) == ((0, 0, 120, 40), (10, 5))
+    assert template_crop((635, 478), (120, 40), SCREEN) == ((520, 440, 120, 40), (115, 38))
+    assert template_crop((300, 200), (120, 40), SCREEN) == ((240, 180, 120, 40), (60, 20))
+
+
+def test_clamped_template_finds_the_calibrated_point():
+    capture = textured_screen()
+    point = (12, 460)
+    roi, anchor = template_crop(point, (120, 40), SCREEN)
+    template = capture.grab(*roi).copy()
+
+    locator = TemplateLocator("edge", template, anchor=anchor)
+    found = locator.search(capture)
+    assert (found.x, found.y) == point
+
+
+def test_track_only_skips_the_full_search():
+    capture = textured_screen()
+    roi, anchor = template_crop((200, 150), (120, 40), SCREEN)
+    locator = TemplateLocator("button", capture.grab(*roi).copy(), anchor=anchor, expected=(200, 150), margin=20)
+    # Page scrolls far past the tracking margin
+    capture.screen[:] = np.roll(capture.screen, (200, 240), axis=(0, 1))
+    assert locator.locate(capture, search=False) is None
+    assert locator.searches == 0
+    found = locator.locate(capture)
+    assert (found.x, found.y, found.mode) == (440, 350, "search")
+
+
+def test_sniper_searches_in_the_background(tmp_path):
+    capture = textured_screen()
+    roi, anchor = template_crop((200, 150), (120, 40), SCREEN)
+    path = str(tmp_path / "view_coin.npy")
+    save_signature(capture, roi, path)
+    capture.screen[:] = np.roll(capture.screen, (200, 240), axis=(0, 1))
+
+    async def main():
+        sniper = Sniper(
+            "key", capture=capture, clipboard=ClipboardService(MemoryClipboardBackend()),
+            view_coin_x=200, view_coin_y=150, view_coin_template=path, view_coin_anchor=list(anchor),
+            capture_thread=False, dedup_path=""
+        )
+        sniper.log = lambda msg: None
+        locator = sniper.view_coin_locator
+        # Inside a stage: no full search, the position stays
+        assert await sniper._relocate(locator, search=False) is None
+        assert (sniper.view_coin_x, sniper.view_coin_y) == (200, 150)
+        await sniper._searches[locator.name]
+        # The next snipe tracks from where the background search found it
+        loc = await sniper._relocate(locator, search=False)
+        assert loc is not None and loc.mode == "track"
+        return sniper.view_coin_x, sniper.view_coin_y
+
+    assert asyncio.run(main()) == (440, 350)
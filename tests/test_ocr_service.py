@@ -0,0 +1,37 @@
+import ctypes.util
+import importlib.util
+
+import numpy as np
+import pytest
+
+from core.ocr_service import (
+    OCRService, TesseractCliBackend, create_ocr_backend, load_libtesseract, to_pnm
+)
+
+
+IN_PROCESS = importlib.util.find_spec("tesserocr") is not None or ctypes.util.find_library("tesseract") is not None
+
+
+@pytest.mark.skipif(IN_PROCESS, reason="an in-process OCR backend is installed here")
+def test_auto_fails_loudly_without_in_process_ocr(tmp_path):
+    with pytest.raises(RuntimeError, match="cli"):
+        create_ocr_backend("auto", tesseract_path=str(tmp_path / "tesseract.exe"))
+
+
+@pytest.mark.skipif(IN_PROCESS, reason="an in-process OCR backend is installed here")
+def test_missing_libtesseract_is_oserror(tmp_path):
+    with pytest.raises(OSError, match="libtesseract not found"):
+        load_libtesseract(str(tmp_path / "tesseract.exe"))
+
+
+def test_cli_is_explicit_opt_in(tmp_path):
+    service = OCRService("cli", tesseract_path=str(tmp_path / "tesseract.exe"))
+    assert isinstance(service.backend, TesseractCliBackend)
+    with pytest.raises(ValueError):
+        create_ocr_backend("nope")
+
+
+def test_to_pnm_header():
+    gray = np.zeros((2, 3), dtype=np.uint8)
+    assert to_pnm(gray) == b"P5\n3 2\n255\n" + bytes(6)
+    assert to_pnm(np.zeros((2, 3, 3), dtype=np.uint8)).startswith(b"P6\n3 2\n")
@@ -0,0 +1,41 @@
+import asyncio
+
+import numpy as np
+
+from core.capture import SyntheticCaptureBackend
+from core.readiness import ReadinessProbe
+
+
+def frame(value: float) -> np.ndarray:
+    return np.full((8, 8, 3), int(value), dtype=np.int16)
+
+
+def test_slow_fade_is_not_stable():
+    probe = ReadinessProbe("ca", (0, 0, 8, 8), stable_frames=3)
+    # 2 levels per 10ms poll: under the 8.0 tolerance poll to poll, 20 over 100ms
+    for i in range(60):
+        assert not probe.update(frame(40 + 2 * i), now=i * 0.01)
+
+
+def test_ready_once_still_for_the_window():
+    probe = ReadinessProbe("ca", (0, 0, 8, 8), stable_frames=3)
+    ready_at = None
+    for i in range(40):
+        value = min(200, 40 + 10 * i)  # fade ends at i = 16
+        if probe.update(frame(value), now=i * 0.01):
+            ready_at = i
+            break
+    assert ready_at is not None
+    assert 16 + 10 <= ready_at <= 16 + 10 + 3
+
+
+def test_require_change_ignores_a_still_screen():
+    capture = SyntheticCaptureBackend(100, 100)
+    probe = ReadinessProbe("ca", (10, 10, 8, 8), stable_frames=2, stable_window=0.02, require_change=True)
+    probe.arm(capture)
+    assert asyncio.run(probe.wait(capture, timeout=0.15, poll_interval=0.005)) is None
+
+    probe.arm(capture)
+    capture.paint(10, 10, 8, 8, (255, 255, 255))
+    waited = asyncio.run(probe.wait(capture, timeout=1.0, poll_interval=0.005))
+    assert waited is not None and waited >= 0.02
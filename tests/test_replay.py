@@ -0,0 +1,142 @@
+"""Sniper driven by a recorded session through the replay capture backend"""
+import asyncio
+import random
+
+import pytest
+
+import core.sniper as sniper_module
+from core.capture import CAPTURE_BACKENDS, SyntheticCaptureBackend, create_capture_backend
+from core.clipboard import ClipboardService, MemoryClipboardBackend
+from core.recording import FrameRecorder, ReplayCaptureBackend
+from tests.helpers.session import record_synthetic, replay
+from tests.helpers.stub_server import StubServer
+from tests.helpers.ui import CA_AREA, VIEW_COIN, FakeUI, random_mint
+
+
+NOTIFICATIONS = 5
+SPACING = 150  # frames between notifications
+
+
+@pytest.fixture
+def session(tmp_path):
+    """Full-screen recording: a new token color at the View Coin pixel every SPACING frames"""
+    path = str(tmp_path / "session.pfsr")
+    screen = SyntheticCaptureBackend(400, 300, (20, 20, 30))
+    ts = 0
+    with FrameRecorder(path, (0, 0, 400, 300)) as recorder:
+        for i in range(SPACING * NOTIFICATIONS):
+            if i % SPACING == SPACING // 2:
+                n = i // SPACING + 1
+                screen.paint(VIEW_COIN[0], VIEW_COIN[1], 1, 1, (n * 40 % 256, 200, n * 70 % 256))
+            recorder.write(screen.grab(0, 0, 400, 300), ts)
+            ts += 50_000_000
+    return path
+
+
+def test_replay_is_registered(session):
+    assert CAPTURE_BACKENDS["replay"] is ReplayCaptureBackend
+    replay = create_capture_backend("replay", path=session, realtime=False)
+    # Non-realtime frames only move on advance(), not on every grab
+    first = replay.grab(*VIEW_COIN).copy()
+    assert (replay.grab(*VIEW_COIN) == first).all() and replay.index == 0
+    replay.advance()
+    assert replay.index == 1
+    replay.close_recording()
+
+
+def test_sniper_over_replay(session, monkeypatch):
+    monkeypatch.setattr(sniper_module, "windows_click", lambda x, y: None)
+
+    async def main():
+        server = StubServer(delay=0.005)
+        url = await server.start()
+        sniper = sniper_module.Sniper(
+            "key", capture_backend="replay", replay_path=session, replay_realtime=False,
+            clipboard=ClipboardService(MemoryClipboardBackend()), api_url=url,
+            view_coin_x=VIEW_COIN[0], view_coin_y=VIEW_COIN[1], ca_area_x=CA_AREA[0], ca_area_y=CA_AREA[1],
+            scan_interval=0.002, event_holdoff=0.02, view_coin_delay=0.02, chart_load_time=0.02,
+            ca_copy_timeout=0.02, ca_source="clipboard", rate_limit=0, dedup_path=""
+        )
+        sniper.log = lambda msg: None
+        assert sniper.capture_thread is None
+        try:
+            await asyncio.wait_for(sniper.run(), 10)
+        finally:
+            await server.stop()
+            sniper.capture.close_recording()
+        return sniper
+
+    sniper = asyncio.run(main())
+    assert sniper.capture.exhausted
+    assert sniper._event_seq == NOTIFICATIONS
+
+
+def test_session_replay_counts_each_notification_once(tmp_path):
+    path = str(tmp_path / "bench.pfsr")
+    notifications = record_synthetic(path, 2000, probes=9, every=200)
+    assert replay(path, probes=9, votes=3) == notifications
+
+
+def test_sniper_replays_its_own_recording(tmp_path, monkeypatch):
+    """A file written by Sniper(record_path=...) drives a whole snipe on replay"""
+    path = str(tmp_path / "own.pfsr")
+    rng = random.Random(3)
+    mints = [random_mint(rng) for _ in range(2)]
+
+    def make_sniper(url, clipboard, **kwargs):
+        sniper = sniper_module.Sniper(
+            "key", clipboard=ClipboardService(clipboard), api_url=url,
+            view_coin_x=VIEW_COIN[0], view_coin_y=VIEW_COIN[1], ca_area_x=CA_AREA[0], ca_area_y=CA_AREA[1],
+            scan_interval=0.01, event_holdoff=0.05, view_coin_delay=0.1, chart_load_time=1.0,
+            ca_copy_timeout=0.2, ca_source="clipboard", num_attempts=1, rate_limit=0, dedup_path="",
+            **kwargs
+        )
+        log = []
+        sniper.log = log.append
+        bought = []
+        sniper.on_ca_found = bought.append
+        return sniper, bought, log
+
+    async def record():
+        server = StubServer(delay=0.005)
+        url = await server.start()
+        capture = SyntheticCaptureBackend(400, 300)
+        memory = MemoryClipboardBackend()
+        ui = FakeUI(capture, memory, chart_ms=50)
+        monkeypatch.setattr(sniper_module, "windows_click", ui.click)
+        sniper, bought, _ = make_sniper(url, memory, capture=capture, record_path=path)
+        task = asyncio.ensure_future(sniper.run())
+        for mint in mints:
+            await asyncio.sleep(0.6)
+            ui.notify(mint)
+        await asyncio.sleep(0.6)
+        sniper.stop()
+        await task
+        await server.stop()
+        return bought
+
+    async def play_back():
+        server = StubServer(delay=0.005)
+        url = await server.start()
+        memory = MemoryClipboardBackend()
+        queue = list(mints)
+
+        def click(x, y):
+            # The screen comes from the recording; only the copy is faked
+            if (x, y) != VIEW_COIN:
+                memory.set_text(queue.pop(0))
+
+        monkeypatch.setattr(sniper_module, "windows_click", click)
+        sniper, bought, log = make_sniper(url, memory, capture_backend="replay", replay_path=path)
+        try:
+            await asyncio.wait_for(sniper.run(), 10)
+        finally:
+            await server.stop()
+            sniper.capture.close_recording()
+        return sniper, bought, log
+
+    assert asyncio.run(record()) == mints
+    sniper, bought, log = asyncio.run(play_back())
+    assert sniper.capture.recording.roi == sniper._record_roi()
+    assert not any("outside the recorded ROI" in line for line in log)
+    assert bought == mints
@@ -0,0 +1,54 @@
+"""Circuit breaker: a half-open breaker lets a single probe through"""
+import pytest
+
+import core.retry as retry_module
+from core.retry import AUTH, OK, TRANSIENT, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Manual monotonic clock for the breaker"""
+    now = [1000.0]
+    monkeypatch.setattr(retry_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def breaker(clock):
+    """Breaker tripped by a bad key, cooldown elapsed"""
+    breaker = CircuitBreaker(threshold=2, cooldown=60.0)
+    breaker.record(AUTH)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    clock[0] += 60
+    return breaker
+
+
+def test_half_open_lets_one_probe_through(breaker):
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # A burst right after the cooldown waits for the probe
+    assert not breaker.allow()
+    assert not breaker.allow()
+
+
+def test_probe_success_closes(breaker):
+    assert breaker.allow()
+    breaker.record(OK)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_probe_failure_opens_again(breaker):
+    assert breaker.allow()
+    breaker.record(TRANSIENT)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_probe_that_never_answers_expires(breaker, clock):
+    assert breaker.allow()
+    clock[0] += 30
+    assert not breaker.allow()
+    clock[0] += 30
+    assert breaker.allow()
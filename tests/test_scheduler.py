@@ -0,0 +1,55 @@
+import threading
+import time
+
+from core.scheduler import ScanScheduler
+
+
+def test_cadence_holds_without_spinning():
+    scheduler = ScanScheduler(interval=0.02)
+    scheduler.reset()
+    cpu = time.process_time()
+    for _ in range(26):
+        scheduler.wait_blocking()
+    cpu_ms = (time.process_time() - cpu) * 1000
+    stats = scheduler.stats()
+    assert 18 <= stats["mean_ms"] <= 25
+    # 500ms of waiting; spinning only the last ~1ms of each interval
+    assert cpu_ms < 150
+
+
+def test_burst_and_reset_from_another_thread():
+    scheduler = ScanScheduler(interval=0.005, burst_interval=0.001, burst_duration=0.01)
+    scheduler.reset()
+    stop = threading.Event()
+    errors = []
+
+    def capture():
+        try:
+            while not stop.is_set():
+                scheduler.wait_blocking()
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=capture)
+    thread.start()
+    end = time.perf_counter() + 0.5
+    while time.perf_counter() < end:
+        scheduler.burst()
+        scheduler.reset()
+        time.sleep(0.0005)
+    stop.set()
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+    assert not errors
+    assert scheduler.scans > 50
+
+
+def test_burst_pulls_the_deadline_in():
+    scheduler = ScanScheduler(interval=0.2, burst_interval=0.005)
+    scheduler.reset()
+    scheduler.wait_blocking()
+    start = time.perf_counter()
+    threading.Timer(0.01, scheduler.burst).start()
+    scheduler.wait_blocking()
+    # Woken by the burst instead of sleeping out the 200ms interval
+    assert time.perf_counter() - start < 0.1
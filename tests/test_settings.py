@@ -0,0 +1,25 @@
+import json
+
+from config.settings import CONFIG_VERSION, Settings
+
+
+def test_legacy_scan_interval_is_migrated(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"api_key": "k", "scan_interval": 0.15}))
+    settings = Settings.load(str(path))
+    assert settings.scan_interval == 0.05
+    assert settings.config_version == CONFIG_VERSION
+    assert settings.api_key == "k"
+
+
+def test_custom_legacy_value_is_kept(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"scan_interval": 0.2}))
+    assert Settings.load(str(path)).scan_interval == 0.2
+
+
+def test_current_config_is_not_migrated(tmp_path):
+    path = tmp_path / "config.json"
+    settings = Settings(scan_interval=0.15)
+    settings.save(str(path))
+    assert Settings.load(str(path)).scan_interval == 0.15
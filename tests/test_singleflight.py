@@ -0,0 +1,153 @@
+"""SingleFlight: one run per key, shared by every caller"""
+import asyncio
+import random
+
+import pytest
+
+from core.singleflight import FAILED, PENDING, SUCCEEDED, SingleFlight
+
+
+def test_concurrent_callers_share_one_run():
+    async def main():
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return object()
+
+        results = await asyncio.gather(*(flights.run("k", work) for _ in range(200)))
+        return flights, calls, results
+
+    flights, calls, results = asyncio.run(main())
+    assert calls == 1
+    assert len({id(r) for r in results}) == 1
+    assert flights.started == 1 and flights.joined == 199
+    assert flights.state("k") == SUCCEEDED
+
+
+def test_heavy_concurrency_never_overlaps_a_key():
+    async def main():
+        rng = random.Random(1)
+        flights = SingleFlight()
+        running = {}
+        overlaps = 0
+        runs = {}
+
+        async def work(key):
+            nonlocal overlaps
+            running[key] = running.get(key, 0) + 1
+            overlaps += running[key] > 1
+            runs[key] = runs.get(key, 0) + 1
+            await asyncio.sleep(rng.uniform(0.001, 0.01))
+            running[key] -= 1
+            return key
+
+        async def caller(key):
+            await asyncio.sleep(rng.uniform(0, 0.05))
+            return await flights.run(key, lambda: work(key))
+
+        keys = [f"mint{rng.randrange(20)}" for _ in range(2000)]
+        results = await asyncio.gather(*(caller(k) for k in keys))
+        return flights, overlaps, runs, keys, results
+
+    flights, overlaps, runs, keys, results = asyncio.run(main())
+    assert overlaps == 0
+    assert results == keys
+    assert flights.started == sum(runs.values())
+    assert flights.started + flights.joined == len(keys)
+    assert flights.pending == 0
+
+
+def test_cancelled_owner_does_not_cancel_joiners():
+    async def main():
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        owner = asyncio.ensure_future(flights.run("k", work))
+        await asyncio.sleep(0)
+        joiners = [asyncio.ensure_future(flights.run("k", work)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        results = await asyncio.gather(*joiners)
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return flights, results
+
+    flights, results = asyncio.run(main())
+    assert results == ["done"] * 5
+    assert flights.state("k") == SUCCEEDED
+
+
+def test_cancelled_joiner_does_not_cancel_the_run():
+    async def main():
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.03)
+            return 42
+
+        owner = asyncio.ensure_future(flights.run("k", work))
+        await asyncio.sleep(0)
+        joiner = asyncio.ensure_future(flights.run("k", work))
+        await asyncio.sleep(0.01)
+        joiner.cancel()
+        return await owner
+
+    assert asyncio.run(main()) == 42
+
+
+def test_cancel_key_stops_the_run_for_everyone():
+    async def main():
+        flights = SingleFlight()
+        finished = []
+
+        async def work():
+            await asyncio.sleep(1)
+            finished.append(True)
+
+        callers = [asyncio.ensure_future(flights.run("k", work)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert flights.state("k") == PENDING
+        assert flights.cancel("k")
+        outcomes = await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        # A new call starts a fresh run
+        async def quick():
+            return "again"
+
+        again = await flights.run("k", quick)
+        return flights, finished, outcomes, again
+
+    flights, finished, outcomes, again = asyncio.run(main())
+    assert not finished
+    assert all(isinstance(o, asyncio.CancelledError) for o in outcomes)
+    assert again == "again"
+    assert flights.started == 2
+    assert not flights.cancel("k")
+
+
+def test_exception_reaches_every_caller():
+    async def main():
+        flights = SingleFlight()
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: errors.append(ctx))
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        outcomes = await asyncio.gather(*(flights.run("k", work) for _ in range(4)), return_exceptions=True)
+        return flights, outcomes, errors
+
+    flights, outcomes, errors = asyncio.run(main())
+    assert all(isinstance(o, ValueError) for o in outcomes)
+    assert flights.state("k") == FAILED
+    assert flights.flight("k").error == "boom"
+    assert not errors
@@ -0,0 +1,177 @@
+"""Cancellable snipe stages: stop-to-idle, stage budgets, preemption
+
+Driven on the synthetic screen, memory clipboard and stub trade server
+through tests/helpers/harness.py (benchmarks/bench_stop.py times the same cases).
+"""
+import asyncio
+import random
+
+import pytest
+
+import core.sniper as sniper_module
+from core.pipeline import (
+    ACQUIRE, BUY, FIFO, OPEN, QUEUED, READY,
+    BuyProgress, DetectionEvent, SnipeJob, StageRunner, StageTimeout
+)
+from core.sniper import Sniper
+from core.tracing import SnipeTrace
+from tests.helpers.harness import Harness, preempt_wait, stop_in, timeout_overshoot
+from tests.helpers.stub_server import StubServer
+
+
+STOP_MS = 200  # generous for a loaded CI box; ~10ms here
+
+
+@pytest.fixture(autouse=True)
+def restore_click(monkeypatch):
+    # The harness swaps the module's click function
+    monkeypatch.setattr(sniper_module, "windows_click", sniper_module.windows_click)
+
+
+@pytest.mark.parametrize("stage", ["monitor", OPEN, READY, ACQUIRE, BUY])
+def test_stop_reaches_idle_fast_without_clicks(stage):
+    # stop_in raises if a click happens after stop() or the stage is never reached
+    ms = asyncio.run(stop_in(stage, random.Random(1)))
+    assert ms < STOP_MS
+
+
+@pytest.mark.parametrize("stage", [READY, ACQUIRE, BUY])
+def test_snipe_ends_at_its_stage_budget(stage):
+    # timeout_overshoot raises unless the trace records a timeout in `stage`
+    overshoot = asyncio.run(timeout_overshoot(stage, 0.2, random.Random(1)))
+    assert overshoot < 100
+
+
+def test_stage_runner_raises_stage_timeout():
+    async def main():
+        runner = StageRunner({READY: 0.05})
+        job = SnipeJob(DetectionEvent(1, 0, 1))
+        with pytest.raises(StageTimeout) as info:
+            await runner.run(job, READY, asyncio.sleep(1))
+        return runner, job, info.value
+
+    runner, job, error = asyncio.run(main())
+    assert (error.stage, error.budget) == (READY, 0.05)
+    assert job.stage == READY
+    assert runner.timed_out[READY] == 1 and runner.runs[READY] == 1
+
+
+def test_stage_runner_zero_budget_and_cancel():
+    async def main():
+        runner = StageRunner({OPEN: 0})
+        job = SnipeJob(DetectionEvent(1, 0, 1))
+        assert await runner.run(job, OPEN, asyncio.sleep(0.01, result="ok")) == "ok"
+        task = asyncio.ensure_future(runner.run(job, BUY, asyncio.sleep(1)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return runner
+
+    runner = asyncio.run(main())
+    assert runner.cancelled[BUY] == 1 and not runner.timed_out[OPEN]
+
+
+def test_stage_runner_rejects_unknown_stage():
+    with pytest.raises(ValueError):
+        StageRunner({"detect": 1.0})
+
+
+async def _job(sniper: Sniper, seq: int, stage: str, mint: str = None) -> SnipeJob:
+    job = SnipeJob(DetectionEvent(seq, 0, 1, SnipeTrace(seq)))
+    job.stage = stage
+    job.mint = mint
+    job.task = asyncio.ensure_future(asyncio.sleep(10))
+    sniper._jobs[seq] = job
+    return job
+
+
+def _sniper(**kwargs) -> Sniper:
+    return Sniper("key", capture=Harness(random.Random(1)).capture, **kwargs)
+
+
+def test_newer_event_supersedes_a_queued_snipe():
+    async def main():
+        sniper = _sniper()
+        waiting = await _job(sniper, 1, QUEUED)
+        sniper.events.taken = 1
+        sniper._preempt(DetectionEvent(2, 0, 1))
+        await asyncio.sleep(0)
+        return sniper, waiting
+
+    sniper, waiting = asyncio.run(main())
+    assert waiting.task.cancelled()
+    assert waiting.reason == "superseded by #2"
+    assert sniper.events.superseded == 1 and sniper.events.taken == 0
+
+
+def test_fifo_never_preempts():
+    async def main():
+        sniper = _sniper(event_policy=FIFO, event_preempt=True, snipe_concurrency=1)
+        waiting = await _job(sniper, 1, QUEUED)
+        sniper._preempt(DetectionEvent(2, 0, 1))
+        await asyncio.sleep(0)
+        waiting.task.cancel()
+        return waiting
+
+    assert asyncio.run(main()).reason is None
+
+
+@pytest.mark.parametrize("preempt, sent, answered, cancelled", [
+    (False, {1}, 1, False),  # off by default
+    (True, {1}, 1, True),    # between attempts
+    (True, {1, 2}, 1, False),  # attempt 2 on the wire
+    (True, set(), 0, False),   # nothing answered yet (e.g. still in the rate limiter)
+])
+def test_buy_preempted_only_between_attempts(preempt, sent, answered, cancelled):
+    async def main():
+        sniper = _sniper(event_preempt=preempt, snipe_concurrency=1)
+        buying = await _job(sniper, 1, BUY, mint="mint1")
+        progress = sniper._buy_progress["mint1"] = BuyProgress()
+        progress.sent, progress.answered = set(sent), answered
+        sniper._preempt(DetectionEvent(2, 0, 1))
+        await asyncio.sleep(0)
+        result = buying.task.cancelled()
+        buying.task.cancel()
+        return result
+
+    assert asyncio.run(main()) == cancelled
+
+
+def test_preempt_defaults_off():
+    assert _sniper().event_preempt is False
+
+
+def test_new_token_takes_the_worker_after_the_first_answer():
+    rng = random.Random(1)
+    # 3 attempts of 500ms, 0.3s apart: ~2.1s round without preemption
+    assert asyncio.run(preempt_wait(False, rng)) > 1500
+    assert asyncio.run(preempt_wait(True, rng)) < 1000
+
+
+async def _cancelled_round(server_delay: float, drain_limiter: bool, cancel_after: float) -> Sniper:
+    server = StubServer(delay=server_delay)
+    url = await server.start()
+    sniper = Sniper("key", capture=Harness(random.Random(1)).capture, api_url=url,
+                    num_attempts=2, rate_limit=1, rate_burst=1)
+    sniper.log = lambda msg: None
+    if drain_limiter:
+        await sniper.api.rate_limiter.acquire()
+    buy = asyncio.ensure_future(sniper.buy_token("mint1"))
+    await asyncio.sleep(cancel_after)
+    assert sniper.buys.cancel("mint1")
+    with pytest.raises(asyncio.CancelledError):
+        await buy
+    await sniper.api.close()
+    await server.stop()
+    return sniper
+
+
+def test_round_cancelled_before_sending_is_not_marked_bought():
+    sniper = asyncio.run(_cancelled_round(0.01, drain_limiter=True, cancel_after=0.1))
+    assert "mint1" not in sniper.bought_tokens
+
+
+def test_round_cancelled_after_sending_stays_bought():
+    sniper = asyncio.run(_cancelled_round(1.0, drain_limiter=False, cancel_after=0.1))
+    assert "mint1" in sniper.bought_tokens